@@ -0,0 +1,163 @@
+"""
+Pursuit benchmark on cursor traces.
+
+Replays cursor traces through CursorTracker at the physics rate and
+chases them with the play-mode steering (3.25 px per tick), once with
+pure pursuit and once with intercept (lead) pursuit. Reports
+time-to-catch (within the 60 px "sit" radius) and CPU per tick.
+
+    python bench_cursor_pursuit.py                      # built-in synthetic traces
+    python bench_cursor_pursuit.py --trace trace.json   # recorded trace
+    python bench_cursor_pursuit.py --record trace.json --seconds 20
+
+A trace is a JSON list of [time_ms, x, y] samples.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+FRAME_MS = 16
+STEP = 2.5 * 1.3        # Play-mode follow speed (px per tick)
+CATCH_RADIUS = 60
+START_OFFSET = (-600, 450)
+TIMEOUT_MS = 30 * 1000  # Play game length
+
+def synthetic_traces():
+    traces = {}
+    n = TIMEOUT_MS // FRAME_MS
+
+    # Laser sweeping across the screen and back (150 px/s)
+    pts = []
+    for i in range(n):
+        t = i * FRAME_MS
+        phase = (t * 0.15) % 2400
+        x = 200 + (phase if phase < 1200 else 2400 - phase)
+        pts.append([t, x, 500])
+    traces["sweep"] = pts
+
+    # Circling (r=200, one turn per 8 s ≈ 157 px/s)
+    traces["circle"] = [[i * FRAME_MS, 800 + 200 * math.cos(i * FRAME_MS / 8000 * 2 * math.pi),
+                         500 + 200 * math.sin(i * FRAME_MS / 8000 * 2 * math.pi)] for i in range(n)]
+
+    # Zigzag (120 px/s diagonal legs, turning every 1.5 s)
+    pts, x, y, vx, vy = [], 800.0, 500.0, 85.0, 85.0
+    for i in range(n):
+        t = i * FRAME_MS
+        if t and t % 1500 < FRAME_MS:
+            vy = -vy
+        x += vx * FRAME_MS / 1000
+        y += vy * FRAME_MS / 1000
+        pts.append([t, x, y])
+    traces["zigzag"] = pts
+
+    # Laser darts: short fast hops, then slow drift (seeded)
+    rng = random.Random(7)
+    pts, x, y, vx, vy = [], 800.0, 500.0, 0.0, 0.0
+    for i in range(n):
+        t = i * FRAME_MS
+        if t % 2000 < FRAME_MS:
+            angle = rng.uniform(0, 2 * math.pi)
+            vx, vy = math.cos(angle) * 600, math.sin(angle) * 600
+        elif t % 2000 > 400:
+            vx, vy = vx * 0.9, vy * 0.9
+        x = min(1800, max(100, x + vx * FRAME_MS / 1000))
+        y = min(1000, max(100, y + vy * FRAME_MS / 1000))
+        pts.append([t, x, y])
+    traces["darts"] = pts
+    return traces
+
+def run(trace, lead):
+    from src.cursor_tracker import CursorTracker
+
+    clock = [0.0]
+    index = [0]
+
+    def source():
+        # Latest trace sample at or before the current time
+        while index[0] + 1 < len(trace) and trace[index[0] + 1][0] <= clock[0]:
+            index[0] += 1
+        _, x, y = trace[index[0]]
+        return int(x), int(y)
+
+    tracker = CursorTracker(source=source, clock=lambda: clock[0], frame_ms=FRAME_MS)
+    t0 = trace[0][0]
+    px, py = trace[0][1] + START_OFFSET[0], trace[0][2] + START_OFFSET[1]
+    end = min(trace[-1][0], t0 + TIMEOUT_MS)
+
+    ticks = 0
+    cpu = 0.0
+    clock[0] = t0
+    while clock[0] <= end:
+        start = time.perf_counter()
+        cursor = tracker.sample()
+        dx, dy = cursor.steer(px, py, STEP, lead=lead)
+        cpu += time.perf_counter() - start
+        ticks += 1
+
+        px += dx
+        py += dy
+        if math.hypot(cursor.raw_x - px, cursor.raw_y - py) < CATCH_RADIUS:
+            return clock[0] - t0, cpu / ticks * 1e6
+        clock[0] += FRAME_MS
+    return None, cpu / max(1, ticks) * 1e6
+
+def record(path, seconds):
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtGui import QCursor
+
+    app = QApplication(sys.argv)
+    samples = []
+    start = time.monotonic()
+
+    def tick():
+        t = (time.monotonic() - start) * 1000.0
+        p = QCursor.pos()
+        samples.append([round(t, 1), p.x(), p.y()])
+        if t >= seconds * 1000:
+            app.quit()
+
+    timer = QTimer()
+    timer.timeout.connect(tick)
+    timer.start(FRAME_MS)
+    print(f"Recording cursor for {seconds} s - move the mouse like a laser pointer...")
+    app.exec()
+    with open(path, "w") as f:
+        json.dump(samples, f)
+    print(f"Saved {len(samples)} samples to {path}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trace", action="append", help="recorded trace (JSON), may repeat")
+    parser.add_argument("--record", help="record a trace to this file and exit")
+    parser.add_argument("--seconds", type=float, default=20)
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record, args.seconds)
+        return 0
+
+    if args.trace:
+        traces = {}
+        for path in args.trace:
+            with open(path) as f:
+                traces[os.path.basename(path)] = json.load(f)
+    else:
+        traces = synthetic_traces()
+
+    def fmt(ms):
+        return f"{ms / 1000:7.2f} s" if ms is not None else "  no catch"
+
+    print(f"{'trace':<16} {'pure pursuit':>12} {'intercept':>12} {'cpu/tick pure':>14} {'cpu/tick lead':>14}")
+    for name, trace in traces.items():
+        pure, pure_cpu = run(trace, lead=False)
+        lead, lead_cpu = run(trace, lead=True)
+        print(f"{name:<16} {fmt(pure):>12} {fmt(lead):>12} {pure_cpu:11.1f} us {lead_cpu:11.1f} us")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,30 +1,105 @@
+import json
+import logging
 import sys
-from PyQt6.QtWidgets import QApplication
-from src.pet_entity import PetEntity
+from src import startup_profiler, app_log
+
+def hand_off():
+    """
+    Passes this launch to an already running instance over the local
+    control channel: a plain launch spawns another pet there, --send
+    '<json>' runs commands and prints the reply. Returns an exit code, or
+    None if this process should start the app itself.
+    """
+    from src import control
+
+    sending = "--send" in sys.argv
+    if sending:
+        try:
+            request = json.loads(sys.argv[sys.argv.index("--send") + 1])
+        except (IndexError, ValueError) as e:
+            print(f"--send needs a JSON command or list of commands: {e}")
+            return 2
+    else:
+        request = {"cmd": "spawn"}
+
+    try:
+        reply = control.send(request)
+    except TimeoutError as e:
+        reply = None
+        logging.getLogger("control").warning("%s", e)
+    if sending:
+        print(json.dumps(reply, ensure_ascii=False) if reply is not None else "Desktop Kitty is not running")
+        return 0 if reply is not None else 1
+    return 0 if reply is not None else None
 
 def main():
+    profile = "--profile-startup" in sys.argv
+    if profile:
+        startup_profiler.enable()
+
+    # Queue + background writer to <data dir>/desktop_kitty.log; first, so
+    # failures while handing off to a running instance are recorded too
+    app_log.setup("DEBUG" if "--debug" in sys.argv else None)
+
+    if not profile and "--new-instance" not in sys.argv:
+        code = hand_off()
+        if code is not None:
+            sys.exit(code)
+
+    from PyQt6.QtWidgets import QApplication
+    startup_profiler.mark("import PyQt6")
+
     app = QApplication(sys.argv)
-    
+    startup_profiler.mark("QApplication")
+
     # Ensure clean exit
     app.setQuitOnLastWindowClosed(False)
-    
+
+    from src.pet_entity import PetEntity
+    startup_profiler.mark("import pet_entity")
+
     pet = PetEntity()
+    startup_profiler.mark("PetEntity()")
     pet.show()
-    
+    startup_profiler.mark("show")
+
+    # Later launches and scripts talk to this process instead of starting their own
+    from src.control import ControlServer
+    pets = [pet]
+    def forget(closed_pet):
+        if closed_pet in pets:
+            pets.remove(closed_pet)
+            closed_pet.deleteLater()
+    def spawn():
+        # Shares settings, sprites and vitals with a live pet
+        new_pet = PetEntity(companion=pets[0])
+        new_pet.closed.connect(forget)
+        new_pet.show()
+        pets.append(new_pet)
+        return new_pet
+    pet.closed.connect(forget)
+    control_server = ControlServer(pets, spawn)
+    if not control_server.listen():
+        logging.getLogger("control").warning("Not accepting hand-offs; later launches will start their own instance")
+    def shut_down():
+        control_server.close()
+        for p in list(pets):
+            p.close() # Saves position and vitals
+    app.aboutToQuit.connect(shut_down)
+
+    if profile:
+        # Report once everything deferred has loaded, then exit (non-zero if over budget)
+        def finish():
+            startup_profiler.write_report()
+            app.exit(0 if startup_profiler.within_budget() else 2)
+        pet.startup_finished.connect(finish)
+
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    import os
-    import traceback
-    
-    # Debug log path: user documents or next to exe
-    log_file = os.path.join(os.path.dirname(os.path.abspath(sys.argv[0])), "debug.log")
-    
     try:
         main()
-    except Exception as e:
-        with open(log_file, "a") as f:
-            f.write(f"CRITICAL ERROR: {str(e)}\n")
-            f.write(traceback.format_exc())
-            f.write("\n")
+    except Exception:
+        logging.getLogger("crash").critical("CRITICAL ERROR", exc_info=True)
+        app_log.shutdown() # Flush the queue before exiting
         sys.exit(1)
@@ -0,0 +1,107 @@
+import bisect
+import json
+import logging
+import os
+from .constants import ANIMATION_INTERVAL_MS
+
+log = logging.getLogger(__name__)
+
+CLIP_FILE = "clip.json"
+CLIP_MODES = ("loop", "once", "pingpong")
+
+class AnimationClip:
+    """
+    A timeline of (frame, duration) steps for one sprite state.
+
+    Modes: "loop" repeats, "once" stops on its last frame (and reports
+    finished), "pingpong" plays forwards then backwards. The frame for any
+    elapsed time is computed directly, together with the time to the next
+    frame boundary, so callers only need to wake up when the picture
+    actually changes. A clip with a single step never changes.
+    """
+
+    def __init__(self, frames, durations, mode="loop"):
+        if mode not in CLIP_MODES:
+            raise ValueError(f"Unknown clip mode: {mode}")
+        if not frames or len(frames) != len(durations):
+            raise ValueError("Clip needs one duration per frame")
+        if mode == "pingpong" and len(frames) > 2:
+            # 0 1 2 3 -> 0 1 2 3 2 1 (then loops)
+            frames = list(frames) + list(frames[-2:0:-1])
+            durations = list(durations) + list(durations[-2:0:-1])
+        self.frames = list(frames)
+        self.durations = [max(1, int(d)) for d in durations]
+        self.mode = mode
+
+        self.ends = [] # Cumulative end time of each step
+        total = 0
+        for d in self.durations:
+            total += d
+            self.ends.append(total)
+        self.total = total
+
+    @property
+    def static(self):
+        return len(self.frames) == 1
+
+    def frame_at(self, elapsed_ms):
+        """(frame, ms until the next frame change or None, finished)."""
+        if self.static:
+            return self.frames[0], None, self.mode == "once"
+        if self.mode == "once" and elapsed_ms >= self.total:
+            return self.frames[-1], None, True
+        t = elapsed_ms % self.total if self.mode != "once" else elapsed_ms
+        i = bisect.bisect_right(self.ends, t)
+        return self.frames[i], self.ends[i] - t, False
+
+    @classmethod
+    def for_files(cls, count, frame_ms=ANIMATION_INTERVAL_MS):
+        """Default clip: every file in order, looping at the old animation rate."""
+        count = max(1, count)
+        return cls(list(range(count)), [frame_ms] * count, "loop")
+
+    @classmethod
+    def from_meta(cls, meta, count, durations=None):
+        """
+        Builds a clip from clip.json contents (or None for the default).
+        `durations` are per-file-frame durations embedded in animated
+        sources; they are used unless the metadata sets its own.
+        """
+        meta = meta or {}
+        try:
+            frame_ms = meta.get("frame_ms", ANIMATION_INTERVAL_MS)
+            frames = meta.get("frames", list(range(max(1, count))))
+            if count:
+                frames = [i % count for i in frames]
+            if "durations" in meta:
+                steps = meta["durations"]
+            else:
+                steps = [(durations[i] if durations and i < len(durations) and durations[i] else frame_ms) for i in frames]
+            return cls(frames, steps, meta.get("mode", "loop"))
+        except (ValueError, TypeError) as e:
+            log.warning("Bad clip metadata: %s", e)
+            return cls.for_files(count)
+
+def read_clip_meta(state_dir):
+    """
+    Contents of <state_dir>/clip.json, or None.
+
+        {"mode": "once", "frame_ms": 1000,
+         "frames": [0, 1, 0, 1, 0], "durations": [1000, 1000, 1000, 1000, 1200]}
+
+    Every key is optional; "frames" index the state's frames in file order
+    and "durations" defaults to each frame's embedded duration (animated
+    sources) or frame_ms.
+    """
+    path = os.path.join(state_dir, CLIP_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if not isinstance(meta, dict):
+            raise ValueError("expected an object")
+        return meta
+    except (OSError, ValueError) as e:
+        log.warning("Bad clip metadata %s: %s", path, e)
+        return None
@@ -0,0 +1,109 @@
+import atexit
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+LOG_FILE = "desktop_kitty.log"
+LOG_MAX_BYTES = 1024 * 1024 # Per file; LOG_BACKUP_COUNT older files are kept
+LOG_BACKUP_COUNT = 3
+LOG_LEVEL_ENV = "DESKTOP_KITTY_LOG" # e.g. DESKTOP_KITTY_LOG=DEBUG
+LOG_FORMAT = "%(asctime)s %(levelname)-8s %(name)s: %(message)s"
+
+_listener = None
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues a copy of the record with its message merged and any traceback
+    rendered to text, so the listener never touches the caller's (possibly
+    mutable) arguments or live frames. Unlike the stock QueueHandler it
+    does not apply the formatter here; only the I/O is deferred.
+    """
+
+    _traceback_formatter = logging.Formatter()
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def setup(level=None, log_dir=None, console=True):
+    """
+    Routes all logging through a queue to a background listener thread
+    that writes a size-bounded rotating log in the data directory (and
+    stderr, when there is one). Callers only pay for the level check and
+    a queue put; records below `level` are dropped before a LogRecord is
+    even built. Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    level = level or os.environ.get(LOG_LEVEL_ENV, "INFO")
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = []
+    if log_dir is None:
+        from .resource_utils import get_data_path
+        log_dir = get_data_path()
+    try:
+        file_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, LOG_FILE), maxBytes=LOG_MAX_BYTES,
+            backupCount=LOG_BACKUP_COUNT, encoding="utf-8", delay=True)
+        handlers.append(file_handler)
+    except OSError as e:
+        sys.stderr and sys.stderr.write(f"Log file unavailable: {e}\n")
+    if console and sys.stderr is not None: # None in windowed (frozen) builds
+        handlers.append(logging.StreamHandler(sys.stderr))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_DeferredQueueHandler(log_queue))
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers)
+    _listener.start()
+    atexit.register(shutdown)
+    install_excepthooks()
+
+def shutdown():
+    """Writes out everything still queued and stops the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+        for handler in logging.getLogger().handlers:
+            if isinstance(handler, _DeferredQueueHandler):
+                logging.getLogger().removeHandler(handler)
+
+def install_excepthooks():
+    """Logs uncaught exceptions (including ones raised in Qt slots and threads) as crashes."""
+    log = logging.getLogger("crash")
+
+    def excepthook(exc_type, exc, tb):
+        if issubclass(exc_type, KeyboardInterrupt):
+            sys.__excepthook__(exc_type, exc, tb)
+            return
+        log.critical("Unhandled exception", exc_info=(exc_type, exc, tb))
+
+    def thread_excepthook(args):
+        if args.exc_type is SystemExit:
+            return
+        log.critical("Unhandled exception in thread %s", args.thread.name if args.thread else "?",
+                     exc_info=(args.exc_type, args.exc_value, args.exc_traceback))
+
+    sys.excepthook = excepthook
+    threading.excepthook = thread_excepthook
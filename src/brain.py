@@ -0,0 +1,246 @@
+import logging
+import math
+import random
+import time
+from PyQt6.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+from PyQt6.QtWidgets import QApplication
+from .constants import DECISION_INTERVAL_MS
+from .scheduler import get_scheduler
+
+log = logging.getLogger(__name__)
+
+# States whose transitions the brain owns; the rest end through physics or sequences
+ROUTINE_STATES = ("idle", "walk", "sit", "sleep")
+BASE_WEIGHTS = {"walk": 4.0, "sit": 1.0, "idle": 1.0, "sleep": 1.0, "jump": 0.5}
+NIGHT_HOURS = (22, 6)          # [start, end) local time
+CURSOR_NEAR_PX = 300
+CURSOR_IDLE_SLEEPY_MS = 5 * 60 * 1000
+EDGE_MARGIN = 0.15             # Fraction of the screen counted as "near the edge"
+
+def is_night(hour):
+    start, end = NIGHT_HOURS
+    return hour >= start or hour < end
+
+def decide(p, rng=random):
+    """
+    Next routine transition for a perception snapshot (see Brain.perceive),
+    as {"state", "duration" (ms), "heading" (radians or None)}, or None to
+    carry on. Pure and cheap to call; runs on the brain thread.
+    """
+    state = p["state"]
+    if p["wait_mode"] or p["locked"] or state not in ROUTINE_STATES:
+        return None
+    expired = p["timer"] >= p["target"]
+    night = is_night(p["hour"])
+    cursor_near = p["cursor_dist"] < CURSOR_NEAR_PX and p["cursor_idle_ms"] < DECISION_INTERVAL_MS
+    sleepy = night or p["cursor_idle_ms"] > CURSOR_IDLE_SLEEPY_MS
+
+    if state == "sleep":
+        if not expired:
+            return None
+        wake = 0.25 if sleepy else 0.9
+        if p["hunger"] < 30 or cursor_near:
+            wake = 1.0 # Hungry, or being played with
+        if rng.random() >= wake:
+            return None
+        return {"state": "idle", "duration": rng.randint(1000, 5000)}
+
+    if not expired:
+        # A very hungry or uncomfortable pet gives up on a long walk
+        if state == "walk" and p["timer"] > 3000 and (p["uncomfortable"] or p["hunger"] < 15):
+            return {"state": "sit", "duration": rng.randint(5000, 10000)}
+        return None
+
+    if state != "idle":
+        return {"state": "idle", "duration": rng.randint(1000, 5000)}
+
+    weights = dict(BASE_WEIGHTS)
+    if p["hunger"] < 30:
+        weights["walk"] *= 0.5
+        weights["jump"] *= 0.3
+        weights["sit"] *= 1.5
+    if p["bored"]:
+        weights["walk"] *= 1.5
+        weights["jump"] *= 2.0
+    if p["uncomfortable"]:
+        weights["walk"] *= 0.6
+        weights["jump"] *= 0.2
+        weights["sit"] *= 2.0
+    if night:
+        weights["sleep"] *= 4.0
+        weights["walk"] *= 0.5
+        weights["jump"] *= 0.5
+    if cursor_near:
+        weights["walk"] *= 1.3
+        weights["jump"] *= 1.5
+        weights["sleep"] *= 0.3
+    elif p["cursor_idle_ms"] > CURSOR_IDLE_SLEEPY_MS:
+        weights["sleep"] *= 2.0
+
+    states = list(weights)
+    choice = rng.choices(states, weights=[weights[s] for s in states], k=1)[0]
+    decision = {"state": choice, "duration": rng.randint(1000, 5000), "heading": None}
+    if choice == "walk":
+        decision["duration"] = int(decision["duration"] * rng.uniform(1.0, 4.0))
+        decision["heading"] = heading_from_edges(p["screen_fx"], p["screen_fy"], rng)
+    elif choice == "sleep":
+        decision["duration"] = rng.randint(5000, 15000) * (2 if night else 1)
+    return decision
+
+def heading_from_edges(fx, fy, rng=random):
+    """Walk heading that leads away from a nearby screen edge (None = any direction)."""
+    hx = 1 if fx < EDGE_MARGIN else -1 if fx > 1 - EDGE_MARGIN else 0
+    hy = 1 if fy < EDGE_MARGIN else -1 if fy > 1 - EDGE_MARGIN else 0
+    if not hx and not hy:
+        return None
+    return math.atan2(hy, hx) + rng.uniform(-math.pi / 4, math.pi / 4)
+
+class BrainWorker(QObject):
+    """Runs decide() for every pet's perceptions on its own thread."""
+
+    decided = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.rng = random.Random()
+
+    @pyqtSlot(object)
+    def think(self, perception):
+        try:
+            decision = decide(perception, self.rng)
+        except Exception:
+            log.exception("Brain decision failed")
+            return
+        if decision:
+            decision["pet"] = perception["pet"]
+            decision["serial"] = perception["serial"]
+            self.decided.emit(decision)
+
+class DecisionRouter(QObject):
+    """
+    Hands each decision from a worker to the Brain it was made for: one
+    dict lookup per decision, instead of every Brain receiving (and
+    discarding) every other pet's. Lives on the GUI thread.
+    """
+
+    def __init__(self, worker):
+        super().__init__()
+        self.brains = {} # id(brain) -> Brain
+        worker.decided.connect(self.route)
+
+    def route(self, decision):
+        brain = self.brains.get(decision.get("pet"))
+        if brain is not None:
+            brain.on_decided(decision)
+
+_worker = None
+_thread = None
+_routers = {} # worker -> DecisionRouter
+
+def get_brain_worker():
+    """Process-wide worker on its own QThread (started on first use, stopped on quit)."""
+    global _worker, _thread
+    if _worker is None:
+        _thread = QThread()
+        _thread.setObjectName("brain")
+        _worker = BrainWorker()
+        _worker.moveToThread(_thread)
+        _thread.start()
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(stop_brain_worker)
+    return _worker
+
+def stop_brain_worker():
+    global _worker, _thread
+    if _thread is not None:
+        _thread.quit()
+        _thread.wait()
+    _routers.pop(_worker, None)
+    _worker = _thread = None
+
+def get_router(worker):
+    """The GUI-thread router for a worker's decisions (created on first use)."""
+    router = _routers.get(worker)
+    if router is None:
+        router = _routers[worker] = DecisionRouter(worker)
+    return router
+
+class Brain(QObject):
+    """
+    A pet's decision loop. Every DECISION_INTERVAL_MS it takes a small
+    snapshot of the pet on the GUI thread (needs, time of day, cursor
+    activity, screen position) and posts it to the shared BrainWorker.
+    Decisions come back as queued signals, are routed to this Brain by
+    id, and are handed to the StateMachine, which drops any made for a
+    state it has since left. The physics tick never waits on, or pays
+    for, the decision.
+    """
+
+    perceived = pyqtSignal(object)
+
+    def __init__(self, pet, worker=None, scheduler=None):
+        super().__init__(pet)
+        self.pet = pet
+        self.fsm = pet.fsm
+        self.scheduler = scheduler or get_scheduler()
+        self.worker = worker or get_brain_worker()
+        self.perceived.connect(self.worker.think)
+        self.router = get_router(self.worker)
+        self.router.brains[id(self)] = self
+        self.decisions = 0 # Applied decisions
+        self.cursor_last = None
+        self.cursor_moved_at = self.scheduler.clock()
+        self.fsm.brain_driven = True
+        self.task = self.scheduler.call_every(DECISION_INTERVAL_MS, self.tick, tolerance_ms=DECISION_INTERVAL_MS // 4)
+
+    def tick(self):
+        if self.pet.is_dragging or self.pet.playing_mode:
+            return
+        self.perceived.emit(self.perceive())
+
+    def perceive(self):
+        pet, fsm, status = self.pet, self.fsm, self.pet.status
+        now = self.scheduler.clock()
+        cursor = pet.cursor.sample()
+        cursor_pos = (cursor.raw_x, cursor.raw_y)
+        if cursor_pos != self.cursor_last:
+            self.cursor_last = cursor_pos
+            self.cursor_moved_at = now
+        cx, cy = pet.x() + pet.width() // 2, pet.y() + pet.height() // 2
+
+        fx = fy = 0.5
+        screen = QApplication.screenAt(pet.geometry().center()) or QApplication.primaryScreen()
+        if screen is not None:
+            geo = screen.availableGeometry()
+            fx = (cx - geo.left()) / max(1, geo.width())
+            fy = (cy - geo.top()) / max(1, geo.height())
+
+        return {
+            "pet": id(self),
+            "serial": fsm.transitions,
+            "state": fsm.current_state,
+            "timer": fsm.state_timer,
+            "target": fsm.target_duration,
+            "wait_mode": fsm.wait_mode,
+            "locked": fsm.locked,
+            "hunger": status.hunger if status else 100,
+            "bored": bool(status and status.is_bored),
+            "uncomfortable": bool(status and status.is_uncomfortable),
+            "hour": time.localtime().tm_hour,
+            "cursor_dist": ((cursor.raw_x - cx) ** 2 + (cursor.raw_y - cy) ** 2) ** 0.5,
+            "cursor_idle_ms": now - self.cursor_moved_at,
+            "screen_fx": fx,
+            "screen_fy": fy,
+        }
+
+    def on_decided(self, decision):
+        if self.fsm.apply_decision(decision):
+            self.decisions += 1
+
+    def close(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        self.router.brains.pop(id(self), None)
+        self.fsm.brain_driven = False
@@ -1,41 +1,140 @@
-import json
+import logging
 import os
-from .constants import CONFIG_FILE
+from PyQt6.QtCore import QObject, pyqtSignal
+from . import constants
+from .constants import SETTINGS_SAVE_DEBOUNCE_MS
+from .persistence import DebouncedJsonWriter, acquire_instance_slot, read_json
+
+log = logging.getLogger(__name__)
+
+# Field name -> (type, default)
+SETTINGS_SCHEMA = {
+    "gravity_mode": (bool, False),
+    "sound_enabled": (bool, True),
+    "last_x": (int, 100),
+    "last_y": (int, 100),
+    "always_on_top": (bool, True),
+    "follow_mode": (bool, False),
+    "wait_mode": (bool, False),
+}
+
+# Stored per running instance (see ConfigManager); everything else is shared
+INSTANCE_KEYS = ("last_x", "last_y")
+
+# Keys older versions wrote that are no longer used ("floating_mode" was
+# never user-settable; gravity is now the opt-in "gravity_mode")
+LEGACY_KEYS = ("floating_mode",)
+
+class Settings:
+    """Typed settings record. One slot per field in SETTINGS_SCHEMA."""
+
+    __slots__ = tuple(SETTINGS_SCHEMA.keys())
 
-class ConfigManager:
-    """Manages application settings persistence."""
-    
     def __init__(self):
-        self.settings = {
-            "floating_mode": False,
-            "sound_enabled": True,
-            "last_x": 100,
-            "last_y": 100,
-            "always_on_top": True
-        }
+        for name, (_, default) in SETTINGS_SCHEMA.items():
+            setattr(self, name, default)
+
+    @staticmethod
+    def validate(key, value):
+        """Returns value coerced to the field type, or raises KeyError/TypeError."""
+        if key not in SETTINGS_SCHEMA:
+            raise KeyError(f"Unknown setting: {key}")
+        field_type, _ = SETTINGS_SCHEMA[key]
+
+        if field_type is bool:
+            if not isinstance(value, bool):
+                raise TypeError(f"Setting '{key}' expects bool, got {type(value).__name__}")
+            return value
+
+        # int: accept floats (e.g. positions), reject bools
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError(f"Setting '{key}' expects int, got {type(value).__name__}")
+        return int(value)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in SETTINGS_SCHEMA}
+
+class ConfigManager(QObject):
+    """
+    Manages application settings persistence.
+
+    settings.json is shared by every running instance. Each instance claims
+    a slot (instance-<n>.lock in the data directory) and keeps its own
+    position under "slots"; slot 0 uses the top-level keys. Saves re-read
+    the file under a lock and merge in only the keys this instance changed.
+    """
+
+    # Emitted as (key, new_value) whenever a setting actually changes
+    setting_changed = pyqtSignal(str, object)
+
+    def __init__(self, config_file=None):
+        super().__init__()
+        self.config_file = config_file or constants.CONFIG_FILE
+        self.slot, self._slot_lock = acquire_instance_slot(os.path.dirname(self.config_file))
+        self.settings = Settings()
+        self._dirty_keys = set()
         self.load()
+        self._writer = DebouncedJsonWriter(
+            self.config_file, self._take_changes, SETTINGS_SAVE_DEBOUNCE_MS, self, merge_fn=self._merge
+        )
 
     def load(self):
         """Load settings from JSON file."""
-        if os.path.exists(CONFIG_FILE):
+        data = read_json(self.config_file)
+        if not isinstance(data, dict):
+            return
+
+        slots = data.pop("slots", {})
+        # Later instances start from their own saved position, if any
+        if self.slot > 0 and isinstance(slots, dict):
+            data.update(slots.get(str(self.slot), {}))
+
+        for key, value in data.items():
+            if key in LEGACY_KEYS:
+                continue
             try:
-                with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.settings.update(data)
-            except Exception as e:
-                print(f"Failed to load settings: {e}")
+                setattr(self.settings, key, Settings.validate(key, value))
+            except (KeyError, TypeError) as e:
+                # Keep the default for unknown or malformed entries
+                log.info("Ignoring setting: %s", e)
+
+    def _take_changes(self):
+        """Snapshot of the keys changed since the last write (GUI thread)."""
+        changes = {key: getattr(self.settings, key) for key in self._dirty_keys}
+        self._dirty_keys.clear()
+        return changes
+
+    def _merge(self, existing, changes):
+        """Merges our changes into the file contents (writer thread, under the file lock)."""
+        for key, value in changes.items():
+            if key in INSTANCE_KEYS and self.slot > 0:
+                slots = existing.setdefault("slots", {})
+                slots.setdefault(str(self.slot), {})[key] = value
+            else:
+                existing[key] = value
+        return existing
 
     def save(self):
-        """Save current settings to JSON file."""
-        try:
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=4)
-        except Exception as e:
-            print(f"Failed to save settings: {e}")
+        """Schedule a debounced background save of the current settings."""
+        self._writer.schedule()
+
+    def flush(self):
+        """Write pending settings synchronously (e.g. on shutdown)."""
+        self._writer.flush()
+
+    @property
+    def coalesced_writes(self):
+        """Number of save requests absorbed into a later write."""
+        return self._writer.coalesced_count
 
     def get(self, key, default=None):
-        return self.settings.get(key, default)
+        return getattr(self.settings, key, default)
 
     def set(self, key, value):
-        self.settings[key] = value
+        value = Settings.validate(key, value)
+        if getattr(self.settings, key) == value:
+            return
+        setattr(self.settings, key, value)
+        self._dirty_keys.add(key)
         self.save()
+        self.setting_changed.emit(key, value)
@@ -8,22 +8,37 @@ APP_VERSION = "1.0.0"
 # Filesystem
 # Use resource_utils to determine paths based on Frozen state
 BASE_DIR = resource_utils.get_base_path()
-DATA_DIR = resource_utils.get_data_path()
 
 ASSETS_DIR = os.path.join(BASE_DIR, "assets")
 SPRITES_DIR = os.path.join(ASSETS_DIR, "sprites")
-CONFIG_FILE = os.path.join(DATA_DIR, "settings.json")
+
+def __getattr__(name):
+    # DATA_DIR / CONFIG_FILE touch the filesystem (mkdir), so resolve them on first use
+    if name == "DATA_DIR":
+        return resource_utils.get_data_path()
+    if name == "CONFIG_FILE":
+        return os.path.join(resource_utils.get_data_path(), "settings.json")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Physics & World
-GRAVITY = 0.5
-TERMINAL_VELOCITY = 15.0
+GRAVITY = 0.5             # Gravity mode fall acceleration (px per tick^2)
+TERMINAL_VELOCITY = 15.0  # Max fall speed (px per tick)
 GROUND_OFFSET = 50  # Distance from bottom of screen to stop
+LANDING_BOUNCE = 0.25     # Fraction of fall speed kept as a bounce
+SETTLE_VELOCITY = 2.0     # Landing slower than this settles the body (px per tick)
 MOVE_SPEED = 2      # Horizontal pixels per tick
+JUMP_GRAVITY = 800  # Jump arcs (px/s^2)
+JUMP_POWER = 400    # User jump launch speed (px/s, 45 degrees)
+PLATFORM_SNAP_PX = 12 # Feet this close to a window's top edge stand on it
 
 # Timers
 ANIMATION_INTERVAL_MS = 150 
 PHYSICS_INTERVAL_MS = 16    # ~60 FPS
 DECISION_INTERVAL_MS = 2000 # AI Brain tick
+PLATFORM_POLL_MS = 500      # Window-platform refresh when the OS has no change events
+SETTINGS_SAVE_DEBOUNCE_MS = 500 # Coalesce settings writes within this window
+STATUS_FLUSH_INTERVAL_MS = 2000 # Max pet data lost on a crash
+STATUS_COMPACT_RECORDS = 200    # Journal records before rewriting the snapshot
 
 # Sprite Fallback Defaults
 DEFAULT_SIZE = (128, 128)
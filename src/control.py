@@ -0,0 +1,189 @@
+import getpass
+import json
+import logging
+from PyQt6.QtCore import QObject
+from PyQt6.QtNetwork import QAbstractSocket, QLocalServer, QLocalSocket
+from .constants import APP_VERSION
+
+log = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT_MS = 300   # A live instance accepts well within this
+REPLY_TIMEOUT_MS = 3000
+MAX_REQUEST_BYTES = 64 * 1024
+
+def server_name():
+    """Per-user name of the control channel (a named pipe on Windows, a Unix socket elsewhere)."""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "user"
+    return f"desktop-kitty-{user}"
+
+def encode(message):
+    """One compact JSON line."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+
+def send(request, name=None, timeout_ms=REPLY_TIMEOUT_MS):
+    """
+    Sends a command ({"cmd": ...}) or a batch (list of commands) to the
+    running instance and returns its decoded reply, or None if no
+    instance is listening. Blocking; meant for launchers and scripts, not
+    the GUI thread. No QApplication is needed.
+    """
+    sock = QLocalSocket()
+    sock.connectToServer(name or server_name())
+    if not sock.waitForConnected(CONNECT_TIMEOUT_MS):
+        return None
+    sock.write(encode(request))
+    sock.flush()
+    data = b""
+    while b"\n" not in data:
+        if not sock.waitForReadyRead(timeout_ms):
+            sock.abort()
+            raise TimeoutError("No reply from the running instance")
+        data += bytes(sock.readAll())
+    sock.disconnectFromServer()
+    return json.loads(data.split(b"\n", 1)[0])
+
+class ControlServer(QObject):
+    """
+    Accepts newline-delimited JSON commands from other processes on the
+    local control channel and runs them against the live pets.
+
+    Everything is driven by QLocalSocket signals on the GUI thread: a
+    request is only parsed once a full line has arrived, and commands
+    only poke pet methods, so the event loop never waits on a client.
+
+        {"cmd": "status"}                        -> {"ok":true,"pets":[...]}
+        [{"cmd": "feed"}, {"cmd": "sleep", "pet": 1}] -> [{...}, {...}]
+
+    Commands: ping, spawn, feed, sleep, follow ("on": true/false, else
+    toggle), status. "pet" selects one pet by index; by default a command
+    applies to every pet.
+    """
+
+    def __init__(self, pets, spawn, name=None, parent=None):
+        super().__init__(parent)
+        self.pets = pets    # Live PetEntity list, shared with the caller
+        self.spawn = spawn  # Creates, shows and returns a new pet
+        self.name = name or server_name()
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self._on_new_connection)
+        self._buffers = {}
+
+    def listen(self):
+        """Starts listening. Returns False if another live instance owns the channel."""
+        if self.server.listen(self.name):
+            return True
+        if self.server.serverError() == QAbstractSocket.SocketError.AddressInUseError:
+            if send({"cmd": "ping"}, self.name) is not None:
+                log.info("Control channel owned by another running instance")
+                return False
+            # Left behind by a crashed instance (Unix sockets outlive their process)
+            QLocalServer.removeServer(self.name)
+            if self.server.listen(self.name):
+                return True
+        log.warning("Control channel unavailable: %s", self.server.errorString())
+        return False
+
+    def close(self):
+        self.server.close()
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            sock = self.server.nextPendingConnection()
+            self._buffers[sock] = b""
+            sock.readyRead.connect(lambda s=sock: self._on_ready_read(s))
+            sock.disconnected.connect(lambda s=sock: self._drop(s))
+
+    def _drop(self, sock):
+        self._buffers.pop(sock, None)
+        sock.deleteLater()
+
+    def _on_ready_read(self, sock):
+        data = self._buffers.get(sock, b"") + bytes(sock.readAll())
+        while b"\n" in data:
+            line, data = data.split(b"\n", 1)
+            if line.strip():
+                sock.write(encode(self.handle(line)))
+        if len(data) > MAX_REQUEST_BYTES:
+            sock.write(encode({"ok": False, "error": "request too large"}))
+            sock.disconnectFromServer()
+            data = b""
+        self._buffers[sock] = data
+
+    def handle(self, line):
+        """Reply for one request line (a command or a batch of them)."""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return {"ok": False, "error": f"bad json: {e}"}
+        if isinstance(request, list):
+            return [self.execute(command) for command in request]
+        return self.execute(request)
+
+    def execute(self, command):
+        if not isinstance(command, dict):
+            return {"ok": False, "error": "command must be an object"}
+        handler = getattr(self, "cmd_" + str(command.get("cmd")), None)
+        if handler is None:
+            return {"ok": False, "error": f"unknown command: {command.get('cmd')}"}
+        try:
+            return handler(command)
+        except ValueError as e: # Bad arguments
+            return {"ok": False, "error": str(e)}
+        except Exception as e:
+            log.exception("Control command %s failed", command.get("cmd"))
+            return {"ok": False, "error": str(e)}
+
+    def _targets(self, command):
+        index = command.get("pet")
+        if index is None:
+            return list(enumerate(self.pets))
+        if not isinstance(index, int) or not 0 <= index < len(self.pets):
+            raise ValueError(f"no pet {index}")
+        return [(index, self.pets[index])]
+
+    def cmd_ping(self, command):
+        return {"ok": True, "version": APP_VERSION, "pets": len(self.pets)}
+
+    def cmd_spawn(self, command):
+        pet = self.spawn()
+        pet.raise_()
+        return {"ok": True, "pet": self.pets.index(pet)}
+
+    def cmd_feed(self, command):
+        fed = []
+        for i, pet in self._targets(command):
+            if pet.status and pet.status.can_feed() and pet.fsm.current_state != "feed":
+                pet.start_feed_sequence()
+                fed.append(i)
+        if not fed:
+            return {"ok": False, "error": "cooldown"}
+        return {"ok": True, "fed": fed}
+
+    def cmd_sleep(self, command):
+        targets = self._targets(command)
+        for _, pet in targets:
+            if not pet.playing_mode:
+                pet.fsm.set_state("sleep", force=True)
+        return {"ok": True, "pets": [i for i, _ in targets]}
+
+    def cmd_follow(self, command):
+        result = {}
+        for i, pet in self._targets(command):
+            on = command.get("on")
+            if on is None or bool(on) != pet.follow_mode:
+                pet.toggle_follow_mode()
+            result[str(i)] = pet.follow_mode
+        return {"ok": True, "follow": result}
+
+    def cmd_status(self, command):
+        pets = []
+        for i, pet in self._targets(command):
+            info = {"pet": i, "state": pet.fsm.current_state, "x": pet.x(), "y": pet.y(), "follow": pet.follow_mode}
+            if pet.status:
+                info.update(hunger=round(pet.status.hunger, 1), mood=pet.status.get_mood(),
+                            bored=pet.status.is_bored, uncomfortable=pet.status.is_uncomfortable)
+            pets.append(info)
+        return {"ok": True, "pets": pets}
@@ -0,0 +1,153 @@
+import math
+from collections import deque
+from PyQt6.QtCore import QPoint
+from PyQt6.QtGui import QCursor
+from .constants import PHYSICS_INTERVAL_MS
+
+# Alpha-beta-gamma filter gains (position, velocity, acceleration)
+FILTER_ALPHA = 0.5
+FILTER_BETA = 0.4
+FILTER_GAMMA = 0.1
+
+HISTORY_SIZE = 32           # Raw samples kept
+RESET_GAP_MS = 250          # Longer gaps restart the filter (no stale velocity)
+INTERCEPT_MAX_LEAD_S = 0.4  # Never aim further ahead than this
+
+def qcursor_source():
+    p = QCursor.pos()
+    return p.x(), p.y()
+
+class CursorTracker:
+    """
+    Samples the cursor at most once per frame and keeps a smoothed estimate
+    of its position, velocity and acceleration (px, px/s, px/s²).
+
+    Every pet (and the laser overlay) reads through the same tracker, so
+    N pets cost one OS cursor query per frame. `source` and `clock` are
+    injectable so recorded traces can be replayed.
+    """
+
+    def __init__(self, source=None, clock=None, frame_ms=PHYSICS_INTERVAL_MS):
+        self.source = source or qcursor_source
+        if clock is None:
+            from .scheduler import get_scheduler
+            clock = get_scheduler().clock
+        self.clock = clock
+        self.frame_ms = frame_ms
+        self.min_interval = frame_ms / 2.0 # Callers within half a frame share a sample
+
+        self.history = deque(maxlen=HISTORY_SIZE) # (time_ms, x, y)
+        self.last_time = None
+        self.raw_x = self.raw_y = 0
+        self.x = self.y = 0.0
+        self.vx = self.vy = 0.0
+        self.ax = self.ay = 0.0
+        self.reads = 0 # OS cursor queries made
+
+    def sample(self):
+        """Refreshes the estimate if the last read is older than half a frame."""
+        now = self.clock()
+        if self.last_time is not None and now - self.last_time < self.min_interval:
+            return self
+        raw_x, raw_y = self.source()
+        self.reads += 1
+        self._update(now, raw_x, raw_y)
+        return self
+
+    def _update(self, now, raw_x, raw_y):
+        self.raw_x, self.raw_y = raw_x, raw_y
+        self.history.append((now, raw_x, raw_y))
+
+        if self.last_time is None or now - self.last_time > RESET_GAP_MS:
+            self.x, self.y = float(raw_x), float(raw_y)
+            self.vx = self.vy = self.ax = self.ay = 0.0
+            self.last_time = now
+            return
+
+        dt = (now - self.last_time) / 1000.0
+        self.last_time = now
+        if dt <= 0:
+            return
+
+        self.x, self.vx, self.ax = self._filter(self.x, self.vx, self.ax, raw_x, dt)
+        self.y, self.vy, self.ay = self._filter(self.y, self.vy, self.ay, raw_y, dt)
+
+    @staticmethod
+    def _filter(x, v, a, z, dt):
+        # Predict, then correct with the residual
+        xp = x + v * dt + 0.5 * a * dt * dt
+        vp = v + a * dt
+        r = z - xp
+        return (xp + FILTER_ALPHA * r,
+                vp + FILTER_BETA * r / dt,
+                a + 2.0 * FILTER_GAMMA * r / (dt * dt))
+
+    @property
+    def pos(self):
+        """Latest raw cursor position."""
+        return QPoint(self.raw_x, self.raw_y)
+
+    @property
+    def speed(self):
+        return math.hypot(self.vx, self.vy)
+
+    def predict(self, t_s):
+        """Estimated cursor position t_s seconds ahead (constant velocity)."""
+        return self.x + self.vx * t_s, self.y + self.vy * t_s
+
+    def intercept(self, px, py, speed):
+        """Point a chaser at (px, py) moving at `speed` px/s should head for."""
+        return intercept_point(px, py, speed, self.raw_x, self.raw_y, self.vx, self.vy)
+
+    def steer(self, px, py, step, lead=True):
+        """
+        Per-frame (dx, dy) move of `step` px for a chaser at (px, py): towards
+        the intercept point, or straight at the cursor with lead=False.
+        """
+        if lead:
+            aim_x, aim_y = self.intercept(px, py, step * 1000.0 / self.frame_ms)
+        else:
+            aim_x, aim_y = self.raw_x, self.raw_y
+        dx, dy = aim_x - px, aim_y - py
+        length = math.hypot(dx, dy)
+        if length < 1e-6:
+            return 0.0, 0.0
+        return dx / length * step, dy / length * step
+
+def intercept_point(px, py, speed, tx, ty, tvx, tvy, max_lead=INTERCEPT_MAX_LEAD_S):
+    """
+    Solves |T + V·t - P| = speed·t for the earliest t > 0 and returns the
+    target's position at that time. The lead is capped at max_lead seconds
+    (the velocity estimate is noisy); if the target cannot be caught the
+    chaser falls back to aiming at it directly.
+    """
+    rx, ry = tx - px, ty - py
+    a = tvx * tvx + tvy * tvy - speed * speed
+    b = 2.0 * (rx * tvx + ry * tvy)
+    c = rx * rx + ry * ry
+
+    t = None
+    if abs(a) < 1e-9:
+        if b < 0:
+            t = -c / b
+    else:
+        disc = b * b - 4.0 * a * c
+        if disc >= 0:
+            root = math.sqrt(disc)
+            candidates = [x for x in ((-b - root) / (2.0 * a), (-b + root) / (2.0 * a)) if x > 0]
+            if candidates:
+                t = min(candidates)
+
+    if t is None:
+        t = 0.0 # Uncatchable: plain pursuit
+    t = min(t, max_lead)
+    return tx + tvx * t, ty + tvy * t
+
+_default_tracker = None
+
+def get_cursor_tracker():
+    """Process-wide tracker shared by every pet (created on first use)."""
+    global _default_tracker
+    if _default_tracker is None:
+        _default_tracker = CursorTracker()
+    return _default_tracker
@@ -0,0 +1,276 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+# Retention (seconds)
+RAW_RETENTION = 7 * 24 * 3600         # Raw hunger samples kept this long, then rolled up
+ROLLUP_BUCKET = 3600                  # Rollup granularity for old hunger samples
+ROLLUP_RETENTION = 365 * 24 * 3600    # Hourly rollups kept this long
+EVENT_RETENTION = 90 * 24 * 3600      # Mood transitions / feed / toilet / play events
+MAINTENANCE_INTERVAL = 3600           # Seconds between retention passes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hunger_samples (
+    ts REAL NOT NULL,
+    hunger INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_hunger_ts ON hunger_samples(ts);
+
+CREATE TABLE IF NOT EXISTS hunger_rollup (
+    bucket REAL PRIMARY KEY,
+    total REAL NOT NULL,
+    n INTEGER NOT NULL,
+    min INTEGER NOT NULL,
+    max INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS events (
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_kind_ts ON events(kind, ts);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts);
+"""
+
+def hunger_series(conn, start, end, points=60):
+    """
+    Up to `points` (bucket_start_ts, avg_hunger) pairs covering [start, end).
+    Raw samples serve the last RAW_RETENTION; older stretches come from the
+    hourly rollups (raw rows are deleted as they are rolled up, so the two
+    never overlap).
+    """
+    width = max(1.0, (end - start) / points)
+    rows = conn.execute(
+        """
+        SELECT CAST((ts - ?) / ? AS INTEGER) AS b, SUM(total) * 1.0 / SUM(n)
+        FROM (
+            SELECT ts, hunger AS total, 1 AS n FROM hunger_samples WHERE ts >= ? AND ts < ?
+            UNION ALL
+            SELECT bucket AS ts, total, n FROM hunger_rollup WHERE bucket >= ? AND bucket < ?
+        )
+        GROUP BY b ORDER BY b
+        """,
+        (start, width, start, end, start, end),
+    ).fetchall()
+    return [(start + b * width, avg) for b, avg in rows]
+
+def event_counts(conn, start, end, kind=None):
+    """Returns {kind: count} for events in [start, end)."""
+    if kind is None:
+        rows = conn.execute(
+            "SELECT kind, COUNT(*) FROM events WHERE ts >= ? AND ts < ? GROUP BY kind",
+            (start, end),
+        ).fetchall()
+    else:
+        rows = conn.execute(
+            "SELECT kind, COUNT(*) FROM events WHERE kind = ? AND ts >= ? AND ts < ?",
+            (kind, start, end),
+        ).fetchall()
+    return {k: n for k, n in rows if k is not None}
+
+def mood_durations(conn, start, end):
+    """Returns {mood: seconds} spent in each mood during [start, end)."""
+    # Mood in effect at `start` is the last transition before it
+    prev = conn.execute(
+        "SELECT value FROM events WHERE kind = 'mood' AND ts < ? ORDER BY ts DESC LIMIT 1",
+        (start,),
+    ).fetchone()
+    transitions = conn.execute(
+        "SELECT ts, value FROM events WHERE kind = 'mood' AND ts >= ? AND ts < ? ORDER BY ts",
+        (start, end),
+    ).fetchall()
+
+    durations = {}
+    current, since = (prev[0] if prev else None), start
+    for ts, mood in transitions:
+        if current is not None:
+            durations[current] = durations.get(current, 0.0) + (ts - since)
+        current, since = mood, ts
+    if current is not None:
+        durations[current] = durations.get(current, 0.0) + (min(end, time.time()) - since)
+    return durations
+
+def summary(conn, start, end):
+    """Event counts and mood durations for [start, end) in one query call."""
+    return {"events": event_counts(conn, start, end), "moods": mood_durations(conn, start, end)}
+
+class _Query:
+    """Writer-thread request for HistoryStore.query()."""
+
+    def __init__(self, fn, args, callback):
+        self.fn = fn
+        self.args = args
+        self.callback = callback
+
+class HistoryStore:
+    """
+    Embedded SQLite time-series store for pet history.
+
+    record_*() calls only enqueue rows. A background thread owns the write
+    connection, inserts queued rows in one transaction per batch_interval
+    and periodically rolls old raw samples up into hourly buckets so the
+    database stays bounded. Queries run on the same thread, after the rows
+    queued before them have landed.
+    """
+
+    _STOP = object()
+
+    def __init__(self, db_path, batch_interval=30.0):
+        self.db_path = db_path
+        self.batch_interval = batch_interval
+
+        self._queue = queue.Queue()
+        self._last_mood = None
+
+        # The writer thread opens the database and creates the schema before
+        # anything queued is handled, so the caller never waits on disk
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # --- Recording (GUI thread, never blocks on disk) ---
+    def record_hunger(self, hunger, ts=None):
+        self._queue.put(("hunger", ts or time.time(), int(hunger)))
+
+    def record_event(self, kind, value=None, ts=None):
+        self._queue.put(("event", ts or time.time(), kind, value))
+
+    def record_mood(self, mood, ts=None):
+        """Records a mood transition; repeated identical moods are ignored."""
+        if mood == self._last_mood:
+            return
+        self._last_mood = mood
+        self.record_event("mood", mood, ts)
+
+    def query(self, fn, *args, callback):
+        """
+        Runs fn(conn, *args) on the writer thread once everything queued so
+        far is committed, and passes the result (None on error) to callback
+        there. See hunger_series(), event_counts() and mood_durations().
+        """
+        self._queue.put(_Query(fn, args, callback))
+
+    def flush(self):
+        """Blocks until all queued rows are committed."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        if self._thread is None:
+            return
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._thread = None
+
+    # --- Writer thread ---
+    def _run(self):
+        try:
+            conn = self._connect()
+            conn.executescript(SCHEMA)
+        except sqlite3.Error as e:
+            log.warning("History unavailable: %s", e)
+            self._drain()
+            return
+        rows = []
+        deadline = None
+        next_maintenance = time.monotonic()
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, tuple):
+                rows.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.batch_interval
+                continue
+
+            self._insert(conn, rows)
+            rows = []
+            deadline = None
+
+            if time.monotonic() >= next_maintenance:
+                self._maintain(conn)
+                next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL
+
+            if item is self._STOP:
+                break
+            if isinstance(item, _Query):
+                self._answer(conn, item)
+            elif item is not None:
+                item.set()
+        conn.close()
+
+    def _drain(self):
+        # No database: still release flush() waiters and answer queries
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            if isinstance(item, _Query):
+                item.callback(None)
+            elif isinstance(item, threading.Event):
+                item.set()
+
+    def _insert(self, conn, rows):
+        if not rows:
+            return
+        hunger = [(r[1], r[2]) for r in rows if r[0] == "hunger"]
+        events = [(r[1], r[2], r[3]) for r in rows if r[0] == "event"]
+        try:
+            with conn:
+                if hunger:
+                    conn.executemany("INSERT INTO hunger_samples (ts, hunger) VALUES (?, ?)", hunger)
+                if events:
+                    conn.executemany("INSERT INTO events (ts, kind, value) VALUES (?, ?, ?)", events)
+        except sqlite3.Error as e:
+            log.warning("Error writing history: %s", e)
+
+    def _maintain(self, conn, now=None):
+        """Rolls raw samples older than RAW_RETENTION into hourly buckets and drops expired rows."""
+        now = now or time.time()
+        raw_cutoff = now - RAW_RETENTION
+        try:
+            with conn:
+                conn.execute(
+                    """
+                    INSERT INTO hunger_rollup (bucket, total, n, min, max)
+                    SELECT CAST(ts / ? AS INTEGER) * ?, SUM(hunger), COUNT(*), MIN(hunger), MAX(hunger)
+                    FROM hunger_samples WHERE ts < ?
+                    GROUP BY CAST(ts / ? AS INTEGER)
+                    ON CONFLICT(bucket) DO UPDATE SET
+                        total = total + excluded.total,
+                        n = n + excluded.n,
+                        min = MIN(min, excluded.min),
+                        max = MAX(max, excluded.max)
+                    """,
+                    (ROLLUP_BUCKET, ROLLUP_BUCKET, raw_cutoff, ROLLUP_BUCKET),
+                )
+                conn.execute("DELETE FROM hunger_samples WHERE ts < ?", (raw_cutoff,))
+                conn.execute("DELETE FROM hunger_rollup WHERE bucket < ?", (now - ROLLUP_RETENTION,))
+                conn.execute("DELETE FROM events WHERE ts < ?", (now - EVENT_RETENTION,))
+        except sqlite3.Error as e:
+            log.warning("Error maintaining history: %s", e)
+
+    def _answer(self, conn, query):
+        try:
+            result = query.fn(conn, *query.args)
+        except sqlite3.Error as e:
+            log.warning("Error querying history: %s", e)
+            result = None
+        query.callback(result)
@@ -0,0 +1,142 @@
+import math
+from PyQt6.QtWidgets import QApplication
+from .constants import JUMP_GRAVITY
+
+def walkable_span(screens, x, y, w, h):
+    """
+    Horizontal range [left, right] the window's top-left x may take at
+    height y: the available geometry of the screen under the window,
+    extended across side-by-side screens that also cover rows y..y+h.
+    Returns (left, right, top, bottom) with top/bottom the vertical limits
+    of the starting screen.
+    """
+    cx, cy = x + w // 2, y + h // 2
+    start = None
+    for geo in screens:
+        if geo.contains(cx, cy):
+            start = geo
+            break
+    if start is None:
+        start = min(screens, key=lambda g: abs(g.center().x() - cx) + abs(g.center().y() - cy))
+
+    left, right = start.left(), start.right() + 1
+    grown = True
+    while grown:
+        grown = False
+        for geo in screens:
+            covers = geo.top() <= y and geo.bottom() + 1 >= y + h
+            if covers and geo.right() + 1 == left:
+                left, grown = geo.left(), True
+            elif covers and geo.left() == right:
+                right, grown = geo.right() + 1, True
+    # Inclusive limits, the same convention as NavGraph
+    return left, right - 1 - w, start.top(), start.bottom() - h
+
+class JumpArc:
+    """
+    A ballistic jump solved once at take-off.
+
+    The arc is checked against the screen layout when it is created
+    (horizontal walls reflect it, the top and bottom of the screen clip
+    it), after which position() just evaluates the closed form for the
+    elapsed time. Skipped ticks therefore never change the landing point.
+    """
+
+    def __init__(self, x, y, vx, vy, duration, w, h, gravity=JUMP_GRAVITY, screens=None):
+        self.x0, self.y0 = float(x), float(y)
+        self.vx, self.vy = vx, vy
+        self.gravity = gravity
+        self.duration = duration
+
+        if screens is None:
+            screens = [s.availableGeometry() for s in QApplication.screens()]
+        if screens:
+            self.left, self.right, self.top, self.bottom = walkable_span(screens, int(x), int(y), w, h)
+        else:
+            self.left = self.right = self.x0
+            self.top = self.bottom = self.y0
+        self.right = max(self.right, self.left)
+        self.bottom = max(self.bottom, self.top)
+        # Start inside the span even if the window was dropped slightly outside it
+        self.x0 = min(max(self.x0, self.left), self.right)
+        self.w, self.h = w, h
+        self.platform = None # Window edge the arc ends on, if any
+        self.land_y = None
+
+    @classmethod
+    def launch(cls, x, y, speed, angle_deg, direction, w, h, gravity=JUMP_GRAVITY, screens=None):
+        """Jump at `speed` px/s and angle_deg above horizontal, landing back on y."""
+        rad = math.radians(angle_deg)
+        vx = speed * math.cos(rad) * direction
+        vy = -speed * math.sin(rad)
+        return cls(x, y, vx, vy, -2.0 * vy / gravity, w, h, gravity, screens)
+
+    @classmethod
+    def targeted(cls, x, y, dx, dy, duration, w, h, gravity=JUMP_GRAVITY, screens=None):
+        """Jump that covers (dx, dy) in exactly `duration` seconds."""
+        vx = dx / duration
+        vy = (dy - 0.5 * gravity * duration * duration) / duration
+        return cls(x, y, vx, vy, duration, w, h, gravity, screens)
+
+    def land_on(self, surfaces, valid=None):
+        """
+        Cuts the arc short at the first window top edge it falls onto.
+        Only edges between the apex and the landing height are examined,
+        once, at take-off. `valid(x, y)` can veto a standing position.
+        """
+        g, vy = self.gravity, self.vy
+        apex_t = min(max(-vy / g, 0.0), self.duration)
+        apex_feet = self.y0 + vy * apex_t + 0.5 * g * apex_t * apex_t + self.h
+        end_feet = self.y0 + vy * self.duration + 0.5 * g * self.duration ** 2 + self.h
+
+        for edge in surfaces.edges_between(int(apex_feet), int(end_feet) + 1):
+            ey, ex0, ex1, _ = edge
+            # Descending root of y(t) + h = ey
+            disc = vy * vy + 2.0 * g * (ey - self.h - self.y0)
+            if disc < 0:
+                continue
+            t = (-vy + disc ** 0.5) / g
+            if t <= 0 or t > self.duration:
+                continue
+            x, _ = self._x_at(t)
+            # Middle half of the sprite must be over the edge
+            if not (ex0 <= x + self.w // 4 and x + self.w * 3 // 4 <= ex1):
+                continue
+            if valid and not valid(x, ey - self.h):
+                continue
+            if self.platform is None or t < self.duration:
+                self.duration = t
+                self.platform = edge
+                self.land_y = ey - self.h
+        return self.platform
+
+    def _x_at(self, t):
+        # Unfold reflections: bounce between left and right like a mirror
+        span = self.right - self.left
+        free = self.x0 + self.vx * t - self.left
+        if span <= 0:
+            return self.left, 1
+        period = 2 * span
+        m = free % period
+        if m <= span:
+            return self.left + m, 1
+        return self.left + period - m, -1
+
+    def position(self, t):
+        """(x, y, heading) at t seconds after take-off; heading is +1/-1 in
+        the sense of the launch direction (it flips on each wall bounce)."""
+        t = min(max(t, 0.0), self.duration)
+        x, sense = self._x_at(t)
+        if self.land_y is not None and t >= self.duration:
+            return x, self.land_y, sense
+        y = self.y0 + self.vy * t + 0.5 * self.gravity * t * t
+        y = min(max(y, self.top), self.bottom)
+        return x, y, sense
+
+    def landed(self, t):
+        return t >= self.duration
+
+    @property
+    def landing(self):
+        x, y, _ = self.position(self.duration)
+        return x, y
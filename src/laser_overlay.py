@@ -0,0 +1,117 @@
+import os
+from collections import deque
+from PyQt6.QtWidgets import QWidget, QApplication
+from PyQt6.QtCore import Qt, QPoint, QRect
+from PyQt6.QtGui import QPainter, QPixmap, QColor, QRadialGradient, QBrush
+from .constants import ASSETS_DIR
+from .scheduler import get_scheduler
+from .cursor_tracker import get_cursor_tracker
+
+LASER_CURSOR_FILE = os.path.join(ASSETS_DIR, "sprites", "Laser", "0.cur")
+
+class LaserOverlay(QWidget):
+    """
+    Click-through, always-on-top window that draws the laser dot (plus a
+    short fading trail) at the real cursor position during play mode.
+
+    Nothing global is touched: the window only exists between start() and
+    stop(), so ending the game (or a crash) leaves the system cursor alone.
+    The window is sized to the trail's bounding box and repaints only when
+    the cursor has moved.
+    """
+
+    TRAIL_MS = 120  # Trail length in time
+
+    def __init__(self, scheduler=None):
+        super().__init__()
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.Tool |
+            Qt.WindowType.WindowTransparentForInput |
+            Qt.WindowType.WindowDoesNotAcceptFocus
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
+
+        self.scheduler = scheduler or get_scheduler()
+        self.cursor = get_cursor_tracker()
+        self.task = None
+        self.dot = self._build_dot()
+        self.trail = deque() # (time_ms, global QPoint), oldest first
+
+    def _build_dot(self):
+        """Renders the dot once; paints only blit this pixmap."""
+        pixmap = QPixmap(LASER_CURSOR_FILE)
+        if not pixmap.isNull():
+            return pixmap
+
+        size = 20
+        pixmap = QPixmap(size, size)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        gradient = QRadialGradient(size / 2, size / 2, size / 2)
+        gradient.setColorAt(0.0, QColor(255, 255, 255, 255))
+        gradient.setColorAt(0.3, QColor(255, 40, 40, 255))
+        gradient.setColorAt(1.0, QColor(255, 0, 0, 0))
+        painter.setBrush(QBrush(gradient))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawEllipse(0, 0, size, size)
+        painter.end()
+        return pixmap
+
+    def start(self):
+        if self.task:
+            return
+        screen = QApplication.primaryScreen()
+        rate = screen.refreshRate() if screen else 0
+        interval = 1000.0 / (rate if rate and rate > 0 else 60)
+        self.trail.clear()
+        self.task = self.scheduler.call_every(interval, self.tick)
+        self.tick()
+        self.show()
+
+    def stop(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        self.trail.clear()
+        self.hide()
+
+    def tick(self):
+        now = self.scheduler.clock()
+        pos = self.cursor.sample().pos
+        moved = not self.trail or self.trail[-1][1] != pos
+        if moved:
+            self.trail.append((now, pos))
+
+        expired = False
+        while len(self.trail) > 1 and now - self.trail[0][0] > self.TRAIL_MS:
+            self.trail.popleft()
+            expired = True
+
+        if not moved and not expired:
+            return
+
+        half_w, half_h = self.dot.width() // 2 + 1, self.dot.height() // 2 + 1
+        xs = [p.x() for _, p in self.trail]
+        ys = [p.y() for _, p in self.trail]
+        rect = QRect(QPoint(min(xs) - half_w, min(ys) - half_h), QPoint(max(xs) + half_w, max(ys) + half_h))
+        if rect != self.geometry():
+            self.setGeometry(rect)
+        self.update()
+
+    def paintEvent(self, event):
+        if not self.trail:
+            return
+        painter = QPainter(self)
+        origin = self.geometry().topLeft()
+        half_w, half_h = self.dot.width() // 2, self.dot.height() // 2
+        newest = self.trail[-1][0]
+
+        for t, p in self.trail:
+            # Older points fade out; the newest is fully opaque
+            painter.setOpacity(max(0.1, 1.0 - (newest - t) / self.TRAIL_MS))
+            painter.drawPixmap(p.x() - origin.x() - half_w, p.y() - origin.y() - half_h, self.dot)
@@ -0,0 +1,241 @@
+import collections
+import gc
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QPlainTextEdit, QApplication
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+from . import resource_utils
+from .scheduler import get_scheduler
+
+log = logging.getLogger(__name__)
+
+MEMORY_SAMPLE_MS = 60 * 1000  # Growth sample period while developer mode is on
+MEMORY_SAMPLES = 24 * 60      # One day of samples
+TRACEMALLOC_FRAMES = 1        # Allocation sites by line; more frames cost more per allocation
+DIFF_TOP = 15
+
+# Wrapper types worth counting even when they aren't widgets
+QT_VALUE_TYPES = ("QPixmap", "QImage", "QRegion", "QBitmap", "QAction", "QTimer")
+
+def process_rss():
+    """Resident set size in bytes, or None where it can't be read cheaply."""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            class Counters(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+            counters = Counters()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+            return None
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def count_qt_objects():
+    """
+    {type name: live count} for every widget (including ones only C++ holds)
+    plus the Python-wrapped Qt value types in QT_VALUE_TYPES.
+    """
+    counts = collections.Counter()
+    app = QApplication.instance()
+    if app is not None:
+        for widget in app.allWidgets():
+            counts[type(widget).__name__] += 1
+    for obj in gc.get_objects():
+        name = type(obj).__name__
+        if name in QT_VALUE_TYPES and type(obj).__module__.startswith("PyQt6"):
+            counts[name] += 1
+    return counts
+
+class MemoryTracker:
+    """
+    Developer-mode memory bookkeeping: tracemalloc snapshots taken on
+    demand and diffed against the previous one, and a periodic sample of
+    process size and live Qt object counts so slow growth over a long
+    session shows up as a trend rather than a single number.
+    """
+
+    def __init__(self, scheduler=None):
+        self.scheduler = scheduler or get_scheduler()
+        self.samples = collections.deque(maxlen=MEMORY_SAMPLES) # (time, rss, traced, Counter)
+        self.snapshots = [] # (time, tracemalloc.Snapshot): the first and the latest
+        self.sample_task = None
+
+    @property
+    def running(self):
+        return self.sample_task is not None
+
+    def start(self):
+        if self.running:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        self.sample()
+        self.sample_task = self.scheduler.call_every(MEMORY_SAMPLE_MS, self.sample, tolerance_ms=MEMORY_SAMPLE_MS // 10)
+        log.info("Memory tracking started")
+
+    def stop(self):
+        if self.sample_task:
+            self.sample_task.cancel()
+            self.sample_task = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.snapshots = []
+
+    def sample(self):
+        traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        self.samples.append((time.time(), process_rss(), traced, count_qt_objects()))
+
+    def snapshot(self):
+        """Takes a snapshot; returns the top allocation-site changes since the previous one as text."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        snap = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        now = time.time()
+        previous = self.snapshots[-1] if self.snapshots else None
+        # Keep the first one as a baseline and the latest for the next diff
+        self.snapshots = self.snapshots[:1] + [(now, snap)]
+        if previous is None:
+            total = sum(stat.size for stat in snap.statistics("filename"))
+            return f"Baseline snapshot: {total / 1024:.0f} KiB traced"
+        return self._format_diff(snap, previous)
+
+    def diff_from_baseline(self):
+        if len(self.snapshots) < 2:
+            return "Need a baseline and a later snapshot"
+        return self._format_diff(self.snapshots[-1][1], self.snapshots[0])
+
+    @staticmethod
+    def _format_diff(snap, previous):
+        then, old = previous
+        stats = snap.compare_to(old, "lineno")
+        lines = [f"Allocations vs {time.strftime('%H:%M:%S', time.localtime(then))} "
+                 f"(net {sum(s.size_diff for s in stats) / 1024:+.1f} KiB):"]
+        for stat in stats[:DIFF_TOP]:
+            frame = stat.traceback[0]
+            lines.append(f"  {stat.size_diff / 1024:+9.1f} KiB {stat.count_diff:+7d}  "
+                         f"{os.path.basename(frame.filename)}:{frame.lineno}")
+        return "\n".join(lines)
+
+    def growth(self):
+        """Text summary of the latest sample and the change since the first one."""
+        if not self.samples:
+            return "No samples yet"
+        t0, rss0, traced0, counts0 = self.samples[0]
+        t1, rss1, traced1, counts1 = self.samples[-1]
+        hours = max((t1 - t0) / 3600.0, 1e-9)
+
+        def mib(v):
+            return "n/a" if v is None else f"{v / (1024 * 1024):.1f} MiB"
+
+        def rate(a, b, scale=1.0):
+            if a is None or b is None or t1 == t0:
+                return ""
+            if t1 - t0 < 600: # Too short for a meaningful hourly rate
+                return f" ({(b - a) / scale:+.1f})"
+            return f" ({(b - a) / scale:+.1f}, {(b - a) / scale / hours:+.2f}/h)"
+
+        lines = [f"Samples: {len(self.samples)} over {(t1 - t0) / 60:.0f} min",
+                 f"RSS:    {mib(rss1)}{rate(rss0, rss1, 1024 * 1024)}",
+                 f"Traced: {mib(traced1)}{rate(traced0, traced1, 1024 * 1024)}",
+                 "Live Qt objects:"]
+        for name in sorted(set(counts0) | set(counts1), key=lambda n: -counts1.get(n, 0)):
+            lines.append(f"  {name:<22} {counts1.get(name, 0):6d}{rate(counts0.get(name, 0), counts1.get(name, 0))}")
+        return "\n".join(lines)
+
+    def save_report(self, extra=""):
+        """Writes growth + the last diff to the data directory; returns the path."""
+        path = os.path.join(resource_utils.get_data_path(), time.strftime("memory_report-%Y%m%d-%H%M%S.txt"))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.growth())
+            if extra:
+                f.write("\n\n" + extra)
+            f.write("\n")
+        return path
+
+_default_tracker = None
+
+def get_memory_tracker():
+    """Process-wide tracker shared by every pet (created on first use)."""
+    global _default_tracker
+    if _default_tracker is None:
+        _default_tracker = MemoryTracker()
+    return _default_tracker
+
+class MemoryPanel(QWidget):
+    """Developer-mode window over the shared MemoryTracker."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Memory")
+        self.setWindowFlags(Qt.WindowType.Window | Qt.WindowType.WindowStaysOnTopHint)
+        self.resize(520, 420)
+        self.tracker = get_memory_tracker()
+        self.tracker.start()
+        self.last_diff = ""
+
+        layout = QVBoxLayout(self)
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        font = QFont("Consolas")
+        font.setStyleHint(QFont.StyleHint.Monospace)
+        self.text.setFont(font)
+        layout.addWidget(self.text)
+
+        buttons = QHBoxLayout()
+        for label, slot in (("Refresh", self.refresh), ("Snapshot + Diff", self.take_snapshot),
+                            ("Diff vs Baseline", self.diff_baseline), ("Save Report", self.save_report)):
+            button = QPushButton(label)
+            button.clicked.connect(slot)
+            buttons.addWidget(button)
+        layout.addLayout(buttons)
+
+    def showEvent(self, event):
+        self.refresh()
+        super().showEvent(event)
+
+    def refresh(self):
+        self.tracker.sample()
+        self.show_text()
+
+    def take_snapshot(self):
+        self.last_diff = self.tracker.snapshot()
+        self.refresh()
+
+    def diff_baseline(self):
+        self.last_diff = self.tracker.diff_from_baseline()
+        self.show_text()
+
+    def show_text(self):
+        text = self.tracker.growth()
+        if self.last_diff:
+            text += "\n\n" + self.last_diff
+        self.text.setPlainText(text)
+
+    def save_report(self):
+        try:
+            path = self.tracker.save_report(self.last_diff)
+        except OSError as e:
+            log.warning("Failed to save memory report: %s", e)
+            return
+        log.info("Memory report saved to %s", path)
+        self.last_diff = (self.last_diff + "\n\n" if self.last_diff else "") + f"Saved: {path}"
+        self.show_text()
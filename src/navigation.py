@@ -0,0 +1,190 @@
+import heapq
+import math
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+
+def _clamp(v, lo, hi):
+    return lo if v < lo else hi if v > hi else v
+
+class NavGraph:
+    """
+    Walkable area for a window of size (w, h), in window top-left
+    coordinates.
+
+    Every screen's available geometry contributes one rect (the positions
+    where the window fits entirely on it). Screens that touch side by side
+    or top to bottom add a "bridge" rect covering the band both share, so
+    the window can straddle the seam. Rects that overlap are connected;
+    the overlap is the doorway between them. The union of the rects is
+    exactly where the pet may stand.
+    """
+
+    def __init__(self, screens, w, h):
+        self.w, self.h = w, h
+        self.rects = [] # (x0, y0, x1, y1), inclusive
+
+        bounds = [(g.left(), g.top(), g.left() + g.width(), g.top() + g.height()) for g in screens]
+        for l, t, r, b in bounds:
+            self._add(l, t, r - 1 - w, b - 1 - h)
+
+        for i, (al, at, ar, ab) in enumerate(bounds):
+            for bl, bt, br, bb in bounds[i + 1:]:
+                if ar == bl or br == al: # Side by side
+                    self._add(min(al, bl), max(at, bt), max(ar, br) - 1 - w, min(ab, bb) - 1 - h)
+                if ab == bt or bb == at: # Stacked
+                    self._add(max(al, bl), min(at, bt), min(ar, br) - 1 - w, max(ab, bb) - 1 - h)
+
+        self.doors = {i: {} for i in range(len(self.rects))} # i -> {j: door rect}
+        for i, a in enumerate(self.rects):
+            for j in range(i + 1, len(self.rects)):
+                door = self._intersect(a, self.rects[j])
+                if door:
+                    self.doors[i][j] = door
+                    self.doors[j][i] = door
+
+        self._routes = {} # (start rect, goal rect) -> rect sequence
+
+    def _add(self, x0, y0, x1, y1):
+        if x1 >= x0 and y1 >= y0:
+            self.rects.append((x0, y0, x1, y1))
+
+    @staticmethod
+    def _intersect(a, b):
+        x0, y0 = max(a[0], b[0]), max(a[1], b[1])
+        x1, y1 = min(a[2], b[2]), min(a[3], b[3])
+        if x1 >= x0 and y1 >= y0:
+            return (x0, y0, x1, y1)
+        return None
+
+    def locate(self, x, y):
+        """Index of a rect containing (x, y), or None."""
+        for i, (x0, y0, x1, y1) in enumerate(self.rects):
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                return i
+        return None
+
+    def contains(self, x, y):
+        return self.locate(x, y) is not None
+
+    def nearest(self, x, y):
+        """(index, x, y) of the closest walkable point to (x, y)."""
+        best = None
+        for i, (x0, y0, x1, y1) in enumerate(self.rects):
+            px, py = _clamp(x, x0, x1), _clamp(y, y0, y1)
+            d = (px - x) ** 2 + (py - y) ** 2
+            if best is None or d < best[0]:
+                best = (d, i, px, py)
+        if best is None:
+            return None, x, y
+        return best[1], best[2], best[3]
+
+    def plan(self, sx, sy, gx, gy):
+        """
+        Waypoints from (sx, sy) to the walkable point nearest (gx, gy).
+        The rect route is found with A* and cached per (start, goal) rect
+        pair, so a moving target only re-clamps the doorway points.
+        """
+        start = self.locate(sx, sy)
+        goal, gx, gy = self.nearest(gx, gy)
+        if start is None:
+            # Off the walkable area (e.g. screens changed): head back onto it first
+            start, nx, ny = self.nearest(sx, sy)
+            if start is None:
+                return []
+            return [(nx, ny)] + self.plan(nx, ny, gx, gy)
+        if start == goal:
+            return [(gx, gy)]
+
+        key = (start, goal)
+        route = self._routes.get(key)
+        if route is None:
+            route = self._search(start, goal, sx, sy, gx, gy)
+            self._routes[key] = route
+        if not route:
+            return [] # Unreachable
+
+        # Cross each doorway at its point nearest the goal. Consecutive
+        # waypoints share a (convex) rect, so every leg stays walkable.
+        points = []
+        for a, b in zip(route, route[1:]):
+            x0, y0, x1, y1 = self.doors[a][b]
+            points.append((_clamp(gx, x0, x1), _clamp(gy, y0, y1)))
+        if points[-1] != (gx, gy):
+            points.append((gx, gy))
+        return points
+
+    def _search(self, start, goal, sx, sy, gx, gy):
+        # A* over rects; a rect is entered at the centre of its doorway
+        def centre(door):
+            return (door[0] + door[2]) / 2.0, (door[1] + door[3]) / 2.0
+
+        open_heap = [(math.hypot(gx - sx, gy - sy), 0.0, start, sx, sy)]
+        came_from = {start: None}
+        best = {start: 0.0}
+        while open_heap:
+            _, g, node, px, py = heapq.heappop(open_heap)
+            if node == goal:
+                route = []
+                while node is not None:
+                    route.append(node)
+                    node = came_from[node]
+                return route[::-1]
+            if g > best.get(node, math.inf):
+                continue
+            for nxt, door in self.doors[node].items():
+                cx, cy = centre(door)
+                cost = g + math.hypot(cx - px, cy - py)
+                if cost < best.get(nxt, math.inf):
+                    best[nxt] = cost
+                    came_from[nxt] = node
+                    heapq.heappush(open_heap, (cost + math.hypot(gx - cx, gy - cy), cost, nxt, cx, cy))
+        return None
+
+class Navigator(QObject):
+    """
+    Keeps NavGraphs for the current screen layout, one per window size,
+    and throws them away when screens are added, removed or resized. The
+    graphs are rebuilt lazily on the next query.
+    """
+
+    layout_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._graphs = {}
+        self.rebuilds = 0
+        app = QApplication.instance()
+        if app is not None:
+            app.screenAdded.connect(self._on_screen_added)
+            app.screenRemoved.connect(lambda screen: self.invalidate())
+            for screen in app.screens():
+                self._watch(screen)
+
+    def _watch(self, screen):
+        screen.availableGeometryChanged.connect(lambda geo: self.invalidate())
+        screen.geometryChanged.connect(lambda geo: self.invalidate())
+
+    def _on_screen_added(self, screen):
+        self._watch(screen)
+        self.invalidate()
+
+    def invalidate(self):
+        self._graphs.clear()
+        self.layout_changed.emit()
+
+    def graph(self, w, h):
+        g = self._graphs.get((w, h))
+        if g is None:
+            g = NavGraph([s.availableGeometry() for s in QApplication.screens()], w, h)
+            self._graphs[(w, h)] = g
+            self.rebuilds += 1
+        return g
+
+_default_navigator = None
+
+def get_navigator():
+    """Process-wide navigator shared by every pet (created on first use)."""
+    global _default_navigator
+    if _default_navigator is None:
+        _default_navigator = Navigator()
+    return _default_navigator
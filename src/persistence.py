@@ -0,0 +1,411 @@
+import json
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, QTimer
+
+log = logging.getLogger(__name__)
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+class FileLock:
+    """
+    Cross-process advisory lock on a sidecar file (flock on POSIX, msvcrt on Windows).
+    Not reentrant; use one instance per critical section or hold it for a lifetime.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._fh = None
+
+    def acquire(self, blocking=True):
+        fh = open(self.path, "a+b")
+        try:
+            if os.name == "nt":
+                fh.seek(0)
+                mode = msvcrt.LK_NBLCK
+                while True:
+                    try:
+                        msvcrt.locking(fh.fileno(), mode, 1)
+                        break
+                    except OSError:
+                        if not blocking:
+                            raise
+                        time.sleep(0.01)
+            else:
+                flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+                fcntl.flock(fh.fileno(), flags)
+        except OSError:
+            fh.close()
+            if blocking:
+                raise
+            return False
+        self._fh = fh
+        return True
+
+    def release(self):
+        if self._fh is None:
+            return
+        try:
+            if os.name == "nt":
+                self._fh.seek(0)
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._fh.close()
+            self._fh = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+def acquire_instance_slot(data_dir, max_slots=64):
+    """
+    Claims the lowest free per-instance slot by holding instance-<n>.lock.
+    Returns (slot, lock); the lock must stay referenced for the process lifetime.
+    """
+    for slot in range(max_slots):
+        lock = FileLock(os.path.join(data_dir, f"instance-{slot}.lock"))
+        try:
+            if lock.acquire(blocking=False):
+                return slot, lock
+        except OSError:
+            continue
+    return max_slots, None
+
+def read_json(path):
+    """Returns the parsed JSON at path, or None if it is missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        log.warning("Failed to read %s: %s", os.path.basename(path), e)
+        return None
+
+def atomic_write_json(path, data):
+    """Writes data as JSON to a temp file next to path, then swaps it in with os.replace."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+class DebouncedJsonWriter(QObject):
+    """
+    Coalesces save requests for one JSON file.
+
+    schedule() only (re)starts a debounce timer. When it fires, snapshot_fn is
+    called on the GUI thread and the result is serialized and written on a
+    single worker thread, so writes stay ordered. flush() writes synchronously.
+
+    If merge_fn is given, each write takes the file's cross-process lock,
+    re-reads the file and writes merge_fn(existing, snapshot) instead, so
+    several processes can share the file without clobbering each other.
+    """
+
+    def __init__(self, path, snapshot_fn, debounce_ms, parent=None, merge_fn=None):
+        super().__init__(parent)
+        self.path = path
+        self.snapshot_fn = snapshot_fn
+        self.merge_fn = merge_fn
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._write_async)
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="json-writer")
+        self._pending = None
+
+        self._dirty = 0             # Requests since the last write
+        self.write_count = 0        # Writes actually performed
+        self.coalesced_count = 0    # Requests absorbed into another write
+
+    @property
+    def is_dirty(self):
+        return self._dirty > 0
+
+    def schedule(self):
+        """Marks the file dirty and (re)starts the debounce window."""
+        self._dirty += 1
+        self._timer.start()
+
+    def _take_snapshot(self):
+        self.coalesced_count += max(0, self._dirty - 1)
+        self._dirty = 0
+        self.write_count += 1
+        return self.snapshot_fn()
+
+    def _write_async(self):
+        if not self.is_dirty or self._executor is None:
+            return
+        data = self._take_snapshot()
+        self._pending = self._executor.submit(self._write, data)
+
+    def _write(self, data):
+        try:
+            if self.merge_fn is None:
+                atomic_write_json(self.path, data)
+                return
+            with FileLock(self.path + ".lock"):
+                existing = read_json(self.path)
+                atomic_write_json(self.path, self.merge_fn(existing if isinstance(existing, dict) else {}, data))
+        except Exception as e:
+            log.warning("Failed to save %s: %s", os.path.basename(self.path), e)
+
+    def _wait_pending(self):
+        if self._pending is not None:
+            self._pending.result()
+            self._pending = None
+
+    def flush(self):
+        """Writes any pending changes synchronously on the calling thread."""
+        self._timer.stop()
+        self._wait_pending()
+        if self.is_dirty:
+            self._write(self._take_snapshot())
+
+    def close(self):
+        """Flushes and stops the worker thread."""
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+class _Reload:
+    """Writer-thread request for JournalStore.reload()."""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+class JournalStore:
+    """
+    Write-behind store: snapshot JSON file plus an append-only journal.
+
+    record() queues a small dict of changed fields and returns immediately.
+    A background thread appends queued records to the journal as JSON lines,
+    syncing at most every flush_interval seconds, and compacts the merged
+    state into the snapshot (atomically) once the journal holds
+    compact_every records. load() replays snapshot + journal.
+
+    Every disk access holds a cross-process FileLock, and compaction
+    re-reads the files instead of trusting memory, so several processes can
+    share one store: records are per-field, so concurrent writers merge
+    field by field (last writer wins per field, not per file).
+    """
+
+    _STOP = object()
+
+    def __init__(self, snapshot_path, journal_path, flush_interval, compact_every):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+
+        self._lock_path = snapshot_path + ".lock"
+        self._journal_len = 0
+        self._disk_sig = None
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def load(self):
+        """Returns the persisted state (snapshot + replayed journal), or None if there is none."""
+        with FileLock(self._lock_path):
+            self._repair_journal()
+            state, self._journal_len = self._read_disk()
+            self._disk_sig = self._signature()
+        return state
+
+    def _read_disk(self):
+        """Reads snapshot + journal. Caller holds the lock. Returns (state or None, journal records)."""
+        state = read_json(self.snapshot_path)
+        count = 0
+
+        if os.path.exists(self.journal_path):
+            try:
+                with open(self.journal_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            # Torn line from a crash mid-append; later records are still good
+                            continue
+                        if not isinstance(record, dict):
+                            continue
+                        state = state or {}
+                        state.update(record)
+                        count += 1
+            except Exception as e:
+                log.warning("Error replaying journal: %s", e)
+
+        return state, count
+
+    def _repair_journal(self):
+        """
+        Cuts a torn tail (bytes after the last newline, left by a crash
+        mid-append) so the next append starts on a line of its own. Caller
+        holds the lock.
+        """
+        try:
+            with open(self.journal_path, 'r+b') as f:
+                data = f.read()
+                if not data or data.endswith(b"\n"):
+                    return
+                end = data.rfind(b"\n") + 1
+                log.warning("Dropping %d bytes of torn journal tail", len(data) - end)
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
+        except FileNotFoundError:
+            pass
+
+    def _signature(self):
+        sig = []
+        for path in (self.snapshot_path, self.journal_path):
+            try:
+                st = os.stat(path)
+                sig.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                sig.append(None)
+        return tuple(sig)
+
+    def changed_externally(self):
+        """True if another process wrote the files since our last read/write (cheap stat)."""
+        return self._signature() != self._disk_sig
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+            self._thread.start()
+
+    def record(self, changes):
+        """Queues changed fields for the background writer. Never touches disk."""
+        self._queue.put(dict(changes))
+
+    def reload(self, callback):
+        """
+        Lands everything queued so far, then re-reads the merged state on the
+        writer thread and passes it (or None) to callback there. Records
+        queued after this call are not included.
+        """
+        if self._thread is None:
+            callback(self.load())
+            return
+        self._queue.put(_Reload(callback))
+
+    def flush(self):
+        """Blocks until everything queued so far is on disk and compacted."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        if self._thread is None:
+            return
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._thread = None
+
+    # --- Writer thread ---
+    def _run(self):
+        buffer = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, dict):
+                buffer.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                continue
+
+            # Timeout, flush request or stop: write out what we have
+            self._append(buffer)
+            buffer = []
+            deadline = None
+
+            if item is None:
+                if self._journal_len >= self.compact_every:
+                    self._compact()
+            elif isinstance(item, _Reload):
+                try:
+                    item.callback(self.load())
+                except Exception as e:
+                    log.warning("Error reloading data: %s", e)
+            else:
+                self._compact()
+                if item is self._STOP:
+                    break
+                item.set()
+
+    def _append(self, records):
+        if not records:
+            return
+        try:
+            with FileLock(self._lock_path):
+                external = self._signature() != self._disk_sig
+                self._repair_journal()
+                with open(self.journal_path, 'a', encoding='utf-8') as f:
+                    for record in records:
+                        f.write(json.dumps(record, separators=(",", ":")))
+                        f.write("\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._journal_len += len(records)
+                # Only absorb our own write into the signature, so foreign
+                # changes stay visible to changed_externally()
+                if not external:
+                    self._disk_sig = self._signature()
+        except Exception as e:
+            log.warning("Error writing journal: %s", e)
+
+    def _compact(self):
+        try:
+            with FileLock(self._lock_path):
+                external = self._signature() != self._disk_sig
+                # Merge from disk, not memory: other processes may have appended
+                state, _ = self._read_disk()
+                try:
+                    journal_size = os.path.getsize(self.journal_path)
+                except OSError:
+                    journal_size = 0
+                # Nothing to fold in; a journal of only bad lines still gets cleared
+                if journal_size == 0 and state is not None:
+                    return
+                atomic_write_json(self.snapshot_path, state or {})
+                # Snapshot is durable; replaying the old journal over it would be harmless
+                with open(self.journal_path, 'w', encoding='utf-8'):
+                    pass
+                self._journal_len = 0
+                if not external:
+                    self._disk_sig = self._signature()
+        except Exception as e:
+            log.warning("Error compacting data: %s", e)
@@ -1,17 +1,23 @@
+import logging
 import sys
 import random
 from PyQt6.QtWidgets import QMainWindow, QMenu, QApplication, QWidget, QVBoxLayout, QProgressBar, QLabel
-from PyQt6.QtCore import Qt, QTimer, QPoint, QPointF, QRect
+from PyQt6.QtCore import Qt, QTimer, QPoint, QPointF, QRect, pyqtSignal
 from PyQt6.QtGui import QPainter, QAction, QCursor, QPixmap, QColor
 import os
-from . import cursor_utils
 
 from .constants import *
 from .sprite_manager import SpriteManager
 from .state_machine import StateMachine
 from .config import ConfigManager
-from .pet_status import PetStatus
-from .status_window import StatusWindow
+from .scheduler import get_scheduler
+from .cursor_tracker import get_cursor_tracker, INTERCEPT_MAX_LEAD_S
+from .jump_arc import JumpArc
+from .navigation import get_navigator
+from .platforms import get_surface_index
+from . import startup_profiler
+
+log = logging.getLogger(__name__)
 
 class GameProgressWindow(QWidget):
     def __init__(self):
@@ -61,21 +67,40 @@ class GameProgressWindow(QWidget):
 class PetEntity(QMainWindow):
     """The main transparent window entity for the desktop pet."""
     
-    def __init__(self):
+    # Emitted once every sprite state has been loaded after the first paint
+    startup_finished = pyqtSignal()
+    # Emitted with the pet when its window closes
+    closed = pyqtSignal(object)
+    
+    def __init__(self, companion=None):
         super().__init__()
         
-        # Managers
-        self.config = ConfigManager()
-        self.sprites = SpriteManager()
+        # Managers (a pet spawned next to `companion` shares its settings and sprites;
+        # every pet shares one PetStatus, opened after the first paint)
+        self.remembers_position = companion is None
+        self.config = companion.config if companion else ConfigManager()
+        self.follow_mode = self.config.settings.follow_mode
+        self.gravity_mode = self.config.settings.gravity_mode
+        self.config.setting_changed.connect(self.on_setting_changed)
+        self.sprites = companion.sprites if companion else SpriteManager()
         self.fsm = StateMachine(self)
-        self.status = PetStatus()
+        self.sprites.frames_added.connect(self.on_frames_added)
+        self.status = None
         self.status_window = None
         
         # UI Components
-        self.progress_window = None
+        self.progress_window = None # Kept (hidden) between games
+        self.memory_panel = None
+        self.laser_overlay = None # Play-mode laser dot, created on first game
         
         # Physics State
         self.velocity = QPointF(0, 0) # x, y velocity (Float for smooth gravity)
+        self.jump_arc = None # Active JumpArc, solved at take-off
+        self.jump_start = 0.0
+        self.jump_direction = 1
+        self.platform = None # Edge (y, x0, x1, id) of the window the pet stands on
+        self.fall_velocity = 0.0 # Gravity mode (px per tick)
+        self.body_asleep = False # Settled: gravity costs nothing until disturbed
         self.is_dragging = False
         self.drag_position = QPoint()
         
@@ -86,7 +111,7 @@ class PetEntity(QMainWindow):
         
         self.developer_mode = False # Default False
         
-        self.direction = 1 # 1 for Right, -1 for Left
+        self._direction = 1 # 1 for Right, -1 for Left
         
         # Setup Window
         self.setWindowFlags(
@@ -105,8 +130,11 @@ class PetEntity(QMainWindow):
         default_x = screen_geo.width() - w - 100
         default_y = screen_geo.height() - h - 50
         
-        x = self.config.get("last_x", default_x)
-        y = self.config.get("last_y", default_y)
+        if companion:
+            x, y = companion.x(), companion.y()
+        else:
+            x = self.config.settings.last_x
+            y = self.config.settings.last_y
         
         # Add random offset to prevent stacking when opening multiple instances
         x += random.randint(-50, 50)
@@ -118,17 +146,63 @@ class PetEntity(QMainWindow):
         
         self.move(int(x), int(y))
         
-        # Timers
-        self.anim_timer = QTimer(self)
-        self.anim_timer.timeout.connect(self.update_animation)
-        self.anim_timer.start(ANIMATION_INTERVAL_MS)
-        
-        self.physics_timer = QTimer(self)
-        self.physics_timer.timeout.connect(self.update_physics)
-        self.physics_timer.start(PHYSICS_INTERVAL_MS)
-        
-        # Context Menu
-        self.init_context_menu()
+        # Timers (shared process-wide scheduler; aligned ticks coalesce across pets)
+        self.scheduler = get_scheduler()
+        self.cursor = get_cursor_tracker() # Shared, sampled once per frame
+        self.nav = get_navigator() # Walkable screen area, rebuilt on screen changes
+        self.nav.layout_changed.connect(self.wake_body)
+        self.surfaces = get_surface_index() # Other windows' top edges
+        self.anim_task = None # Next frame boundary of the active clip (none for still frames)
+        self.anim_start = 0.0
+        self.clip_reported = False
+        self.fsm.state_listener = self.on_state_changed
+        self.mask_key = None # (frame ID, mirrored) the window's input region follows
+        self.restart_animation()
+        self.refresh_frame()
+        self.physics_task = self.scheduler.call_every(PHYSICS_INTERVAL_MS, self.update_physics)
+        self.sequence_task = None # Pending finish_feed / finish_toilet
+        self.brain = None # Routine decisions off the GUI thread, started after the first paint
+        
+        # Context Menu (built on first right-click)
+        self.context_menu = None
+        
+        # Startup: vitals, brain and the remaining sprites come after the first paint
+        self._first_paint_pending = True
+
+    @property
+    def direction(self):
+        return self._direction
+
+    @direction.setter
+    def direction(self, value):
+        if value != self._direction:
+            self._direction = value
+            self.refresh_frame() # Sprite flips
+
+    def on_first_paint(self):
+        startup_profiler.mark("first paint")
+        from .pet_status import get_pet_status
+        from .brain import Brain
+        self.status = get_pet_status()
+        self.status.status_changed.connect(self.refresh_frame) # Mood frame may change
+        self.brain = Brain(self) # Routine decisions, made off the GUI thread every DECISION_INTERVAL_MS
+        self.refresh_frame()
+        # The other sprite states decode on the sprite thread
+        if self.sprites.loaded:
+            self.on_sprites_loaded()
+        else:
+            self.sprites.all_loaded.connect(self.on_sprites_loaded)
+            self.sprites.load_all()
+
+    def on_sprites_loaded(self):
+        startup_profiler.mark("sprites loaded")
+        self.startup_finished.emit()
+
+    def on_frames_added(self, state):
+        """A state gained frames on the sprite thread: show them if they are on screen."""
+        if self.sprite_key(self.fsm.current_state) == state:
+            self.update_animation() # Same start time, longer clip
+        self.refresh_frame()
 
     def init_context_menu(self):
         self.context_menu = QMenu(self)
@@ -139,7 +213,7 @@ class PetEntity(QMainWindow):
         
         self.action_wait = QAction("Wait", self)
         self.action_wait.setCheckable(True)
-        self.action_wait.setChecked(self.config.get("wait_mode", False))
+        self.action_wait.setChecked(self.fsm.wait_mode)
         self.action_wait.triggered.connect(self.toggle_wait_mode)
         self.context_menu.addAction(self.action_wait)
 
@@ -155,10 +229,16 @@ class PetEntity(QMainWindow):
         
         self.action_follow = QAction("Follow Mouse", self)
         self.action_follow.setCheckable(True)
-        self.action_follow.setChecked(self.config.get("follow_mode", False))
+        self.action_follow.setChecked(self.follow_mode)
         self.action_follow.triggered.connect(self.toggle_follow_mode)
         self.context_menu.addAction(self.action_follow)
         
+        self.action_gravity = QAction("Gravity", self)
+        self.action_gravity.setCheckable(True)
+        self.action_gravity.setChecked(self.gravity_mode)
+        self.action_gravity.triggered.connect(self.toggle_gravity)
+        self.context_menu.addAction(self.action_gravity)
+        
         self.context_menu.addSeparator()
         
         self.action_feed = QAction("Feed (+40 Hunger)", self)
@@ -181,10 +261,14 @@ class PetEntity(QMainWindow):
         action_exit.triggered.connect(self.close_app)
         self.context_menu.addAction(action_exit)
         
+        self.debug_menu = None
         if self.developer_mode:
-             # --- Debug Menu ---
+            self.init_debug_menu()
+
+    def init_debug_menu(self):
+             # --- Debug Menu --- (added to the existing menu, once)
              self.context_menu.addSeparator()
-             debug_menu = self.context_menu.addMenu("Debug Tools")
+             debug_menu = self.debug_menu = self.context_menu.addMenu("Debug Tools")
              
              action_full_hunger = QAction("Full Hunger 100", self)
              action_full_hunger.triggered.connect(lambda: self.status.debug_set_full_hunger() if self.status else None)
@@ -210,10 +294,27 @@ class PetEntity(QMainWindow):
              action_force_bad.triggered.connect(lambda: self.status.debug_set_hunger_30() if self.status else None)
              debug_menu.addAction(action_force_bad)
 
+             debug_menu.addSeparator()
+             action_memory = QAction("Memory Panel", self)
+             action_memory.triggered.connect(self.show_memory_panel)
+             debug_menu.addAction(action_memory)
+
     def enable_developer_mode(self):
+        if self.developer_mode:
+            return
         self.developer_mode = True
-        self.init_context_menu() # Refresh menu
-        print("DEBUG: Developer Mode Enabled!")
+        if self.context_menu is not None:
+            self.init_debug_menu()
+        from .memory_panel import get_memory_tracker
+        get_memory_tracker().start() # Growth samples from now on
+        log.info("Developer Mode Enabled!")
+
+    def show_memory_panel(self):
+        if self.memory_panel is None:
+            from .memory_panel import MemoryPanel
+            self.memory_panel = MemoryPanel(self)
+        self.memory_panel.show()
+        self.memory_panel.raise_()
 
     def trigger_user_jump(self):
         # User defined jump: Random direction
@@ -221,16 +322,24 @@ class PetEntity(QMainWindow):
         self.fsm.set_state("jump", force=True)
 
     def paintEvent(self, event):
+        if self._first_paint_pending:
+            self._first_paint_pending = False
+            self.scheduler.call_later(0, self.on_first_paint)
         painter = QPainter(self)
         
         # 1. Draw Pet
-        state = self.fsm.current_state
-        sprite_key = state
+        sprite_key, frame_idx, need_flip = self.visible_frame()
+
+        # Get current frame (mirrored copies are cached by the sprite manager)
+        frame = self.sprites.get_frame(sprite_key, frame_idx, mirrored=need_flip)
         
-        if state == "walk" or state == "follow":
-            sprite_key = "walk"
-        elif state == "run":
-            sprite_key = "walk"
+        if frame:
+            painter.drawPixmap(0, 0, frame)
+
+    def visible_frame(self):
+        """(sprite key, frame index, mirrored) of the frame to show now."""
+        state = self.fsm.current_state
+        sprite_key = self.sprite_key(state)
             
         # Determine Frame Index logic
         frame_idx = self.fsm.frame_index
@@ -266,27 +375,39 @@ class PetEntity(QMainWindow):
                  # Happy (Default)
                  frame_idx = 0
         
-        # Get current frame
-        frame = self.sprites.get_frame(sprite_key, frame_idx)
-        
-        if frame:
-            # Flip Logic
-            need_flip = False
-            
-            if state in ["walk", "follow", "idle", "sit", "feed", "toilet"]:
-                 if self.direction == 1:
-                     need_flip = True
-            elif state in ["drag", "jump", "sleep"]:
-                 if self.direction == -1:
-                     need_flip = True
-            
-            if need_flip:
-                 from PyQt6.QtGui import QTransform
-                 frame = frame.transformed(QTransform().scale(-1, 1))
-                
-            painter.drawPixmap(0, 0, frame)
+        # Flip Logic
+        need_flip = False
+        
+        if state in ["walk", "follow", "idle", "sit", "feed", "toilet"]:
+             if self.direction == 1:
+                 need_flip = True
+        elif state in ["drag", "jump", "sleep"]:
+             if self.direction == -1:
+                 need_flip = True
+
+        return sprite_key, frame_idx, need_flip
+
+    def refresh_frame(self):
+        """
+        Repaints, and points the window's input region at the visible
+        frame's opaque pixels so clicks on transparent parts fall through
+        to the windows behind. The region only changes with the frame or
+        direction.
+        """
+        sprite_key, frame_idx, need_flip = self.visible_frame()
+        frame_id = self.sprites.get_frame_id(sprite_key, frame_idx)
+        key = (frame_id, need_flip)
+        if frame_id is not None and key != self.mask_key:
+            self.mask_key = key
+            self.setMask(self.sprites.get_region(frame_id, need_flip))
+        self.update()
 
     def mousePressEvent(self, event):
+        # Transparent pixels aren't part of the pet (where the input region isn't honoured)
+        if self.mask_key and not self.sprites.hit_test(*self.mask_key, event.position().x(), event.position().y()):
+            event.ignore()
+            return
+
         # BLOCK INTERACTION if performing blocking actions
         if self.fsm.current_state in ["feed", "toilet"]:
             return
@@ -297,13 +418,19 @@ class PetEntity(QMainWindow):
 
         if event.button() == Qt.MouseButton.LeftButton:
             self.is_dragging = True
+            self.platform = None
             self.drag_position = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
             self.fsm.set_state("drag", force=True)
             self.fsm.locked = True
             event.accept()
         elif event.button() == Qt.MouseButton.RightButton:
+            if self.context_menu is None:
+                self.init_context_menu()
+            
             # Update Actions
             if self.status:
+                self.status.refresh_shared() # Vitals may have changed in another instance
+                
                 # Feed
                 self.action_feed.setEnabled(self.status.can_feed())
                 if not self.status.can_feed():
@@ -323,27 +450,36 @@ class PetEntity(QMainWindow):
 
     def is_valid_location(self, x, y):
         """Checks if the pet's window rect at (x, y) is fully within valid screen space."""
-        w, h = self.width(), self.height()
-        points = [
-            QPoint(int(x), int(y)),
-            QPoint(int(x + w), int(y)),
-            QPoint(int(x), int(y + h)),
-            QPoint(int(x + w), int(y + h))
-        ]
-        
-        screens = QApplication.screens()
-        
-        for p in points:
-            point_valid = False
-            for screen in screens:
-                if screen.availableGeometry().contains(p):
-                    point_valid = True
-                    break
-            
-            if not point_valid:
+        return self.nav.graph(self.width(), self.height()).contains(int(x), int(y))
+
+    def walk_towards(self, cx, cy, step):
+        """Moves up to `step` px along the planned route that brings the pet's centre to (cx, cy)."""
+        import math
+        x, y = self.pos().x(), self.pos().y()
+        if self.gravity_enabled():
+            # Grounded: only walk along the floor / window edge
+            gx = cx - self.width() // 2
+            if abs(gx - x) <= 0.5:
                 return False
-                
-        return True
+            new_x = x + max(-step, min(step, gx - x))
+            if not self.is_valid_location(new_x, y):
+                return False
+            self.move(int(new_x), y)
+            self.check_footing()
+            return True
+        
+        graph = self.nav.graph(self.width(), self.height())
+        self.platform = None
+        for wx, wy in graph.plan(x, y, cx - self.width() // 2, cy - self.height() // 2):
+            dx, dy = wx - x, wy - y
+            d = math.hypot(dx, dy)
+            if d <= 0.5:
+                continue # Already at this waypoint
+            if d > step:
+                wx, wy = x + dx / d * step, y + dy / d * step
+            self.move(int(wx), int(wy))
+            return True
+        return False
 
     def mouseMoveEvent(self, event):
         if self.is_dragging and event.buttons() & Qt.MouseButton.LeftButton:
@@ -365,12 +501,24 @@ class PetEntity(QMainWindow):
             self.fsm.locked = False
             if self.fsm.current_state == "drag":
                 self.fsm.set_state("idle", force=True)
+            # Dropped just above a window's top edge: stand on it
+            x, y = self.pos().x(), self.pos().y()
+            w, h = self.width(), self.height()
+            edge = self.surfaces.surface_under(x + w // 4, x + w * 3 // 4, y + h)
+            if edge and self.is_valid_location(x, edge[0] - h):
+                self.move(x, edge[0] - h)
+                self.platform = edge
+            else:
+                self.wake_body() # Falls in gravity mode
             self.save_position()
             event.accept()
 
     def mouseDoubleClickEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
+            if self.status is None:
+                return # Still starting up
             if self.status_window is None:
+                from .status_window import StatusWindow
                 self.status_window = StatusWindow(self.status, self)
             
             pet_pos = self.pos()
@@ -384,17 +532,38 @@ class PetEntity(QMainWindow):
             
             event.accept()
 
+    @staticmethod
+    def sprite_key(state):
+        if state in ["walk", "follow", "run"]:
+            return "walk"
+        return state
+
+    def on_state_changed(self, state):
+        self.restart_animation()
+        self.refresh_frame()
+
+    def restart_animation(self):
+        """Starts the current state's clip from its first frame."""
+        self.anim_start = self.scheduler.clock()
+        self.clip_reported = False
+        self.update_animation()
+
     def update_animation(self):
-        self.fsm.step_animation()
-        self.update() # Trigger repaint
-        
-        # Check mood lazy update occasionally? 
-        # Actually paintEvent calls get_mood indirectly via icon check? 
-        # No, init checked it.
-        # Let's explicitly trigger mood update for logic (e.g. uncomfortable transition)
-        if self.status:
-            self.status.update_mood_status()
-            # self.status.update_bored_status() # REMOVED: Managed by timer in PetStatus
+        """Shows the clip frame for the elapsed time, then sleeps until the next frame boundary."""
+        if self.anim_task:
+            self.anim_task.cancel()
+            self.anim_task = None
+        state = self.fsm.current_state
+        clip = self.sprites.get_clip(self.sprite_key(state))
+        frame, next_ms, finished = clip.frame_at(self.scheduler.clock() - self.anim_start)
+        if frame != self.fsm.frame_index:
+            self.fsm.frame_index = frame
+            self.refresh_frame()
+        if next_ms is not None:
+            self.anim_task = self.scheduler.call_later(next_ms, self.update_animation, tolerance_ms=PHYSICS_INTERVAL_MS)
+        elif finished and not self.clip_reported:
+            self.clip_reported = True
+            self.fsm.on_clip_finished(state) # End-of-clip event
 
     def update_physics(self):
         if self.is_dragging:
@@ -402,8 +571,13 @@ class PetEntity(QMainWindow):
 
         # FSM Logic Updates
         self.fsm.update(PHYSICS_INTERVAL_MS)
+        if self.jump_arc and self.fsm.current_state != "jump":
+            self.jump_arc = None # Interrupted mid-air
+        if self.platform and not self.jump_arc:
+            self.ride_platform()
+        if not self.body_asleep and not self.jump_arc and self.gravity_enabled():
+            self.step_gravity()
         
-        # Apply Movement (No Gravity)
         current_pos = self.pos()
         
         # --- PLAY GAME MODE LOGIC ---
@@ -420,12 +594,12 @@ class PetEntity(QMainWindow):
                 return
 
             import math
-            target = QCursor.pos()
+            cursor = self.cursor.sample()
             cx = current_pos.x() + self.width() // 2
             cy = current_pos.y() + self.height() // 2
             
-            dx = target.x() - cx
-            dy = target.y() - cy
+            dx = cursor.raw_x - cx
+            dy = cursor.raw_y - cy
             dist = math.hypot(dx, dy)
 
             if abs(dx) > 5:
@@ -451,18 +625,16 @@ class PetEntity(QMainWindow):
                  if self.fsm.current_state != "jump":
                      self.fsm.set_state("jump", force=True)
                      
-                     # Calculate Targeted Velocity
-                     # Apply 0.9 factor as requested
-                     dx_target = dx * 0.9
-                     dy_target = dy * 0.9
-                     
                      T = 0.8 # Flight time
-                     GRAVITY = 800
                      
-                     vx = dx_target / T # v = d/t
-                     vy = (dy_target - 0.5 * GRAVITY * (T**2)) / T
+                     # Aim where the laser will be on landing
+                     # Apply 0.9 factor as requested
+                     lead_x, lead_y = cursor.predict(min(T, INTERCEPT_MAX_LEAD_S))
+                     dx_target = (lead_x - cx) * 0.9
+                     dy_target = (lead_y - cy) * 0.9
                      
-                     self.velocity = QPointF(vx, vy)
+                     self.start_jump(JumpArc.targeted(current_pos.x(), current_pos.y(), dx_target, dy_target, T,
+                                                      self.width(), self.height()))
 
             # If far -> Run towards (Fast Follow)
             else:
@@ -471,34 +643,12 @@ class PetEntity(QMainWindow):
                  
                  if self.fsm.current_state == "follow":
                      speed = 2.5 * 1.3 # 1.3x faster
-                     vx = (dx / dist) * speed
-                     vy = (dy / dist) * speed
-                     
-                     next_x = current_pos.x() + vx
-                     next_y = current_pos.y() + vy
-                     
-                     if self.is_valid_location(next_x, next_y):
-                         self.move(int(next_x), int(next_y))
+                     aim_x, aim_y = cursor.intercept(cx, cy, speed * 1000.0 / PHYSICS_INTERVAL_MS)
+                     self.walk_towards(aim_x, aim_y, speed)
             
             # Handle Jump Physics within Play Mode
-            if self.fsm.current_state == "jump":
-                dt = PHYSICS_INTERVAL_MS / 1000.0
-                GRAVITY = 800
-                
-                # Check Landing by Time (0.8s)
-                if self.fsm.state_timer >= 800:
-                     self.velocity = QPointF(0, 0)
-                     self.fsm.set_state("sit", force=True)
-                else:
-                    self.velocity.setY(self.velocity.y() + GRAVITY * dt)
-                    next_x = current_pos.x() + self.velocity.x() * dt
-                    next_y = current_pos.y() + self.velocity.y() * dt
-                    
-                    if not self.is_valid_location(next_x, current_pos.y()):
-                        self.velocity.setX(-self.velocity.x())
-                        next_x = current_pos.x()
-                        
-                    self.move(int(next_x), int(next_y))
+            if self.fsm.current_state == "jump" and self.step_jump():
+                self.fsm.set_state("sit", force=True)
 
             return # End of Play Mode Physics
 
@@ -506,9 +656,12 @@ class PetEntity(QMainWindow):
             if self.fsm.state_timer <= PHYSICS_INTERVAL_MS * 2:
                 import math
                 import random
-                angle = random.uniform(0, 2 * math.pi)
+                angle = self.fsm.heading if self.fsm.heading is not None else random.uniform(0, 2 * math.pi)
                 speed = MOVE_SPEED
                 self.velocity = QPointF(math.cos(angle) * speed, math.sin(angle) * speed)
+                if self.platform or self.gravity_enabled():
+                    # Walk along the window edge / floor
+                    self.velocity = QPointF(speed if self.velocity.x() >= 0 else -speed, 0)
                 
                 if self.velocity.x() != 0:
                     self.direction = 1 if self.velocity.x() > 0 else -1
@@ -516,8 +669,14 @@ class PetEntity(QMainWindow):
             current_pos = self.pos()
             new_x = current_pos.x() + self.velocity.x()
             new_y = current_pos.y() + self.velocity.y()
+            if self.platform or self.gravity_enabled():
+                new_y = current_pos.y()
             
-            if not self.is_valid_location(new_x, current_pos.y()):
+            w = self.width()
+            # With gravity the pet may walk off a window edge and fall; otherwise it turns around
+            on_edge = not self.platform or self.gravity_enabled() or \
+                (self.platform[1] <= new_x + w // 4 and new_x + w * 3 // 4 <= self.platform[2])
+            if not on_edge or not self.is_valid_location(new_x, current_pos.y()):
                  self.velocity.setX(-self.velocity.x())
                  self.direction = 1 if self.velocity.x() > 0 else -1
                  new_x = current_pos.x() 
@@ -527,47 +686,25 @@ class PetEntity(QMainWindow):
                  new_y = current_pos.y() 
 
             self.move(int(new_x), int(new_y))
+            self.check_footing()
             
         elif self.fsm.current_state == "jump":
-            dt = PHYSICS_INTERVAL_MS / 1000.0
-            
-            if self.fsm.state_timer <= PHYSICS_INTERVAL_MS * 2:
-                POWER = 400 
-                vx = POWER * self.direction * 0.707 
-                vy = -POWER * 0.707 
-                self.velocity = QPointF(vx, vy)
-                self.jump_start_y = float(self.pos().y())
-            elif not hasattr(self, 'jump_start_y'):
-                self.jump_start_y = float(self.pos().y())
-            
-            GRAVITY = 800 
-            self.velocity.setY(self.velocity.y() + GRAVITY * dt)
-            
-            next_x = current_pos.x() + self.velocity.x() * dt
-            next_y = current_pos.y() + self.velocity.y() * dt
-            
-            if not self.is_valid_location(next_x, current_pos.y()):
-                self.velocity.setX(-self.velocity.x())
-                next_x = current_pos.x() 
-                self.direction *= -1
-
-            if self.velocity.y() > 0 and next_y >= self.jump_start_y:
-                 next_y = self.jump_start_y
-                 self.velocity = QPointF(0, 0)
-                 self.move(int(next_x), int(next_y))
-                 self.fsm.set_state("idle")
-            else:
-                 self.move(int(next_x), int(next_y))
+            if self.jump_arc is None:
+                # 45 degree hop that lands back on the take-off height
+                self.start_jump(JumpArc.launch(current_pos.x(), current_pos.y(), JUMP_POWER, 45, self.direction,
+                                               self.width(), self.height()))
+            if self.step_jump():
+                self.fsm.set_state("idle")
         
         elif self.fsm.current_state == "follow":
             import math
-            target = QCursor.pos()
+            cursor = self.cursor.sample()
             cx = current_pos.x() + self.width() // 2
             cy = current_pos.y() + self.height() // 2
             
-            dx = target.x() - cx
-            dy = target.y() - cy
-            dist = math.hypot(dx, dy)
+            dx = cursor.raw_x - cx
+            dy = cursor.raw_y - cy
+            dist = abs(dx) if self.gravity_enabled() else math.hypot(dx, dy)
             
             if abs(dx) > 5:
                 self.direction = 1 if dx > 0 else -1
@@ -576,23 +713,15 @@ class PetEntity(QMainWindow):
             
             if dist > dist_threshold:
                 speed = 2.5 
-                vx = (dx / dist) * speed
-                vy = (dy / dist) * speed
-                
-                next_x = current_pos.x() + vx
-                next_y = current_pos.y() + vy
-                
-                if self.is_valid_location(next_x, next_y):
-                    self.move(int(next_x), int(next_y))
-                else:
-                    pass
+                aim_x, aim_y = cursor.intercept(cx, cy, speed * 1000.0 / PHYSICS_INTERVAL_MS)
+                self.walk_towards(aim_x, aim_y, speed)
             else:
                  self.direction *= -1
                  self.fsm.set_state("sit")
 
         else:
-            if self.config.get("follow_mode", False) and not self.is_dragging:
-                 target = QCursor.pos()
+            if self.follow_mode and not self.is_dragging:
+                 target = self.cursor.sample().pos
                  cx = current_pos.x() + self.width() // 2
                  cy = current_pos.y() + self.height() // 2
                  
@@ -603,56 +732,216 @@ class PetEntity(QMainWindow):
                  if dist > 60: 
                      self.fsm.set_state("follow")
 
+    def ride_platform(self):
+        """Keeps the pet on its window edge when that window moves; drops it when it goes away."""
+        edge = self.surfaces.get(self.platform[3])
+        if edge is None:
+            self.platform = None
+            self.wake_body()
+            return
+        if edge != self.platform:
+            dx = edge[1] - self.platform[1]
+            self.platform = edge
+            x, y = self.pos().x() + dx, edge[0] - self.height()
+            if self.is_valid_location(x, y):
+                self.move(x, y)
+            else:
+                self.platform = None
+                self.wake_body()
+
+    def gravity_enabled(self):
+        # The laser game keeps its free 2D movement
+        return self.gravity_mode and not self.playing_mode
+
+    def wake_body(self):
+        self.body_asleep = False
+        self.fall_velocity = 0.0
+
+    def floor_y(self):
+        """Resting top-left y on the floor of the screen under the pet."""
+        h = self.height()
+        centre = self.pos() + QPoint(self.width() // 2, h // 2)
+        screen = QApplication.screenAt(centre) or QApplication.primaryScreen()
+        geo = screen.availableGeometry()
+        return geo.top() + geo.height() - GROUND_OFFSET - h
+
+    def check_footing(self):
+        """Wakes the body if it is no longer standing on anything (gravity mode)."""
+        if not self.gravity_enabled():
+            return
+        x, y, w = self.pos().x(), self.pos().y(), self.width()
+        if self.platform:
+            if self.platform[1] <= x + w // 4 and x + w * 3 // 4 <= self.platform[2]:
+                return
+            self.platform = None
+        elif y >= self.floor_y():
+            return
+        self.wake_body()
+
+    def step_gravity(self):
+        """One tick of falling. Landing slowly settles the body, which then sleeps."""
+        x, y = self.pos().x(), self.pos().y()
+        w, h = self.width(), self.height()
+        if self.platform:
+            self.body_asleep = True # Already standing
+            return
+
+        vy = min(self.fall_velocity + GRAVITY, TERMINAL_VELOCITY)
+        next_y = y + vy
+        ground = self.floor_y()
+        edge = None
+        if vy > 0:
+            edge = self.surfaces.first_between(x + w // 4, x + w * 3 // 4, y + h, int(next_y) + h)
+            if edge and edge[0] - h > ground:
+                edge = None
+
+        landing = edge[0] - h if edge else ground
+        if next_y < landing:
+            self.fall_velocity = vy
+            self.move(x, int(next_y))
+            return
+
+        self.move(x, landing)
+        if vy > SETTLE_VELOCITY:
+            self.fall_velocity = -vy * LANDING_BOUNCE
+        else:
+            self.fall_velocity = 0.0
+            self.platform = edge
+            self.body_asleep = True
+
+    def start_jump(self, arc):
+        arc.land_on(self.surfaces, self.is_valid_location)
+        self.platform = None
+        self.jump_arc = arc
+        self.jump_start = self.scheduler.clock()
+        if arc.vx:
+            self.jump_direction = 1 if arc.vx > 0 else -1
+        else:
+            self.jump_direction = self.direction
+
+    def step_jump(self):
+        """Moves to the arc position for the elapsed time. Returns True on landing."""
+        arc = self.jump_arc
+        t = (self.scheduler.clock() - self.jump_start) / 1000.0
+        x, y, sense = arc.position(t)
+        self.direction = self.jump_direction * sense # Turns around on wall bounces
+        self.move(int(round(x)), int(round(y)))
+        if arc.landed(t):
+            self.jump_arc = None
+            self.platform = arc.platform
+            self.check_footing()
+            return True
+        return False
+
+    def on_setting_changed(self, key, value):
+        """Keeps cached settings and menu check states in sync with the config."""
+        if key == "follow_mode":
+            self.follow_mode = value
+        elif key == "gravity_mode":
+            self.gravity_mode = value
+            if value:
+                self.wake_body()
+        # The menu reads cached values when it is (re)built
+        if self.context_menu is None:
+            return
+        if key == "follow_mode":
+            self.action_follow.setChecked(value)
+        elif key == "wait_mode":
+            self.action_wait.setChecked(value)
+        elif key == "gravity_mode":
+            self.action_gravity.setChecked(value)
+
     def toggle_follow_mode(self):
-        new_val = not self.config.get("follow_mode")
+        new_val = not self.follow_mode
         self.config.set("follow_mode", new_val)
-        self.action_follow.setChecked(new_val)
         if new_val:
             self.fsm.set_state("follow", force=True)
 
     def toggle_wait_mode(self):
-        new_val = not self.config.get("wait_mode")
+        new_val = not self.fsm.wait_mode
         self.config.set("wait_mode", new_val)
-        self.action_wait.setChecked(new_val)
         
         if new_val:
             self.fsm.set_state("sit", force=True)
 
-    def toggle_floating(self):
-        new_val = not self.config.get("floating_mode")
-        self.config.set("floating_mode", new_val)
-        self.action_float.setChecked(new_val)
+    def toggle_gravity(self):
+        self.config.set("gravity_mode", not self.gravity_mode)
 
     def save_position(self):
+        if not self.remembers_position:
+            return # Only the first pet's position is remembered
         self.config.set("last_x", self.pos().x())
         self.config.set("last_y", self.pos().y())
 
+    @staticmethod
+    def live_pets(exclude=None):
+        return [w for w in QApplication.topLevelWidgets()
+                if isinstance(w, PetEntity) and w is not exclude and w.isVisible()]
+
     def close_app(self):
+        """Closes this pet; the app exits with the last one."""
         self.close()
-        QApplication.instance().quit() # Force exit loop
+        if not self.live_pets():
+            QApplication.instance().quit() # Force exit loop
+
+    def disconnect_shared(self):
+        """Drops this pet's connections to the managers other pets keep using."""
+        connections = [
+            (self.config.setting_changed, self.on_setting_changed),
+            (self.sprites.frames_added, self.on_frames_added),
+            (self.sprites.all_loaded, self.on_sprites_loaded),
+            (self.nav.layout_changed, self.wake_body),
+        ]
+        if self.status:
+            connections.append((self.status.status_changed, self.refresh_frame))
+            if self.status_window:
+                connections.append((self.status.status_changed, self.status_window.on_status_changed))
+        for signal, slot in connections:
+            try:
+                signal.disconnect(slot)
+            except TypeError:
+                pass # Never connected (e.g. closed before the first paint)
 
     def closeEvent(self, event):
         self.save_position()
+        self.config.flush()
+        if self.brain:
+            self.brain.close()
+        
+        for task in (self.anim_task, self.physics_task, self.sequence_task):
+            if task:
+                task.cancel()
         
         if self.status_window:
             self.status_window.close()
+        if self.progress_window:
+            self.progress_window.close()
+        if self.memory_panel:
+            self.memory_panel.close()
+
+        self.disconnect_shared()
 
         if self.status:
             try:
-                self.status.save_data()
+                if self.live_pets(exclude=self):
+                    self.status.flush() # Still shared with other pets
+                else:
+                    self.status.close() # Last pet: also stops the writer threads
             except Exception as e:
-                print(f"Error saving PetStatus: {e}")
+                log.warning("Error saving PetStatus: %s", e)
         
-        # Restore Cursor (System)
-        cursor_utils.restore_system_cursor()
+        if self.laser_overlay:
+            self.laser_overlay.stop()
+            self.laser_overlay.close()
         event.accept()
+        self.closed.emit(self)
 
     def start_feed_sequence(self):
         if not self.status or not self.status.can_feed():
             return
             
         self.fsm.set_state("feed", force=True)
-        QTimer.singleShot(5200, self.finish_feed)
+        self.sequence_task = self.scheduler.call_later(5200, self.finish_feed)
         
     def finish_feed(self):
         if self.status:
@@ -664,7 +953,7 @@ class PetEntity(QMainWindow):
             return
         
         self.fsm.set_state("toilet", force=True)
-        QTimer.singleShot(4500, self.finish_toilet)
+        self.sequence_task = self.scheduler.call_later(4500, self.finish_toilet)
         
     def finish_toilet(self):
         if self.status:
@@ -677,7 +966,7 @@ class PetEntity(QMainWindow):
             return
             
         if not self.status or not self.status.is_bored:
-             print("DEBUG: Cannot play, pet is not bored.")
+             log.debug("Cannot play, pet is not bored.")
              return
 
         self.playing_mode = True
@@ -691,35 +980,31 @@ class PetEntity(QMainWindow):
         self.progress_window.pbar.setValue(100)
         self.progress_window.show()
         
-        # Set Laser Cursor (System)
-        try:
-            cursor_path = os.path.join(ASSETS_DIR, "sprites", "Laser", "0.cur")
-            if os.path.exists(cursor_path):
-                cursor_utils.set_system_cursor(cursor_path)
-            else:
-                print(f"DEBUG: Laser cursor not found at {cursor_path}")
-        except Exception as e:
-            print(f"DEBUG: Failed to set system cursor: {e}")
+        # Laser dot follows the cursor in an overlay (system cursors untouched)
+        if self.laser_overlay is None:
+            from .laser_overlay import LaserOverlay
+            self.laser_overlay = LaserOverlay(self.scheduler)
+        self.laser_overlay.start()
         
-        print("DEBUG: Play Game Started!")
+        log.debug("Play Game Started!")
 
     def stop_play_game(self):
         self.playing_mode = False
         self.fsm.locked = False
         
-        # Close Progress Window
+        # Hide Progress Window (reused by the next game)
         if self.progress_window:
-            self.progress_window.close()
-            self.progress_window = None
+            self.progress_window.hide()
         
         if self.status:
             self.status.play_success() # This method clears is_bored
             
-        # Restore Cursor (System)
-        cursor_utils.restore_system_cursor()
+        if self.laser_overlay:
+            self.laser_overlay.stop()
             
         self.fsm.set_state("idle", force=True)
-        print("DEBUG: Play Game Finished!")
+        self.check_footing() # Back to gravity, if enabled
+        log.debug("Play Game Finished!")
 
     def debug_trigger_uncomfortable(self):
         if self.status:
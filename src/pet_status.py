@@ -1,102 +1,386 @@
-import json
+import logging
 import os
 import time
 import random
-from PyQt6.QtCore import QTimer, QObject
+from array import array
+from PyQt6.QtCore import QObject, pyqtSignal
 from . import resource_utils
+from .constants import STATUS_FLUSH_INTERVAL_MS, STATUS_COMPACT_RECORDS
+from .persistence import JournalStore
+from .history_store import HistoryStore, RAW_RETENTION
+from .scheduler import get_scheduler
+
+log = logging.getLogger(__name__)
+
+# Status model
+HUNGER_DECAY_SECONDS = 60           # Hunger drops 1 point per minute
+HUNGER_THRESHOLDS = (70, 30, 0)     # Crossings that change mood/visuals
+BORED_CHECK_SECONDS = 30 * 60       # Boredom "rolls" every 30 minutes...
+BORED_CHANCE = 0.5                  # ...with this chance of success
+MAX_DEADLINE_SECONDS = 6 * 3600     # Re-evaluate at least this often
+DEADLINE_TOLERANCE_MS = 1000        # Crossings may fire up to this late (timer coalescing)
+
+HISTORY_SAMPLE_SECONDS = 60         # Hunger rows written to the history store
+
+# Recent mood for the status window sparkline (hunger is read back from the history store)
+RECENT_SAMPLE_SECONDS = 60          # One sample per minute...
+RECENT_CAPACITY = 180               # ...for the last 3 hours
+RECENT_MOOD = 0                     # Column index in PetStatus.recent_history
+MOOD_SCORES = {"나쁨": 0, "불편": 1, "심심함": 2, "행복": 3}
+
+def hunger_at(base, base_time, now):
+    """Hunger as a pure function of the last baseline (value, timestamp)."""
+    elapsed = max(0.0, now - base_time)
+    return max(0, min(100, base - int(elapsed // HUNGER_DECAY_SECONDS)))
+
+def hunger_crossing_time(base, base_time, threshold):
+    """Timestamp at which hunger first drops to `threshold` (None if it already has)."""
+    steps = base - threshold
+    if steps <= 0:
+        return None
+    return base_time + steps * HUNGER_DECAY_SECONDS
+
+def mood_at(state, now):
+    """Mood as a pure function of a status snapshot (see PetStatus._snapshot)."""
+    digest = state["digest_finish_time"]
+    if state["uncomfortable_flag"] or (digest > 0 and now >= digest):
+        return "불편"
+    elif now >= state["bored_time"]:
+        return "심심함"
+    elif hunger_at(state["hunger_base"], state["hunger_base_time"], now) <= 30: # Only if really starving
+        return "나쁨"
+    return "행복"
+
+class SampleRing:
+    """Fixed-size ring of timestamped rows backed by flat typed arrays (constant memory)."""
+
+    def __init__(self, capacity, columns):
+        self.capacity = capacity
+        self.times = array("d", bytes(8 * capacity))
+        self.values = [array("f", bytes(4 * capacity)) for _ in range(columns)] # One per column
+        self.total = 0 # Rows ever appended; index of the next write is total % capacity
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    @property
+    def last_time(self):
+        if self.total == 0:
+            return None
+        return self.times[(self.total - 1) % self.capacity]
+
+    def append(self, t, row):
+        i = self.total % self.capacity
+        self.times[i] = t
+        for column, value in zip(self.values, row):
+            column[i] = value
+        self.total += 1
+
+    def tail(self, n, column):
+        """Last n values of a column, oldest first."""
+        n = min(n, len(self))
+        values = self.values[column]
+        start = (self.total - n) % self.capacity
+        if start + n <= self.capacity:
+            return values[start:start + n].tolist()
+        return values[start:].tolist() + values[:start + n - self.capacity].tolist()
+
+def sample_bored_delay():
+    """Delay until boredom, equivalent to rolling BORED_CHANCE every BORED_CHECK_SECONDS."""
+    checks = 1
+    while random.random() >= BORED_CHANCE:
+        checks += 1
+    return checks * BORED_CHECK_SECONDS
 
 class PetStatus(QObject):
-    def __init__(self, data_file=None):
+    """
+    Pet vitals modeled as pure functions of stored timestamps.
+
+    Nothing ticks: hunger, digestion and boredom are evaluated when read,
+    so downtime is caught up on load and reads are O(1). A single-shot
+    deadline timer fires at the next threshold crossing.
+    """
+
+    # Emitted after any mutation, threshold crossing or reload from another instance
+    status_changed = pyqtSignal()
+    # Merged state re-read on the journal writer thread (queued to the GUI thread)
+    _reloaded = pyqtSignal(object)
+
+    def __init__(self, data_file=None, scheduler=None):
         super().__init__()
-        
+        self.scheduler = scheduler or get_scheduler()
+        self._deadline_task = None
+        self._ready = False
+
         # Use persistent data path
         if data_file is None:
             data_dir = resource_utils.get_data_path()
             self.data_file = os.path.join(data_dir, "pet_data.json")
         else:
             self.data_file = data_file
-            
-        print(f"DEBUG: Data file path: {self.data_file}")
-        
-        # Default Values
-        self.birth_time = time.time()
-        self.hunger = 100 # Max 100, 0 is starving
-        self.mood = "Unknown" 
+
+        log.debug("Data file path: %s", self.data_file)
+
+        # Write-behind persistence: snapshot + journal, written on a background thread
+        self.store = JournalStore(
+            self.data_file,
+            os.path.splitext(self.data_file)[0] + ".journal",
+            STATUS_FLUSH_INTERVAL_MS / 1000.0,
+            STATUS_COMPACT_RECORDS,
+        )
+        self._saved = {}
+        self._reload_changes = None # Fields recorded while a reload is in flight
+        self._reloaded.connect(self._on_reloaded)
+
+        # Time-series history (hunger samples, mood transitions, events)
+        self.history = HistoryStore(os.path.join(os.path.dirname(self.data_file), "pet_history.db"))
+
+        # Default Values (stored timestamps; derived values are properties)
+        now = time.time()
+        self.birth_time = now
+        self.hunger_base = 100 # Hunger at hunger_base_time (Max 100, 0 is starving)
+        self.hunger_base_time = now
         self.last_fed_time = 0 # Timestamp of last feed
         self.digest_finish_time = 0 # Timestamp when uncomfortable starts (0 = none)
-        self.is_uncomfortable = False
-        self.is_bored = False
-        self.start_bored_timer()
-        
+        self.uncomfortable_flag = False # Latched discomfort (debug)
+        self.bored_time = now + sample_bored_delay() # Timestamp when boredom starts
+        self.recent_history = SampleRing(RECENT_CAPACITY, 1) # (mood score,) per minute
+        self._history_time = None # Timestamp of the last hunger row sent to history
+
         self.load_data()
-        
-        # Hunger Decay Timer (1 minute interval)
-        self.hunger_timer = QTimer(self)
-        self.hunger_timer.timeout.connect(self.decay_hunger)
-        self.hunger_timer.start(60 * 1000) # 60 seconds
-
-    def start_bored_timer(self):
-        # Check for boredom every 30 minutes
-        self.bored_check_timer = QTimer(self)
-        self.bored_check_timer.timeout.connect(self.update_bored_status)
-        self.bored_check_timer.start(30 * 60 * 1000) # 30 minutes
+        self.sample_history()
+
+        # Single deadline for the next threshold crossing
+        self._ready = True
+        self.schedule_next_deadline()
+
+    # --- Derived state ---
+    @property
+    def hunger(self):
+        return hunger_at(self.hunger_base, self.hunger_base_time, time.time())
+
+    @hunger.setter
+    def hunger(self, value):
+        self.hunger_base = max(0, min(100, int(value)))
+        self.hunger_base_time = time.time()
+
+    @property
+    def is_uncomfortable(self):
+        if self.uncomfortable_flag:
+            return True
+        return self.digest_finish_time > 0 and time.time() >= self.digest_finish_time
+
+    @is_uncomfortable.setter
+    def is_uncomfortable(self, value):
+        self.uncomfortable_flag = bool(value)
+        if not value:
+            self.digest_finish_time = 0
+
+    @property
+    def is_bored(self):
+        return time.time() >= self.bored_time
+
+    @is_bored.setter
+    def is_bored(self, value):
+        now = time.time()
+        self.bored_time = now if value else now + sample_bored_delay()
+
+    # --- Deadline ---
+    def next_deadline(self):
+        """Earliest future timestamp at which a derived value crosses a threshold."""
+        now = time.time()
+        candidates = [now + MAX_DEADLINE_SECONDS]
+        for threshold in HUNGER_THRESHOLDS:
+            t = hunger_crossing_time(self.hunger_base, self.hunger_base_time, threshold)
+            if t is not None and t > now:
+                candidates.append(t)
+        if self.digest_finish_time > now and not self.uncomfortable_flag:
+            candidates.append(self.digest_finish_time)
+        if self.bored_time > now:
+            candidates.append(self.bored_time)
+        return min(candidates)
+
+    def schedule_next_deadline(self):
+        if self._deadline_task:
+            self._deadline_task.cancel()
+        delay = self.next_deadline() - time.time()
+        # +1 ms so the crossing has definitely happened when we wake; crossings
+        # are not urgent, so let the scheduler fold this into a nearby wakeup
+        self._deadline_task = self.scheduler.call_later(
+            max(0, delay * 1000) + 1, self.on_deadline, tolerance_ms=DEADLINE_TOLERANCE_MS
+        )
 
+    def next_hunger_change(self):
+        """Timestamp of the next 1-point hunger drop (None once starving)."""
+        if self.hunger <= 0:
+            return None
+        elapsed = max(0.0, time.time() - self.hunger_base_time)
+        return self.hunger_base_time + (elapsed // HUNGER_DECAY_SECONDS + 1) * HUNGER_DECAY_SECONDS
+
+    def on_deadline(self):
+        self.refresh_shared()
+        self.status_changed.emit()
+        self.sample_recent()
+        self.sample_history()
+        self.get_mood()
+        self.schedule_next_deadline()
+
+    # --- Persistence ---
     def load_data(self):
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.birth_time = data.get("birth_time", time.time())
-                    self.hunger = data.get("hunger", 100)
-                    self.last_fed_time = data.get("last_fed_time", 0)
-                    self.digest_finish_time = data.get("digest_finish_time", 0)
-                    self.is_uncomfortable = data.get("is_uncomfortable", False)
-                    self.is_bored = data.get("is_bored", False)
-                    print(f"DEBUG: Loaded data - Hunger: {self.hunger}, Uncomfortable: {self.is_uncomfortable}, Bored: {self.is_bored}")
-            except Exception as e:
-                print(f"Error loading data: {e}")
-                # Keep defaults
+        data = self.store.load()
+        self.store.start()
+        if data is not None:
+            self._apply(data)
         else:
             # First time run
-            print("DEBUG: No data file found, creating new one.")
+            log.debug("No data file found, creating new one.")
             self.birth_time = time.time()
             self.save_data()
 
-    def save_data(self):
-        data = {
+    def refresh_shared(self):
+        """
+        Picks up vitals written by other running instances. Only a stat runs
+        here; when another process did write, the re-read happens on the
+        journal writer thread and status_changed follows once it lands.
+        Returns True if a reload was started.
+        """
+        if self._reload_changes is not None or not self.store.changed_externally():
+            return False
+        self._reload_changes = {}
+        self.store.reload(self._reloaded.emit)
+        return True
+
+    def _on_reloaded(self, data):
+        changes, self._reload_changes = self._reload_changes or {}, None
+        self.sample_recent()
+        self.sample_history()
+        if data is not None:
+            # Our records queued after the reload request aren't on disk yet
+            data = dict(data)
+            data.update(changes)
+            self._apply(data)
+            if self._ready:
+                self.schedule_next_deadline()
+        self.status_changed.emit()
+
+    def _apply(self, data):
+        try:
+            self.birth_time = data.get("birth_time", time.time())
+            self.last_fed_time = data.get("last_fed_time", 0)
+            self.digest_finish_time = data.get("digest_finish_time", 0)
+
+            if "hunger_base_time" in data:
+                self.hunger_base = data.get("hunger_base", 100)
+                self.hunger_base_time = data["hunger_base_time"]
+            else:
+                # Legacy file: only the last hunger value is known
+                self.hunger = data.get("hunger", 100)
+
+            self.uncomfortable_flag = data.get("uncomfortable_flag", data.get("is_uncomfortable", False))
+
+            if "bored_time" in data:
+                self.bored_time = data["bored_time"]
+            else:
+                self.is_bored = data.get("is_bored", False)
+
+            # Diff future saves against what is on disk (migrates legacy keys)
+            self._saved = dict(data)
+            log.debug("Loaded data - Hunger: %s, Uncomfortable: %s, Bored: %s", self.hunger, self.is_uncomfortable, self.is_bored)
+        except Exception as e:
+            log.warning("Error loading data: %s", e)
+            # Keep defaults
+
+    def _snapshot(self):
+        return {
             "birth_time": self.birth_time,
-            "hunger": self.hunger,
+            "hunger_base": self.hunger_base,
+            "hunger_base_time": self.hunger_base_time,
             "last_fed_time": self.last_fed_time,
             "digest_finish_time": self.digest_finish_time,
-            "is_uncomfortable": self.is_uncomfortable,
-            "is_bored": self.is_bored
+            "uncomfortable_flag": self.uncomfortable_flag,
+            "bored_time": self.bored_time
         }
-        try:
-            with open(self.data_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4)
-            # Print only occasionally or for debug
-            # print(f"DEBUG: Saved data")
-        except Exception as e:
-            print(f"Error saving data: {e}")
 
-    def decay_hunger(self):
-        if self.hunger > 0:
-            self.hunger -= 1
-        # Auto-save every decay
+    def sample_recent(self, state=None, now=None):
+        """
+        Appends per-minute mood samples to recent_history up to `now`, evaluated
+        with `state` (default: current). Mutations back-fill with the state
+        that was in effect before them, so gaps while nothing was watching
+        are exact. Work is bounded by the ring capacity.
+        """
+        now = now or time.time()
+        state = state or self._snapshot()
+        ring = self.recent_history
+        t = now if ring.last_time is None else ring.last_time + RECENT_SAMPLE_SECONDS
+        t = max(t, now - (ring.capacity - 1) * RECENT_SAMPLE_SECONDS)
+        while t <= now:
+            ring.append(t, (MOOD_SCORES[mood_at(state, t)],))
+            t += RECENT_SAMPLE_SECONDS
+
+    def sample_history(self, state=None, now=None):
+        """
+        Queues per-minute hunger rows for the history store up to `now`,
+        back-filled from the analytic hunger like sample_recent(), so the
+        time series stays per-minute although nothing ticks.
+        """
+        now = now or time.time()
+        state = state or self._snapshot()
+        if self._history_time is None:
+            t = now
+        else:
+            t = max(self._history_time + HISTORY_SAMPLE_SECONDS, now - RAW_RETENTION)
+        while t <= now:
+            self.history.record_hunger(hunger_at(state["hunger_base"], state["hunger_base_time"], t), t)
+            self._history_time = t
+            t += HISTORY_SAMPLE_SECONDS
+
+    def save_data(self):
+        """Queues the fields changed since the last save. Never blocks on disk."""
+        if "hunger_base_time" in self._saved:
+            self.sample_recent(self._saved)
+            self.sample_history(self._saved)
+        data = self._snapshot()
+        changes = {k: v for k, v in data.items() if k not in self._saved or self._saved[k] != v}
+        if changes:
+            self._saved = data
+            self.store.record(changes)
+            if self._reload_changes is not None:
+                self._reload_changes.update(changes)
+        # Any mutation can move the next threshold crossing
+        if self._ready:
+            self.schedule_next_deadline()
+            self.status_changed.emit()
+
+    def flush(self):
+        """Synchronously writes pending changes and compacts the snapshot (shutdown)."""
         self.save_data()
+        self.sample_history()
+        self.store.flush()
+        self.history.flush()
+
+    def close(self):
+        """Flushes, then stops the journal and history writer threads (last pet closing)."""
+        self._ready = False # No more deadlines or change notifications
+        if self._deadline_task:
+            self._deadline_task.cancel()
+            self._deadline_task = None
+        self.save_data()
+        self.sample_history()
+        self.store.close()
+        self.history.close()
 
     def get_hunger(self):
         return self.hunger
 
     def get_birth_time_str(self):
         uptime = time.time() - self.birth_time
-        
+
         days = int(uptime // (24 * 3600))
         uptime %= (24 * 3600)
         hours = int(uptime // 3600)
         uptime %= 3600
         minutes = int(uptime // 60)
-        
+
         if days > 0:
             return f"{days}일 {hours}시간 {minutes}분"
         elif hours > 0:
@@ -104,95 +388,75 @@ class PetStatus(QObject):
         else:
             return f"{minutes}분"
 
-    def update_mood_status(self):
-        """Checks digestion and updates uncomfortable status lazy-style."""
-        # If we have a pending digestion
-        if self.digest_finish_time > 0 and not self.is_uncomfortable:
-            if time.time() >= self.digest_finish_time:
-                self.is_uncomfortable = True
-                self.digest_finish_time = 0
-                self.save_data()
-                print("DEBUG: Digestion finished -> Pet is now Uncomfortable")
-
-    def update_bored_status(self):
-        """Checks for boredom (50% chance every 30 mins)."""
-        if not self.is_bored:
-             if random.random() < 0.5:
-                 self.is_bored = True
-                 self.save_data()
-                 print("DEBUG: Pet is now Bored")
-
     def get_mood(self):
-        # Update logic whenever mood is queried
-        self.update_mood_status()
-        
-        if self.is_uncomfortable:
-            return "불편"
-        elif self.is_bored:
-            return "심심함"
-        elif self.hunger <= 30: # Only if really starving
-            return "나쁨"
-        else:
-            return "행복"
+        mood = mood_at(self._snapshot(), time.time())
+        self.history.record_mood(mood)
+        return mood
 
     def feed(self, amount=10):
+        if self.is_uncomfortable:
+            # Digestion already finished: latch it so the new timer below doesn't hide it
+            self.uncomfortable_flag = True
         self.hunger = min(100, self.hunger + amount)
-        
+
         # Set digestion timer (3 to 10 minutes)
         # 3*60 = 180, 10*60 = 600
         delay = random.randint(180, 600)
         self.digest_finish_time = time.time() + delay
         # self.is_uncomfortable = False # Removed: Feed does not cure discomfort
         self.save_data()
-        print(f"DEBUG: Fed pet. Digestion in {delay} seconds.")
-        
+        self.history.record_event("feed", str(amount))
+        self.history.record_hunger(self.hunger)
+        log.debug("Fed pet. Digestion in %s seconds.", delay)
+
     def can_feed(self):
         # 5 minutes cooldown
         return (time.time() - self.last_fed_time) >= (5 * 60)
-        
+
     def record_feed(self):
         self.last_fed_time = time.time()
         self.save_data()
-        
+
     def poop(self):
         """Relieves discomfort."""
         self.is_uncomfortable = False
-        self.digest_finish_time = 0
         self.save_data()
-        print("DEBUG: Poop success -> Pet is Happy")
+        self.history.record_event("toilet")
+        log.debug("Poop success -> Pet is Happy")
 
     def play_success(self):
         """Relieves boredom."""
         self.is_bored = False
         self.save_data()
-        print("DEBUG: Play success -> Pet is no longer Bored")
+        self.history.record_event("play")
+        log.debug("Play success -> Pet is no longer Bored")
 
     def debug_set_full_hunger(self):
         self.hunger = 100
         self.save_data()
-        print("DEBUG: Force full hunger")
-        
+        log.debug("Force full hunger")
+
     def debug_set_hunger_30(self):
         self.hunger = 30
         self.save_data()
-        print("DEBUG: Force hunger 30")
+        log.debug("Force hunger 30")
 
     def debug_reset_feed_cooldown(self):
         self.last_fed_time = 0
         self.save_data()
-        print("DEBUG: Reset Feed Cooldown")
+        log.debug("Reset Feed Cooldown")
 
     # --- Debug Helpers ---
     def debug_set_uncomfortable(self):
         self.is_uncomfortable = True
         self.digest_finish_time = 0 # Clear timer if any
         self.save_data()
-        print("DEBUG: Handled Force Uncomfortable")
+        log.debug("Handled Force Uncomfortable")
 
     def debug_set_bored(self):
         self.is_bored = True
         self.save_data()
-        print("DEBUG: Handled Force Bored")
+        log.debug("Handled Force Bored")
 
     def debug_set_happy(self):
         """Force happy state: Not bored, not uncomfortable. Hunger to 50 if low."""
@@ -201,4 +465,13 @@ class PetStatus(QObject):
         if self.hunger <= 30:
             self.hunger = 50
         self.save_data()
-        print("DEBUG: Handled Force Happy")
+        log.debug("Handled Force Happy")
+
+_default_status = None
+
+def get_pet_status():
+    """Process-wide vitals shared by every pet (created on first use)."""
+    global _default_status
+    if _default_status is None:
+        _default_status = PetStatus()
+    return _default_status
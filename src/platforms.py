@@ -0,0 +1,296 @@
+import bisect
+import logging
+import os
+import sys
+from PyQt6.QtCore import QObject, QThread, QTimer, Qt, pyqtSignal, pyqtSlot
+from PyQt6.QtWidgets import QApplication
+from .constants import PLATFORM_POLL_MS, PLATFORM_SNAP_PX
+
+log = logging.getLogger(__name__)
+
+class PlatformProvider:
+    """
+    Source of other applications' window rects, as {window id: (x, y, w, h)}.
+
+    Polled providers are queried every PLATFORM_POLL_MS on a worker thread
+    (see WindowPoller); event-driven ones push changes to the index themselves.
+    """
+
+    event_driven = False
+
+    def __init__(self):
+        self.index = None
+
+    def attach(self, index):
+        self.index = index
+
+    def windows(self):
+        return {}
+
+class NullPlatformProvider(PlatformProvider):
+    """No window enumeration (X11 / Wayland / macOS): the screen is the only floor."""
+
+    event_driven = True # Nothing to poll
+
+class FakePlatformProvider(PlatformProvider):
+    """In-memory windows for tests; every change is pushed to the index immediately."""
+
+    event_driven = True
+
+    def __init__(self):
+        super().__init__()
+        self.rects = {}
+
+    def windows(self):
+        return dict(self.rects)
+
+    def set_window(self, wid, x, y, w, h):
+        self.rects[wid] = (x, y, w, h)
+        if self.index:
+            self.index.set_rect(wid, (x, y, w, h))
+
+    def remove_window(self, wid):
+        if self.rects.pop(wid, None) is not None and self.index:
+            self.index.remove(wid)
+
+def visible_top_edges(rects):
+    """
+    Clips each window's top edge by the windows above it. `rects` is a list
+    of (id, (x, y, w, h)) from the top of the z-order down; returns {id:
+    rect} with x and w narrowed to the longest uncovered stretch of the top
+    edge, leaving out windows whose top edge is hidden entirely.
+    """
+    visible = {}
+    for i, (wid, (x, y, w, h)) in enumerate(rects):
+        spans = [(x, x + w)] # Uncovered [start, end) stretches of the edge
+        for _, (ox, oy, ow, oh) in rects[:i]:
+            if not oy <= y < oy + oh:
+                continue
+            clipped = []
+            for a, b in spans:
+                if ox > a:
+                    clipped.append((a, min(b, ox)))
+                if ox + ow < b:
+                    clipped.append((max(a, ox + ow), b))
+            spans = [(a, b) for a, b in clipped if b > a]
+            if not spans:
+                break
+        if spans:
+            a, b = max(spans, key=lambda span: span[1] - span[0])
+            visible[wid] = (a, y, b - a, h)
+    return visible
+
+class WindowsPlatformProvider(PlatformProvider):
+    """
+    Visible, non-minimised top-level windows of other processes (user32
+    EnumWindows), with top edges clipped by the windows in front of them.
+    """
+
+    def __init__(self):
+        super().__init__()
+        import ctypes
+        from ctypes import wintypes
+
+        self.ctypes = ctypes
+        self.wintypes = wintypes
+        self.user32 = ctypes.windll.user32
+        self.dwmapi = ctypes.windll.dwmapi
+        self.pid = os.getpid()
+        self.enum_proc_type = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+
+    def windows(self):
+        ctypes, wintypes, user32 = self.ctypes, self.wintypes, self.user32
+        found = [] # EnumWindows visits top-level windows front to back
+        rect = wintypes.RECT()
+        pid = wintypes.DWORD()
+        cloaked = ctypes.c_int()
+
+        def visit(hwnd, lparam):
+            if not user32.IsWindowVisible(hwnd) or user32.IsIconic(hwnd):
+                return True
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+            if pid.value == self.pid:
+                return True # Our own pets / menus
+            # DWMWA_CLOAKED: hidden UWP windows and windows on other virtual desktops
+            if self.dwmapi.DwmGetWindowAttribute(hwnd, 14, ctypes.byref(cloaked), ctypes.sizeof(cloaked)) == 0 and cloaked.value:
+                return True
+            if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+                return True
+            w, h = rect.right - rect.left, rect.bottom - rect.top
+            if w > 0 and h > 0:
+                found.append((int(hwnd), (rect.left, rect.top, w, h)))
+            return True
+
+        user32.EnumWindows(self.enum_proc_type(visit), 0)
+        return visible_top_edges(found)
+
+def default_provider():
+    if sys.platform == "win32":
+        try:
+            return WindowsPlatformProvider()
+        except Exception as e:
+            log.info("Window platforms unavailable: %s", e)
+    return NullPlatformProvider()
+
+class WindowPoller(QObject):
+    """
+    Queries a polled provider on its own thread and hands snapshots to the
+    GUI thread only when something changed, so an idle desktop costs the
+    GUI thread nothing.
+    """
+
+    snapshot = pyqtSignal(object) # {id: rect}
+
+    def __init__(self, provider, poll_ms):
+        super().__init__()
+        self.provider = provider
+        self.poll_ms = poll_ms
+        self.timer = None
+        self.last = None
+
+    @pyqtSlot()
+    def start(self):
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.poll)
+        self.timer.start(self.poll_ms)
+        self.poll()
+
+    @pyqtSlot()
+    def stop(self):
+        if self.timer:
+            self.timer.stop()
+
+    def poll(self):
+        try:
+            snapshot = self.provider.windows()
+        except Exception as e:
+            log.debug("Window enumeration failed: %s", e)
+            return
+        if snapshot != self.last:
+            self.last = snapshot
+            self.snapshot.emit(snapshot)
+
+class SurfaceIndex(QObject):
+    """
+    Top edges of other windows, kept sorted by height so the surface under
+    a pet is found with a binary search instead of enumerating windows.
+
+    Updates are incremental (only windows whose rect changed are moved in
+    the index) and happen outside the physics tick: pushed by event-driven
+    providers, or from a slow poll on the "platforms" thread for the rest.
+    """
+
+    changed = pyqtSignal()
+
+    def __init__(self, provider=None, poll_ms=PLATFORM_POLL_MS):
+        super().__init__()
+        self.provider = provider or default_provider()
+        self.provider.attach(self)
+        self.edges = []  # Sorted (y, x0, x1, id)
+        self.by_id = {}  # id -> edge tuple
+        self.updates = 0 # Edges inserted / moved / removed
+        self.poller = None
+        self._thread = None
+
+        if self.provider.event_driven:
+            self.sync(self.provider.windows())
+        else:
+            # The first snapshot arrives from the poller shortly after start
+            self.poller = WindowPoller(self.provider, poll_ms)
+            self._thread = QThread()
+            self._thread.setObjectName("platforms")
+            self.poller.moveToThread(self._thread)
+            self._thread.started.connect(self.poller.start)
+            self._thread.finished.connect(self.poller.stop, Qt.ConnectionType.DirectConnection)
+            self.poller.snapshot.connect(self.sync)
+            self._thread.start()
+            app = QApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(self.close)
+
+    def sync(self, snapshot):
+        """Applies a full {id: rect} snapshot, touching only what changed."""
+        dirty = False
+        for wid in [w for w in self.by_id if w not in snapshot]:
+            dirty |= self._remove(wid)
+        for wid, rect in snapshot.items():
+            dirty |= self._set(wid, rect)
+        if dirty:
+            self.changed.emit()
+
+    def set_rect(self, wid, rect):
+        if self._set(wid, rect):
+            self.changed.emit()
+
+    def remove(self, wid):
+        if self._remove(wid):
+            self.changed.emit()
+
+    def _set(self, wid, rect):
+        x, y, w, h = rect
+        edge = (y, x, x + w - 1, wid)
+        old = self.by_id.get(wid)
+        if old == edge:
+            return False
+        if old is not None:
+            del self.edges[bisect.bisect_left(self.edges, old)]
+        bisect.insort(self.edges, edge)
+        self.by_id[wid] = edge
+        self.updates += 1
+        return True
+
+    def _remove(self, wid):
+        old = self.by_id.pop(wid, None)
+        if old is None:
+            return False
+        del self.edges[bisect.bisect_left(self.edges, old)]
+        self.updates += 1
+        return True
+
+    def get(self, wid):
+        return self.by_id.get(wid)
+
+    def surface_under(self, x0, x1, feet_y, reach=PLATFORM_SNAP_PX):
+        """Highest edge within `reach` px below feet_y (or up to reach above)
+        that spans [x0, x1], or None."""
+        return self.first_between(x0, x1, feet_y - reach, feet_y + reach)
+
+    def first_between(self, x0, x1, y_top, y_bottom):
+        """Highest edge with y_top <= y <= y_bottom that spans [x0, x1], or None."""
+        edges = self.edges
+        i = bisect.bisect_left(edges, (y_top,))
+        while i < len(edges) and edges[i][0] <= y_bottom:
+            edge = edges[i]
+            if edge[1] <= x0 and x1 <= edge[2]:
+                return edge
+            i += 1
+        return None
+
+    def edges_between(self, y_top, y_bottom):
+        """Edges with y_top <= y <= y_bottom, top to bottom."""
+        lo = bisect.bisect_left(self.edges, (y_top,))
+        hi = bisect.bisect_left(self.edges, (y_bottom + 1,))
+        return self.edges[lo:hi]
+
+    def close(self):
+        """Stops polling (the index keeps its last snapshot)."""
+        if self._thread:
+            self._thread.quit()
+            self._thread.wait()
+            self._thread = None
+
+_default_index = None
+
+def get_surface_index():
+    """Process-wide index shared by every pet (created on first use)."""
+    global _default_index
+    if _default_index is None:
+        _default_index = SurfaceIndex()
+    return _default_index
+
+def set_surface_index(index):
+    """Installs an index (e.g. one backed by FakePlatformProvider in tests)."""
+    global _default_index
+    if _default_index is not None and _default_index is not index:
+        _default_index.close()
+    _default_index = index
@@ -1,7 +1,11 @@
+import logging
 import sys
 import os
+from functools import lru_cache
 from pathlib import Path
 
+log = logging.getLogger(__name__)
+
 def get_base_path():
     """
     Returns the base path for bundled resources (Read-Only).
@@ -12,10 +16,12 @@ def get_base_path():
         return sys._MEIPASS
     return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+@lru_cache(maxsize=None)
 def get_data_path():
     """
     Returns the path for persistent data storage (Read/Write).
     Target: User Documents/Desktop Kitty
+    Resolved (and created) once, on first use.
     """
     # Get User Documents folder
     # This works on Windows
@@ -26,9 +32,9 @@ def get_data_path():
     if not app_dir.exists():
         try:
             app_dir.mkdir(parents=True, exist_ok=True)
-            print(f"DEBUG: Created data directory at {app_dir}")
+            log.debug("Created data directory at %s", app_dir)
         except Exception as e:
-            print(f"DEBUG: Error creating data dir: {e}")
+            log.warning("Error creating data dir: %s", e)
             # Fallback to local execution dir if documents fails
             if getattr(sys, 'frozen', False):
                 return os.path.dirname(sys.executable)
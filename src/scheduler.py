@@ -0,0 +1,212 @@
+import heapq
+import itertools
+import logging
+import time
+from PyQt6.QtCore import QObject, QTimer, Qt
+
+log = logging.getLogger(__name__)
+
+def monotonic_ms():
+    return time.monotonic() * 1000.0
+
+class VirtualClock:
+    """Manually advanced clock for driving a Scheduler in tests (milliseconds)."""
+
+    def __init__(self, start_ms=0.0):
+        self.now = float(start_ms)
+
+    def __call__(self):
+        return self.now
+
+class ScheduledTask:
+    """Handle returned by Scheduler.call_*; cancel() is idempotent."""
+
+    __slots__ = ("scheduler", "callback", "deadline", "tolerance", "interval", "entry", "cancelled")
+
+    def __init__(self, scheduler, callback, deadline, tolerance, interval):
+        self.scheduler = scheduler
+        self.callback = callback
+        self.deadline = deadline
+        self.tolerance = tolerance
+        self.interval = interval
+        self.entry = None       # Sequence number of the live heap entries
+        self.cancelled = False
+
+    @property
+    def active(self):
+        return not self.cancelled
+
+    def cancel(self):
+        if not self.cancelled:
+            self.cancelled = True
+            self.scheduler._on_cancel(self)
+
+class Scheduler(QObject):
+    """
+    One OS timer for every periodic and one-shot pet timer in the process.
+
+    Tasks live in two heaps: by deadline (what is due) and by latest
+    acceptable time, deadline + tolerance (when we must wake). The single
+    QTimer is armed for the earliest latest-acceptable time and every task
+    already due at that moment runs in the same wakeup, which coalesces
+    tasks with overlapping windows. Periodic tasks are phase-aligned to
+    multiples of their interval, so N pets ticking at the same rate share
+    one wakeup per period instead of N.
+
+    Pass a VirtualClock to drive time manually with advance().
+    """
+
+    def __init__(self, clock=None, parent=None):
+        super().__init__(parent)
+        self.clock = clock or monotonic_ms
+        self.virtual = clock is not None
+
+        self._by_deadline = []
+        self._by_latest = []
+        self._seq = itertools.count()
+        self._stale = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._on_timer)
+        self._armed_for = None
+
+        self.wakeups = 0    # Times the scheduler woke up
+        self.runs = 0       # Callbacks executed
+
+    # --- Public API ---
+    def call_at(self, when_ms, callback, tolerance_ms=0):
+        task = ScheduledTask(self, callback, float(when_ms), tolerance_ms, None)
+        self._push(task)
+        return task
+
+    def call_later(self, delay_ms, callback, tolerance_ms=0):
+        return self.call_at(self.clock() + delay_ms, callback, tolerance_ms)
+
+    def call_every(self, interval_ms, callback, tolerance_ms=0):
+        """Runs callback every interval_ms, phase-aligned to multiples of the interval."""
+        now = self.clock()
+        first = (now // interval_ms + 1) * interval_ms
+        task = ScheduledTask(self, callback, first, tolerance_ms, interval_ms)
+        self._push(task)
+        return task
+
+    @property
+    def pending(self):
+        return len(self._by_deadline) - self._stale
+
+    def advance(self, ms):
+        """Virtual time only: moves the clock forward, running tasks at their wake times."""
+        if not self.virtual:
+            raise RuntimeError("advance() requires a VirtualClock")
+        target = self.clock.now + ms
+        while True:
+            wake = self._next_wake()
+            if wake is None or wake > target:
+                break
+            self.clock.now = max(self.clock.now, wake)
+            self.wakeups += 1
+            self.run_pending(self.clock.now)
+        self.clock.now = target
+
+    def run_pending(self, now):
+        """Runs every task whose deadline is <= now, in deadline order."""
+        due = []
+        heap = self._by_deadline
+        while heap:
+            deadline, seq, task = heap[0]
+            if task.cancelled or task.entry != seq:
+                heapq.heappop(heap)
+                self._stale -= 1
+                continue
+            if deadline > now:
+                break
+            heapq.heappop(heap)
+            task.entry = None # Its by_latest twin is now stale
+            due.append(task)
+
+        for task in due:
+            if task.cancelled:
+                continue
+            if task.interval:
+                # Drift-free; skip missed periods instead of bursting
+                task.deadline += task.interval
+                if task.deadline <= now:
+                    task.deadline += ((now - task.deadline) // task.interval + 1) * task.interval
+                self._push(task, rearm=False)
+            else:
+                task.cancelled = True
+            self.runs += 1
+            try:
+                task.callback()
+            except Exception as e:
+                log.exception("Scheduler task %s failed", getattr(task.callback, '__name__', task.callback))
+
+        self._rearm()
+
+    # --- Internals ---
+    def _push(self, task, rearm=True):
+        seq = next(self._seq)
+        if task.entry is not None:
+            self._stale += 1 # Replacing a live entry
+        task.entry = seq
+        heapq.heappush(self._by_deadline, (task.deadline, seq, task))
+        heapq.heappush(self._by_latest, (task.deadline + task.tolerance, seq, task))
+        if rearm:
+            self._rearm()
+
+    def _on_cancel(self, task):
+        if task.entry is None:
+            return # Already popped to run; nothing left in the heaps
+        self._stale += 1
+        # Keep lazily-deleted entries from piling up under frequent reschedules
+        if self._stale > 64 and self._stale > len(self._by_deadline) // 2:
+            self._compact()
+        self._rearm()
+
+    def _compact(self):
+        self._by_deadline = [e for e in self._by_deadline if not e[2].cancelled and e[2].entry == e[1]]
+        self._by_latest = [e for e in self._by_latest if not e[2].cancelled and e[2].entry == e[1]]
+        heapq.heapify(self._by_deadline)
+        heapq.heapify(self._by_latest)
+        self._stale = 0
+
+    def _next_wake(self):
+        heap = self._by_latest
+        while heap:
+            _, seq, task = heap[0]
+            if task.cancelled or task.entry != seq:
+                heapq.heappop(heap)
+                continue
+            return heap[0][0]
+        return None
+
+    def _rearm(self):
+        if self.virtual:
+            return
+        wake = self._next_wake()
+        if wake is None:
+            self._timer.stop()
+            self._armed_for = None
+            return
+        if wake == self._armed_for and self._timer.isActive():
+            return
+        self._armed_for = wake
+        self._timer.start(max(0, int(wake - self.clock())))
+
+    def _on_timer(self):
+        self.wakeups += 1
+        # QTimer may fire a hair early; anything aimed at this wakeup is due
+        now = max(self.clock(), self._armed_for or 0)
+        self._armed_for = None
+        self.run_pending(now)
+
+_default_scheduler = None
+
+def get_scheduler():
+    """Process-wide scheduler shared by every pet (created on first use)."""
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = Scheduler()
+    return _default_scheduler
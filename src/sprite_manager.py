@@ -1,14 +1,267 @@
+import logging
 import os
+import hashlib
+import json
 import random
-from PyQt6.QtGui import QPixmap, QImage, QColor, QPainter, QBrush
-from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap, QImage, QColor, QPainter, QBrush, QTransform, QBitmap, QRegion
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal, pyqtSlot
+from PyQt6.QtWidgets import QApplication
 from .constants import SPRITES_DIR, DEFAULT_SIZE, DEFAULT_COLOR
+from . import resource_utils
+from .animation import AnimationClip, read_clip_meta
 
-class SpriteManager:
-    """Handles loading sprites and generating fallbacks if missing."""
+log = logging.getLogger(__name__)
+
+SPRITE_EXTENSIONS = ('.png', '.gif', '.apng', '.webp')
+MIN_FRAME_MS = 20 # GIF delays below this mean "browser default" in practice
+DEFAULT_GIF_FRAME_MS = 100
+
+def alpha_mask(pixmap):
+    """Bit-packed (MonoLSB) mask of the pixels with any opacity; index 1 = opaque."""
+    img = pixmap.toImage().convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+    # Premultiplied: every fully transparent pixel is exactly 0
+    mask = img.createMaskFromColor(0, Qt.MaskMode.MaskOutColor)
+    mask.setColorTable([0xffffffff, 0xff000000]) # 1 -> color1, as QBitmap expects
+    return mask
+
+# Bump when the processing pipeline changes to invalidate cached frames
+SPRITE_PIPELINE_VERSION = 2
+
+class SpriteDecoder(QObject):
+    """
+    Decodes and processes sprite sources on the sprite thread: PIL
+    decoding, background removal, resizing and the processed-frame cache.
+    Frames go back to SpriteManager as QImages through queued signals
+    (QPixmaps may only be made on the GUI thread).
+    """
+
+    state_started = pyqtSignal(str, object) # state, clip.json contents
+    frame_ready = pyqtSignal(str, object, object) # state, QImage, duration (ms or None)
+    state_done = pyqtSignal(str)
+
+    def __init__(self, cache_dir):
+        super().__init__()
+        self.cache_dir = cache_dir
+        self.abort = False # Set from the GUI thread on shutdown
+        self._by_source = {} # (pipeline, source pixel hash) -> processed QImage
+
+    @pyqtSlot(str)
+    def decode(self, state):
+        path = os.path.join(SPRITES_DIR, state)
+        if os.path.exists(path):
+            self.state_started.emit(state, read_clip_meta(path))
+            for image, duration in self._frames_for_state(state, path):
+                if self.abort:
+                    return
+                self.frame_ready.emit(state, image, duration)
+        else:
+            log.debug("Path not found %s", path)
+            self.state_started.emit(state, None)
+        self.state_done.emit(state)
+
+    def cached_frames(self, state):
+        """
+        Every (QImage, duration) of a state straight from the processed-frame
+        cache, or None unless all of its sources are cached. Cheap enough
+        for the GUI thread (small PNGs, nothing to process).
+        """
+        path = os.path.join(SPRITES_DIR, state)
+        if self.cache_dir is None or not os.path.isdir(path):
+            return None
+        frames = []
+        for f in sorted(f for f in os.listdir(path) if f.lower().endswith(SPRITE_EXTENSIONS)):
+            key = self._cache_key(state, os.path.join(path, f))
+            manifest = self._read_manifest(key)
+            if manifest is None:
+                return None
+            for i, duration in enumerate(manifest):
+                image = QImage(self._cache_file(key, i))
+                if image.isNull():
+                    return None
+                frames.append((image, duration))
+        return frames or None
+
+    def _frames_for_state(self, state, path):
+        files = sorted([f for f in os.listdir(path) if f.lower().endswith(SPRITE_EXTENSIONS)])
+        log.debug("Found %d files for state '%s' in %s", len(files), state, path)
+        for f in files:
+            full_path = os.path.join(path, f)
+            try:
+                yield from self._frames_for_file(state, f, full_path)
+            except Exception as e:
+                log.error("Processing %s: %s", full_path, e)
+
+    def _frames_for_file(self, state, f, full_path):
+        """
+        Yields (QImage, duration_ms or None) for every frame of one source,
+        one at a time. Processed frames and their durations are cached, so
+        later runs never decode the source again; within a run, a source
+        frame identical to one already processed the same way is not
+        processed again.
+        """
+        key = self._cache_key(state, full_path)
+        manifest = self._read_manifest(key)
+        if manifest is not None:
+            paths = [self._cache_file(key, i) for i in range(len(manifest))]
+            if all(os.path.exists(p) for p in paths):
+                for p, duration in zip(paths, manifest):
+                    image = QImage(p)
+                    if image.isNull():
+                        raise ValueError(f"Corrupt cache entry {p}")
+                    yield image, duration
+                return
+
+        from PIL import Image, ImageSequence
+        durations = []
+        with Image.open(full_path) as source:
+            animated = getattr(source, "is_animated", False)
+            # Frames are decoded lazily by the iterator; only one is alive at a time
+            for i, frame in enumerate(ImageSequence.Iterator(source)):
+                duration = None
+                if animated:
+                    duration = frame.info.get("duration") or DEFAULT_GIF_FRAME_MS
+                    if duration < MIN_FRAME_MS:
+                        duration = DEFAULT_GIF_FRAME_MS
+                rgba = frame.convert("RGBA")
+                source_key = (self._pipeline(state), hashlib.sha1(f"{rgba.width}x{rgba.height}".encode("ascii") + rgba.tobytes()).digest())
+                image = self._by_source.get(source_key)
+                if image is None:
+                    image = self._process_image(state, f, rgba)
+                    self._by_source[source_key] = image
+                if key:
+                    image.save(self._cache_file(key, i), "PNG")
+                durations.append(duration)
+                yield image, duration
+        self._write_manifest(key, durations)
+
+    def _cache_key(self, state, full_path):
+        """Cache key for a source's processed frames: source path, size and mtime."""
+        if self.cache_dir is None:
+            return None
+        st = os.stat(full_path)
+        key = f"{SPRITE_PIPELINE_VERSION}|{state}|{os.path.abspath(full_path)}|{st.st_size}|{st.st_mtime_ns}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _cache_file(self, key, index):
+        return os.path.join(self.cache_dir, f"{key}-{index}.png")
+
+    def _read_manifest(self, key):
+        """Frame durations of a fully cached source, or None."""
+        if key is None:
+            return None
+        try:
+            with open(os.path.join(self.cache_dir, key + ".json"), "r") as f:
+                durations = json.load(f)
+            return durations if isinstance(durations, list) and durations else None
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, key, durations):
+        # Written last: its presence means every frame PNG is in place
+        if key is None or not durations:
+            return
+        try:
+            with open(os.path.join(self.cache_dir, key + ".json"), "w") as f:
+                json.dump(durations, f)
+        except OSError as e:
+            log.info("Sprite cache write failed: %s", e)
+
+    @staticmethod
+    def _scale_factor(state):
+        if state in ["sleep", "drag"]:
+            return 0.8
+        elif state == "uncomfortable":
+            return 0.5
+        return 1.0
+
+    @classmethod
+    def _pipeline(cls, state):
+        # Everything about a state that changes how _process_image treats a frame
+        return (state == "drag", state == "uncomfortable", cls._scale_factor(state))
+
+    def _process_image(self, state, f, pil_img):
+        """Runs the transparency + resize pipeline on one RGBA frame; returns a QImage."""
+        from PIL import Image, ImageDraw
+        
+        # 1. Smart Background Removal (Flood Fill)
+        # Apply to all states to ensure transparency
+        
+        # Flood fill from (0,0) with transparency
+        bg_color = pil_img.getpixel((0, 0))
+        
+        # Dynamic threshold: Aggressive (60) for sprites
+        thresh_val = 60
+        
+        try:
+            # Always floodfill from top-left
+            ImageDraw.floodfill(pil_img, (0, 0), (0, 0, 0, 0), thresh=thresh_val)
+            
+            w, h = pil_img.size
+            # Define corners to floodfill
+            corners = [(w-1, 0), (0, h-1), (w-1, h-1)]
+            
+            # Add top-center ONLY if NOT dragging (to protect the hand)
+            # The hand is usually at top-center for drag sprites.
+            if state != "drag":
+                corners.append((w//2, 0))
+                
+            for corner in corners:
+                ImageDraw.floodfill(pil_img, corner, (0, 0, 0, 0), thresh=thresh_val)
+            
+        except Exception as e:
+            log.debug("Floodfill warning for %s: %s", f, e)
+
+        # 2. Resize
+        scale_factor = self._scale_factor(state)
+            
+        if state == "uncomfortable":
+             # Just resize, no padding
+            w, h = pil_img.size
+            target_w = int(w * scale_factor)
+            target_h = int(h * scale_factor)
+            pil_img = pil_img.resize((target_w, target_h), Image.Resampling.LANCZOS)
+        elif scale_factor != 1.0:
+            target_w = int(DEFAULT_SIZE[0] * scale_factor)
+            target_h = int(DEFAULT_SIZE[1] * scale_factor)
+            
+            pil_img = pil_img.resize((target_w, target_h), Image.Resampling.LANCZOS)
+            
+            base_img = Image.new("RGBA", DEFAULT_SIZE, (0, 0, 0, 0))
+            
+            x_offset = (DEFAULT_SIZE[0] - target_w) // 2
+            y_offset = (DEFAULT_SIZE[1] - target_h) // 2
+            
+            base_img.paste(pil_img, (x_offset, y_offset))
+            pil_img = base_img
+        else:
+            pil_img = pil_img.resize(DEFAULT_SIZE, Image.Resampling.LANCZOS)
+        
+        # Convert to QPixmap
+        data = pil_img.tobytes("raw", "BGRA")
+        # Copy: the QImage must own its pixels once `data` goes away
+        return QImage(data, pil_img.width, pil_img.height, QImage.Format.Format_ARGB32).copy()
+            
+
+class SpriteManager(QObject):
+    """
+    Handles loading sprites and generating fallbacks if missing.
+
+    Processed frames are stored once per unique image (by content hash) in
+    `frames`; each state is a list of frame IDs into it, so repeated poses
+    share one pixmap, and one mirrored copy, across every state using them.
+
+    Sources are decoded by a SpriteDecoder on its own thread and arrive
+    frame by frame; frames_added tells the pets to repaint. Until a state
+    has frames, its first idle frame (or a placeholder) stands in.
+    """
+
+    frames_added = pyqtSignal(str) # A state gained frames (or finished loading)
+    all_loaded = pyqtSignal()
+    _decode = pyqtSignal(str)
 
     def __init__(self):
-        self.sprites = {
+        super().__init__()
+        self.sprites = { # state -> [frame ID]
             "idle": [],
             "sit": [],
             "sleep": [],
@@ -18,96 +271,141 @@ class SpriteManager:
             "feed": [],
             "toilet": [],
         }
-        self.load_sprites()
+        self.frames = [] # frame ID -> QPixmap
+        self._mirrored = {} # frame ID -> horizontally flipped QPixmap
+        self.masks = [] # frame ID -> alpha mask (see alpha_mask)
+        self._regions = {} # (frame ID, mirrored) -> QRegion of the opaque pixels
+        self._by_digest = {} # processed pixel hash -> frame ID
+        self.frame_refs = 0 # Frames referenced by states (dedup ratio numerator)
+        self._reported = False
+        self.clips = {} # state -> AnimationClip (None = rebuild on next get_clip)
+        self._durations = {state: [] for state in self.sprites} # state -> embedded duration (ms or None) per frame
+        self._meta = {} # state -> clip.json contents
+        self._whole = set() # States whose clip needs every frame before it can play
+        self._requested = set()
+        self._done = set()
+        self._placeholder = None # Frame ID shown before anything has loaded
+        self.cache_dir = self._init_cache_dir()
+        log.debug("Looking for sprites in %s", SPRITES_DIR)
 
-    def load_sprites(self):
-        """Loads images from disk or creates placeholders."""
-        from PIL import Image, ImageOps, ImageDraw
-        
-        print(f"DEBUG: Looking for sprites in {SPRITES_DIR}")
-        for state in self.sprites.keys():
-            path = os.path.join(SPRITES_DIR, state)
-            if os.path.exists(path):
-                files = sorted([f for f in os.listdir(path) if f.lower().endswith(('.png', '.gif'))])
-                print(f"DEBUG: Found {len(files)} files for state '{state}' in {path}")
-                for f in files:
-                    full_path = os.path.join(path, f)
-                    try:
-                        pil_img = Image.open(full_path).convert("RGBA")
-                        
-                        # 1. Smart Background Removal (Flood Fill)
-                        # Apply to all states to ensure transparency
-                        from PIL import ImageDraw
-                        
-                        # Flood fill from (0,0) with transparency
-                        bg_color = pil_img.getpixel((0, 0))
-                        
-                        # Dynamic threshold: Aggressive (60) for sprites
-                        thresh_val = 60
-                        
-                        try:
-                            # Always floodfill from top-left
-                            ImageDraw.floodfill(pil_img, (0, 0), (0, 0, 0, 0), thresh=thresh_val)
-                            
-                            w, h = pil_img.size
-                            # Define corners to floodfill
-                            corners = [(w-1, 0), (0, h-1), (w-1, h-1)]
-                            
-                            # Add top-center ONLY if NOT dragging (to protect the hand)
-                            # The hand is usually at top-center for drag sprites.
-                            if state != "drag":
-                                corners.append((w//2, 0))
-                                
-                            for corner in corners:
-                                ImageDraw.floodfill(pil_img, corner, (0, 0, 0, 0), thresh=thresh_val)
-                            
-                        except Exception as e:
-                            print(f"DEBUG: Floodfill warning for {f}: {e}")
-
-                        # 2. Resize
-                        scale_factor = 1.0
-                        if state in ["sleep", "drag"]:
-                            scale_factor = 0.8
-                        elif state == "uncomfortable":
-                            scale_factor = 0.5 
-                            
-                        if state == "uncomfortable":
-                             # Just resize, no padding
-                            w, h = pil_img.size
-                            target_w = int(w * scale_factor)
-                            target_h = int(h * scale_factor)
-                            pil_img = pil_img.resize((target_w, target_h), Image.Resampling.LANCZOS)
-                        elif scale_factor != 1.0:
-                            target_w = int(DEFAULT_SIZE[0] * scale_factor)
-                            target_h = int(DEFAULT_SIZE[1] * scale_factor)
-                            
-                            pil_img = pil_img.resize((target_w, target_h), Image.Resampling.LANCZOS)
-                            
-                            base_img = Image.new("RGBA", DEFAULT_SIZE, (0, 0, 0, 0))
-                            
-                            x_offset = (DEFAULT_SIZE[0] - target_w) // 2
-                            y_offset = (DEFAULT_SIZE[1] - target_h) // 2
-                            
-                            base_img.paste(pil_img, (x_offset, y_offset))
-                            pil_img = base_img
-                        else:
-                            pil_img = pil_img.resize(DEFAULT_SIZE, Image.Resampling.LANCZOS)
-                        
-                        # Convert to QPixmap
-                        data = pil_img.tobytes("raw", "BGRA")
-                        qim = QImage(data, pil_img.width, pil_img.height, QImage.Format.Format_ARGB32)
-                        pixmap = QPixmap.fromImage(qim)
-                        self.sprites[state].append(pixmap)
-                            
-                    except Exception as e:
-                        print(f"ERROR: Processing {full_path}: {e}")
-
-            else:
-                 print(f"DEBUG: Path not found {path}")
-            
-            # If no sprites found, generate a fallback
-            if not self.sprites[state]:
-                self.sprites[state].append(self._generate_fallback(state))
+        self.decoder = SpriteDecoder(self.cache_dir)
+        self._thread = QThread()
+        self._thread.setObjectName("sprites")
+        self.decoder.moveToThread(self._thread)
+        self._decode.connect(self.decoder.decode)
+        self.decoder.state_started.connect(self._on_state_started)
+        self.decoder.frame_ready.connect(self._on_frame_ready)
+        self.decoder.state_done.connect(self._on_state_done)
+        self._thread.start()
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.close)
+
+        # The first paint only needs idle: take it straight from the cache
+        # when it is all there, otherwise decode it first of all
+        if not self._load_cached("idle"):
+            self.request("idle")
+
+    def _init_cache_dir(self):
+        path = os.path.join(resource_utils.get_data_path(), "sprite_cache")
+        try:
+            os.makedirs(path, exist_ok=True)
+            return path
+        except OSError as e:
+            log.info("Sprite cache disabled: %s", e)
+            return None
+
+    @property
+    def loaded(self):
+        return len(self._done) == len(self.sprites)
+
+    def request(self, state):
+        """Queues a state for decoding on the sprite thread (once)."""
+        if state in self._requested or state not in self.sprites:
+            return
+        self._requested.add(state)
+        self._decode.emit(state)
+
+    def load_all(self):
+        """Queues every state not loaded yet; all_loaded follows once they are in."""
+        for state in self.sprites:
+            self.request(state)
+
+    def close(self):
+        """Stops the sprite thread (abandoning anything still decoding)."""
+        if self._thread is None:
+            return
+        self.decoder.abort = True
+        self._thread.quit()
+        self._thread.wait()
+        self._thread = None
+
+    def _load_cached(self, state):
+        frames = self.decoder.cached_frames(state)
+        if frames is None:
+            return False
+        self._requested.add(state)
+        self._on_state_started(state, read_clip_meta(os.path.join(SPRITES_DIR, state)))
+        for image, duration in frames:
+            self._on_frame_ready(state, image, duration)
+        self._on_state_done(state)
+        return True
+
+    def _on_state_started(self, state, meta):
+        self._meta[state] = meta
+        if meta and ("frames" in meta or meta.get("mode", "loop") != "loop"):
+            # Hand-authored timelines index frames freely and one-shot /
+            # pingpong clips need their real length; wait for them all
+            self._whole.add(state)
+
+    def _on_frame_ready(self, state, image, duration):
+        self.sprites[state].append(self._add_frame(QPixmap.fromImage(image)))
+        self.frame_refs += 1
+        self._durations[state].append(duration)
+        self.clips[state] = None
+        if state not in self._whole:
+            self.frames_added.emit(state)
+
+    def _on_state_done(self, state):
+        self._done.add(state)
+        # If no sprites found, generate a fallback
+        if not self.sprites[state]:
+            self.sprites[state].append(self._add_frame(self._generate_fallback(state)))
+            self.frame_refs += 1
+            self._durations[state] = [None]
+            self._meta[state] = None
+        self.clips[state] = None
+        self.frames_added.emit(state)
+        if self.loaded:
+            self.report_dedup()
+            self.all_loaded.emit()
+
+    def _visible(self, state):
+        """Frame IDs of a state that may be shown now."""
+        if state in self._whole and state not in self._done:
+            return []
+        return self.sprites.get(state, [])
+
+    def report_dedup(self):
+        if self.frame_refs and not self._reported:
+            self._reported = True
+            unique = len({i for ids in self.sprites.values() for i in ids}) # Not the startup placeholder
+            log.info("Sprites: %d frames, %d unique (dedup ratio %.2f)",
+                     self.frame_refs, unique, self.frame_refs / unique)
+
+    def _add_frame(self, pixmap):
+        """Frame ID for a processed pixmap, reusing an identical stored one."""
+        img = pixmap.toImage().convertToFormat(QImage.Format.Format_ARGB32)
+        bits = img.constBits()
+        bits.setsize(img.sizeInBytes())
+        digest = hashlib.sha1(f"{img.width()}x{img.height()}".encode("ascii") + bytes(bits)).digest()
+        frame_id = self._by_digest.get(digest)
+        if frame_id is None:
+            frame_id = len(self.frames)
+            self.frames.append(pixmap)
+            self.masks.append(alpha_mask(pixmap))
+            self._by_digest[digest] = frame_id
+        return frame_id
 
     def _generate_fallback(self, state_name):
         """Generates a procedural placeholder texture."""
@@ -152,12 +450,74 @@ class SpriteManager:
         painter.end()
         return QPixmap.fromImage(img)
 
-    def get_frame(self, state, index):
+    def get_frame_id(self, state, index):
+        """Frame ID of a state's frame, looping if necessary (a stand-in while it loads)."""
+        self.request(state)
+        ids = self._visible(state) or self._visible("idle")
+        if not ids:
+            if self._placeholder is None:
+                self._placeholder = self._add_frame(self._generate_fallback("idle"))
+            return self._placeholder
+        return ids[index % len(ids)]
+
+    def get_frame(self, state, index, mirrored=False):
         """Returns the specific frame for a state, looping if necessary."""
-        frames = self.sprites.get(state, [])
-        if not frames:
-            return None
-        return frames[index % len(frames)]
+        frame_id = self.get_frame_id(state, index)
+        if mirrored:
+            return self.get_mirrored(frame_id)
+        return self.frames[frame_id]
+
+    def get_mirrored(self, frame_id):
+        """Horizontally flipped copy of a frame, made once and shared."""
+        pixmap = self._mirrored.get(frame_id)
+        if pixmap is None:
+            pixmap = self.frames[frame_id].transformed(QTransform().scale(-1, 1))
+            self._mirrored[frame_id] = pixmap
+        return pixmap
+
+    def hit_test(self, frame_id, mirrored, x, y):
+        """True if (x, y) in widget coordinates lands on an opaque pixel of the frame."""
+        mask = self.masks[frame_id]
+        x, y = int(x), int(y)
+        if mirrored:
+            x = mask.width() - 1 - x
+        if 0 <= x < mask.width() and 0 <= y < mask.height():
+            return mask.pixelIndex(x, y) == 1
+        return False
+
+    def get_region(self, frame_id, mirrored=False):
+        """Opaque area of a frame as a QRegion (for QWidget.setMask), made once per frame and side."""
+        key = (frame_id, mirrored)
+        region = self._regions.get(key)
+        if region is None:
+            mask = self.masks[frame_id]
+            if mirrored:
+                mask = alpha_mask(self.get_mirrored(frame_id))
+            region = QRegion(QBitmap.fromImage(mask))
+            self._regions[key] = region
+        return region
+
+    def get_clip(self, state):
+        """The state's clip, covering the frames loaded so far (a still frame until it has any)."""
+        self.request(state)
+        count = len(self._visible(state))
+        if not count:
+            return AnimationClip.for_files(1)
+        clip = self.clips.get(state)
+        if clip is None:
+            clip = AnimationClip.from_meta(self._meta.get(state), count, self._durations.get(state))
+            self.clips[state] = clip
+        return clip
 
     def get_frame_count(self, state):
-        return len(self.sprites.get(state, []))
+        self.request(state)
+        return len(self._visible(state))
+
+_default_manager = None
+
+def get_sprite_manager():
+    """Process-wide sprite set shared by every pet (created on first use)."""
+    global _default_manager
+    if _default_manager is None:
+        _default_manager = SpriteManager()
+    return _default_manager
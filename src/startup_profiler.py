@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+
+# Budget from process start (profiler import) to the first painted frame
+STARTUP_BUDGET_MS = 1000
+
+_t0 = time.perf_counter()
+_marks = []
+enabled = False
+
+def enable():
+    global enabled
+    enabled = True
+
+def mark(phase):
+    """Records the end of a startup phase. No-op unless profiling is enabled."""
+    if enabled:
+        _marks.append((phase, time.perf_counter()))
+
+def elapsed_ms(phase):
+    for name, t in _marks:
+        if name == phase:
+            return (t - _t0) * 1000.0
+    return None
+
+def report():
+    """Returns the per-phase report as text."""
+    lines = [f"Startup profile ({'frozen' if getattr(sys, 'frozen', False) else 'source'} build)"]
+    prev = _t0
+    for phase, t in _marks:
+        lines.append(f"  {phase:<28} {(t - prev) * 1000.0:8.1f} ms  (at {(t - _t0) * 1000.0:8.1f} ms)")
+        prev = t
+
+    first_paint = elapsed_ms("first paint")
+    if first_paint is not None:
+        verdict = "OK" if first_paint <= STARTUP_BUDGET_MS else "OVER BUDGET"
+        lines.append(f"  first paint {first_paint:.1f} ms / budget {STARTUP_BUDGET_MS} ms: {verdict}")
+    return "\n".join(lines)
+
+def within_budget():
+    first_paint = elapsed_ms("first paint")
+    return first_paint is not None and first_paint <= STARTUP_BUDGET_MS
+
+def write_report():
+    """Prints the report and saves it to startup_profile.txt in the data directory
+    (windowed frozen builds have no console)."""
+    text = report()
+    if sys.stdout is not None:
+        print(text)
+    from . import resource_utils
+    path = os.path.join(resource_utils.get_data_path(), "startup_profile.txt")
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    except OSError as e:
+        if sys.stdout is not None:
+            print(f"Failed to write startup profile: {e}")
+    return text
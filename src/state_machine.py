@@ -10,6 +10,14 @@ class StateMachine:
         self.locked = False
         self.current_state = None # Helper for first set_state call
         self.target_duration = 0
+        self.state_listener = None # Called with the new state after every transition
+        self.transitions = 0 # Bumped on every transition; stale brain decisions are dropped
+        self.brain_driven = False # Routine transitions come from a Brain (see brain.py)
+        self.heading = None # Walk direction chosen by the brain (radians), if any
+        
+        # Cached settings (kept in sync via ConfigManager.setting_changed)
+        self.wait_mode = owner.config.settings.wait_mode
+        owner.config.setting_changed.connect(self.on_setting_changed)
         
         # Initialize state properly
         self.set_state("idle", force=True)
@@ -21,6 +29,8 @@ class StateMachine:
             
         if self.current_state != new_state:
             self.current_state = new_state
+            self.transitions += 1
+            self.heading = None
             self.frame_index = 0
             self.state_timer = 0
             # Reset random duration for the new state
@@ -35,6 +45,13 @@ class StateMachine:
                 self.target_duration = 4500 # 4.5 seconds fixed
             elif force and new_state == "sit":
                 self.target_duration = random.randint(5000, 10000)
+            
+            if self.state_listener:
+                self.state_listener(new_state)
+
+    def on_setting_changed(self, key, value):
+        if key == "wait_mode":
+            self.wait_mode = value
 
     def update(self, dt_ms):
         """Updates state timers and logic."""
@@ -43,30 +60,32 @@ class StateMachine:
         # Logic for auto-transitions
         self.decide_next_state()
 
-    def step_animation(self):
-        """Increments the animation frame index."""
-        # Special case: 'feed' runs at 1 frame per second
-        if self.current_state == "feed":
-            # 0, 1, 0, 1, 0 -> Indices 0, 1, 2, 3, 4
-            # 5200ms total. 
-            # 0-1000: 0
-            # 1000-2000: 1
-            # 2000-3000: 0
-            # 3000-4000: 1
-            # 4000-5200: 0
-            idx = int(self.state_timer / 1000)
-            self.frame_index = min(4, idx)
-            
-        # Special case: 'toilet' runs at 1 frame per second
-        elif self.current_state == "toilet":
-            # Show frames 0, 1, 2, 3. 
-            # We want to ensure it ends on 3.
-            # 1 frame per second.
-            idx = int(self.state_timer / 1000)
-            self.frame_index = min(3, idx) 
-            
+    def on_clip_finished(self, state):
+        """End-of-clip event from the owner's animation player."""
+        if state == self.current_state and state in ["feed", "toilet"]:
+            self.end_temporary_state()
+
+    def apply_decision(self, decision):
+        """
+        Applies a decision posted by the brain thread. Decisions are made
+        on a snapshot, so one is dropped if the state has changed since
+        (drag, feed, play...) or the FSM is locked. Returns True if applied.
+        """
+        if self.locked or decision.get("serial") != self.transitions:
+            return False
+        self.set_state(decision["state"])
+        self.state_timer = 0
+        if decision.get("duration"):
+            self.target_duration = decision["duration"]
+        self.heading = decision.get("heading")
+        return True
+
+    def end_temporary_state(self):
+        # Return to previous logical state
+        if self.wait_mode:
+            self.set_state("sit")
         else:
-            self.frame_index += 1
+            self.set_state("idle")
 
     def decide_next_state(self):
         """Randomly decides to switch states based on timer."""
@@ -74,15 +93,15 @@ class StateMachine:
         # PRIORITY: Check for temporary states completion independent of Wait Mode
         if self.current_state in ["feed", "toilet"]:
             if self.state_timer > self.target_duration:
-                # Return to previous logical state
-                if self.owner.config.get("wait_mode"):
-                    self.set_state("sit")
-                else:
-                    self.set_state("idle")
+                self.end_temporary_state()
                 return
 
         # Check Wait Mode
-        if self.owner.config.get("wait_mode"):
+        if self.wait_mode:
+            return
+
+        # The brain decides the rest off the physics tick
+        if self.brain_driven:
             return
 
         # Special case: Sleep lasts longer or user defined
@@ -1,8 +1,172 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar, QPushButton, QFrame, QInputDialog, QMessageBox, QLineEdit
-from PyQt6.QtCore import Qt, QTimer, QPoint
-from PyQt6.QtGui import QColor, QCursor
+from PyQt6.QtCore import Qt, QPoint, QPointF, pyqtSignal
+from PyQt6.QtGui import QColor, QCursor, QPainter, QPixmap, QPen, QPolygonF
+import time
+from .pet_status import RECENT_MOOD, MOOD_SCORES
+from .history_store import summary, hunger_series
+
+RECENT_SPAN = 3 * 3600          # Hunger sparkline windows (seconds)
+LONG_SPAN = 30 * 24 * 3600
+from .scheduler import get_scheduler
+
+HUNGER_BAR_STYLE = """
+    QProgressBar {{
+        border: 1px solid #CCC;
+        border-radius: 6px;
+        background-color: #F0F0F0;
+    }}
+    QProgressBar::chunk {{
+        background-color: {color};
+        border-radius: 5px;
+    }}
+"""
+
+# Pre-built once; switching variants is a dict lookup, not a string rebuild
+HUNGER_BAR_STYLES = {
+    "high": HUNGER_BAR_STYLE.format(color="#90EE90"),
+    "mid": HUNGER_BAR_STYLE.format(color="#FFD700"),
+    "low": HUNGER_BAR_STYLE.format(color="#FF6B6B"),
+}
+
+def format_duration(seconds):
+    hours, minutes = divmod(int(seconds) // 60, 60)
+    return f"{hours}시간 {minutes}분" if hours else f"{minutes}분"
+
+def history_view(conn, day_start, now, points):
+    """Everything the status window reads from the history store, in one query call."""
+    return {
+        "end": now,
+        "today": summary(conn, day_start, now),
+        "recent": hunger_series(conn, now - RECENT_SPAN, now, points),
+        "long": hunger_series(conn, now - LONG_SPAN, now, points),
+    }
+
+def hunger_level(hunger):
+    if hunger > 70:
+        return "high"
+    elif hunger > 30:
+        return "mid"
+    return "low"
+
+class Sparkline(QWidget):
+    """
+    Scrolling line chart of one column of a SampleRing, one pixel per sample.
+
+    The chart lives in a cached pixmap. New samples scroll it left and only
+    the new segment is drawn (one polyline), so cost per update depends on
+    the number of new samples, not on how long the app has been running.
+    """
+
+    BACKGROUND = QColor("#F7F7F7")
+
+    def __init__(self, ring, column, vmin, vmax, color, parent=None):
+        super().__init__(parent)
+        self.ring = ring
+        self.column = column
+        self.vmin = vmin
+        self.vmax = vmax
+        self.pen = QPen(QColor(color), 1.5)
+        self.setFixedHeight(26)
+
+        self._cache = None
+        self._drawn_total = 0
+
+    def refresh(self):
+        if self.ring.total != self._drawn_total:
+            self.update()
+
+    def resizeEvent(self, event):
+        self._cache = None
+        super().resizeEvent(event)
+
+    def _y(self, value):
+        h = self.height() - 4
+        return 2 + (1.0 - (value - self.vmin) / (self.vmax - self.vmin)) * h
+
+    def _draw_segment(self, painter, values, x_end):
+        """Draws values as one polyline ending at x_end (last sample)."""
+        if len(values) < 2:
+            return
+        x0 = x_end - (len(values) - 1)
+        painter.drawPolyline(QPolygonF([QPointF(x0 + i, self._y(v)) for i, v in enumerate(values)]))
+
+    def _render(self):
+        w, h = self.width(), self.height()
+        new = self.ring.total - self._drawn_total
+
+        if self._cache is None or new >= w:
+            # Full redraw: first paint, resize, or everything scrolled out
+            self._cache = QPixmap(w, h)
+            self._cache.fill(self.BACKGROUND)
+            painter = QPainter(self._cache)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(self.pen)
+            self._draw_segment(painter, self.ring.tail(w, self.column), w - 1)
+            painter.end()
+        elif new > 0:
+            self._cache.scroll(-new, 0, self._cache.rect())
+            painter = QPainter(self._cache)
+            painter.fillRect(w - new, 0, new, h, self.BACKGROUND)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(self.pen)
+            # Include the previous sample so the line stays connected
+            self._draw_segment(painter, self.ring.tail(new + 1, self.column), w - 1)
+            painter.end()
+
+        self._drawn_total = self.ring.total
+
+    def paintEvent(self, event):
+        self._render()
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._cache)
+
+class SeriesSparkline(QWidget):
+    """Line chart of (timestamp, value) points over the last `span` seconds, set as a whole."""
+
+    BACKGROUND = Sparkline.BACKGROUND
+
+    def __init__(self, span, vmin, vmax, color, parent=None):
+        super().__init__(parent)
+        self.span = span
+        self.vmin = vmin
+        self.vmax = vmax
+        self.pen = QPen(QColor(color), 1.5)
+        self.setFixedHeight(26)
+        self.points = []
+        self.end = 0.0
+
+    def set_series(self, points, end):
+        if points != self.points or end != self.end:
+            self.points = points
+            self.end = end
+            self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.BACKGROUND)
+        if len(self.points) < 2:
+            return
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(self.pen)
+        w, h = self.width() - 1, self.height() - 4
+        start = self.end - self.span
+        # Break the line where the app wasn't running (no samples for a while)
+        gap = 3 * self.span / max(1, w)
+        line, last_t = [], None
+        for t, value in self.points:
+            if last_t is not None and t - last_t > gap:
+                painter.drawPolyline(QPolygonF(line))
+                line = []
+            x = (t - start) / self.span * w
+            y = 2 + (1.0 - (value - self.vmin) / (self.vmax - self.vmin)) * h
+            line.append(QPointF(x, y))
+            last_t = t
+        painter.drawPolyline(QPolygonF(line))
 
 class StatusWindow(QWidget):
+    # history_view() result, answered on the history writer thread
+    history_ready = pyqtSignal(object)
+
     def __init__(self, pet_status, parent=None):
         super().__init__(parent)
         self.pet_status = pet_status
@@ -11,7 +175,7 @@ class StatusWindow(QWidget):
         # Window Setup
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Tool | Qt.WindowType.WindowStaysOnTopHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        self.setFixedSize(220, 230) # Increased height for button
+        self.setFixedSize(220, 390) # Increased height for button + sparklines + today
 
         # Drag variables
         self.drag_pos = None
@@ -118,6 +282,35 @@ class StatusWindow(QWidget):
         self.bar_hunger.setTextVisible(False)
         content_layout.addWidget(self.bar_hunger)
         
+        # Recent history (last 3 hours)
+        content_layout.addSpacing(8)
+        lbl_recent = QLabel("최근 3시간 (배고픔 / 기분)")
+        lbl_recent.setStyleSheet("color: #888; font-size: 11px;")
+        content_layout.addWidget(lbl_recent)
+        
+        self.spark_hunger = SeriesSparkline(RECENT_SPAN, 0, 100, "#4CAF50")
+        content_layout.addWidget(self.spark_hunger)
+        ring = self.pet_status.recent_history
+        self.spark_mood = Sparkline(ring, RECENT_MOOD, min(MOOD_SCORES.values()), max(MOOD_SCORES.values()), "#42A5F5")
+        content_layout.addWidget(self.spark_mood)
+
+        content_layout.addSpacing(4)
+        lbl_long = QLabel("최근 30일 (배고픔)")
+        lbl_long.setStyleSheet("color: #888; font-size: 11px;")
+        content_layout.addWidget(lbl_long)
+        self.spark_hunger_long = SeriesSparkline(LONG_SPAN, 0, 100, "#81C784")
+        content_layout.addWidget(self.spark_hunger_long)
+
+        # Today (from the history store)
+        content_layout.addSpacing(8)
+        self.lbl_today = QLabel("오늘: -")
+        self.lbl_today.setStyleSheet("color: #888; font-size: 11px;")
+        content_layout.addWidget(self.lbl_today)
+        self.lbl_today_mood = QLabel("")
+        self.lbl_today_mood.setStyleSheet("color: #888; font-size: 11px;")
+        content_layout.addWidget(self.lbl_today_mood)
+        self.history_ready.connect(self.on_history)
+        
         content_layout.addStretch()
 
         # Debug Button (Bottom Right)
@@ -144,10 +337,13 @@ class StatusWindow(QWidget):
         
         container_layout.addWidget(content_widget)
         
-        # Timer
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_ui)
-        self.timer.start(1000)
+        # Change-driven updates: PetStatus notifies on mutations/threshold crossings.
+        # The only timer wakes at the next minute boundary of the age label or
+        # the next hunger step, and only while the window is visible.
+        self._hunger_level = None
+        self.scheduler = get_scheduler()
+        self.tick_task = None
+        self.pet_status.status_changed.connect(self.on_status_changed)
         
         self.update_ui()
     
@@ -162,33 +358,85 @@ class StatusWindow(QWidget):
         elif ok:
              QMessageBox.warning(self, "Error", "Incorrect Password.")
 
+    def on_status_changed(self):
+        # Hidden windows catch up in showEvent
+        if self.isVisible():
+            self.update_ui()
+
+    def request_history(self):
+        if not self.isVisible():
+            return # showEvent asks again
+        # Queue hunger rows up to now first; the query runs after they land
+        self.pet_status.sample_history()
+        now = time.time()
+        midnight = time.mktime(time.localtime(now)[:3] + (0, 0, 0, 0, 0, -1))
+        points = max(2, self.spark_hunger.width())
+        self.pet_status.history.query(history_view, midnight, now, points, callback=self.history_ready.emit)
+
+    def on_history(self, result):
+        if not result:
+            return
+        self.spark_hunger.set_series(result["recent"], result["end"])
+        self.spark_hunger_long.set_series(result["long"], result["end"])
+        events = result["today"]["events"]
+        self.set_text_if_changed(self.lbl_today, f"오늘: 밥 {events.get('feed', 0)}회 · "
+                                 f"화장실 {events.get('toilet', 0)}회 · 놀이 {events.get('play', 0)}회")
+        moods = result["today"]["moods"]
+        text = f"행복했던 시간: {format_duration(moods.get('행복', 0))}" if moods else ""
+        self.set_text_if_changed(self.lbl_today_mood, text)
+
+    def showEvent(self, event):
+        # Pick up vitals written by other instances while we were hidden;
+        # a reload re-renders through status_changed when it lands
+        self.pet_status.refresh_shared()
+        self.update_ui()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        if self.tick_task:
+            self.tick_task.cancel()
+            self.tick_task = None
+        super().hideEvent(event)
+
+    def set_text_if_changed(self, label, text):
+        if label.text() != text:
+            label.setText(text)
+
     def update_ui(self):
         # Update Labels
-        self.lbl_birth.setText(f"생후: {self.pet_status.get_birth_time_str()}")
-        self.lbl_mood.setText(f"기분: {self.pet_status.get_mood()}")
+        self.set_text_if_changed(self.lbl_birth, f"생후: {self.pet_status.get_birth_time_str()}")
+        self.set_text_if_changed(self.lbl_mood, f"기분: {self.pet_status.get_mood()}")
         
         hunger = self.pet_status.get_hunger()
-        self.bar_hunger.setValue(hunger)
-        self.lbl_hunger_val.setText(f"({hunger}/100)")
-        
-        if hunger > 70: 
-            color = "#90EE90"
-        elif hunger > 30: 
-            color = "#FFD700"
-        else: 
-            color = "#FF6B6B"
-        
-        self.bar_hunger.setStyleSheet(f"""
-            QProgressBar {{
-                border: 1px solid #CCC;
-                border-radius: 6px;
-                background-color: #F0F0F0;
-            }}
-            QProgressBar::chunk {{
-                background-color: {color};
-                border-radius: 5px;
-            }}
-        """)
+        if self.bar_hunger.value() != hunger:
+            self.bar_hunger.setValue(hunger)
+        self.set_text_if_changed(self.lbl_hunger_val, f"({hunger}/100)")
+        
+        # Restyle (and re-polish) only when the colour band changes
+        level = hunger_level(hunger)
+        if level != self._hunger_level:
+            self._hunger_level = level
+            self.bar_hunger.setStyleSheet(HUNGER_BAR_STYLES[level])
+        
+        self.pet_status.sample_recent()
+        self.spark_mood.refresh()
+        self.request_history()
+        
+        self.schedule_next_tick()
+
+    def schedule_next_tick(self):
+        """Arms a one-shot tick for the next minute boundary of the age label or hunger step."""
+        if not self.isVisible():
+            return
+        if self.tick_task:
+            self.tick_task.cancel()
+        now = time.time()
+        wake = now + 60 - ((now - self.pet_status.birth_time) % 60)
+        hunger_step = self.pet_status.next_hunger_change()
+        if hunger_step is not None:
+            wake = min(wake, hunger_step)
+        # The label has minute resolution, so a little lateness is invisible
+        self.tick_task = self.scheduler.call_later(max(0, (wake - now) * 1000) + 1, self.update_ui, tolerance_ms=500)
 
     # Drag Logic
     def mousePressEvent(self, event):
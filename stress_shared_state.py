@@ -0,0 +1,98 @@
+"""
+Stress check for multi-instance shared state.
+
+Runs several headless instances (separate processes) that hammer
+ConfigManager and PetStatus saves against the same data directory, then
+verifies that the files parse, every instance's position slot survived,
+and the journal replays cleanly.
+
+    python stress_shared_state.py [--instances 6] [--iterations 300]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+
+def run_instance(data_dir, iterations, results):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtCore import QCoreApplication
+    from src.config import ConfigManager
+    from src.pet_status import PetStatus
+
+    app = QCoreApplication([])
+    config = ConfigManager(os.path.join(data_dir, "settings.json"))
+    status = PetStatus(os.path.join(data_dir, "pet_data.json"))
+
+    x = y = 0
+    for i in range(iterations):
+        x, y = random.randint(0, 4000), random.randint(0, 2000)
+        config.set("last_x", x)
+        config.set("last_y", y)
+        config.set("follow_mode", i % 2 == 0)
+
+        status.hunger = random.randint(0, 100)
+        status.last_fed_time = random.random() * 1e9
+        status.save_data()
+
+        if i % 10 == 0:
+            config.flush()
+            status.refresh_shared()
+        app.processEvents()
+
+    config.flush()
+    status.flush()
+    results.put((config.slot, x, y))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--instances", type=int, default=6)
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="kitty-stress-")
+    print(f"Data dir: {data_dir}")
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    procs = [ctx.Process(target=run_instance, args=(data_dir, args.iterations, results)) for _ in range(args.instances)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+    failures = []
+    if any(p.exitcode != 0 for p in procs):
+        failures.append(f"instance exit codes: {[p.exitcode for p in procs]}")
+
+    finals = [results.get() for _ in range(results.qsize())]
+    with open(os.path.join(data_dir, "settings.json"), encoding="utf-8") as f:
+        settings = json.load(f)
+    for slot, x, y in finals:
+        saved = settings if slot == 0 else settings.get("slots", {}).get(str(slot), {})
+        if (saved.get("last_x"), saved.get("last_y")) != (x, y):
+            failures.append(f"slot {slot}: expected {(x, y)}, found {(saved.get('last_x'), saved.get('last_y'))}")
+    if len({slot for slot, _, _ in finals}) != len(finals):
+        failures.append(f"duplicate slots: {sorted(slot for slot, _, _ in finals)}")
+
+    with open(os.path.join(data_dir, "pet_data.json"), encoding="utf-8") as f:
+        json.load(f)
+    with open(os.path.join(data_dir, "pet_data.journal"), encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            try:
+                json.loads(line)
+            except ValueError:
+                failures.append(f"pet_data.journal line {n} is corrupt")
+
+    if failures:
+        print("FAILED")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print(f"OK: {len(finals)} instances x {args.iterations} iterations")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+import os
+import sys
+import pytest
+
+# The app runs from the repository root (main.py imports `src.*`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture(scope="session")
+def qapp():
+    """One offscreen QApplication for the tests that need an event loop or widgets."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,49 @@
+import json
+import pytest
+from src.animation import AnimationClip, read_clip_meta
+from src.constants import ANIMATION_INTERVAL_MS
+
+def test_loop_wraps_and_reports_time_to_the_next_frame():
+    clip = AnimationClip([0, 1, 2], [100, 200, 300])
+    assert clip.frame_at(0) == (0, 100, False)
+    assert clip.frame_at(150) == (1, 150, False)
+    assert clip.frame_at(599) == (2, 1, False)
+    assert clip.frame_at(600 + 100) == (1, 200, False)
+
+def test_once_holds_the_last_frame_and_finishes():
+    clip = AnimationClip([0, 1], [100, 100], "once")
+    assert clip.frame_at(150) == (1, 50, False)
+    assert clip.frame_at(200) == (1, None, True)
+    assert clip.frame_at(10 ** 6) == (1, None, True)
+
+def test_pingpong_plays_back_without_repeating_the_ends():
+    clip = AnimationClip([0, 1, 2, 3], [10] * 4, "pingpong")
+    assert [clip.frame_at(t)[0] for t in range(0, 120, 10)] == [0, 1, 2, 3, 2, 1] * 2
+
+def test_single_frame_never_wakes():
+    assert AnimationClip([4], [100]).frame_at(10 ** 6) == (4, None, False)
+    assert AnimationClip([4], [100], "once").frame_at(0) == (4, None, True)
+
+def test_invalid_clips_are_rejected():
+    with pytest.raises(ValueError):
+        AnimationClip([0], [100], "bounce")
+    with pytest.raises(ValueError):
+        AnimationClip([0, 1], [100])
+
+def test_from_meta_prefers_metadata_then_embedded_durations():
+    assert AnimationClip.from_meta(None, 3).durations == [ANIMATION_INTERVAL_MS] * 3
+    embedded = AnimationClip.from_meta(None, 3, [50, None, 70])
+    assert embedded.durations == [50, ANIMATION_INTERVAL_MS, 70]
+    timeline = AnimationClip.from_meta({"mode": "once", "frames": [0, 1, 4], "durations": [1, 2, 3]}, 3)
+    assert (timeline.frames, timeline.durations, timeline.mode) == ([0, 1, 1], [1, 2, 3], "once")
+
+def test_bad_metadata_falls_back_to_the_default_clip():
+    clip = AnimationClip.from_meta({"mode": "bounce"}, 2)
+    assert (clip.frames, clip.mode) == ([0, 1], "loop")
+
+def test_read_clip_meta(tmp_path):
+    assert read_clip_meta(str(tmp_path)) is None
+    (tmp_path / "clip.json").write_text(json.dumps({"mode": "once"}))
+    assert read_clip_meta(str(tmp_path)) == {"mode": "once"}
+    (tmp_path / "clip.json").write_text("[1, 2]")
+    assert read_clip_meta(str(tmp_path)) is None
@@ -0,0 +1,28 @@
+import logging
+import queue
+import sys
+from src.app_log import _DeferredQueueHandler
+
+def _queued(*args, exc_info=None):
+    log_queue = queue.SimpleQueue()
+    handler = _DeferredQueueHandler(log_queue)
+    record = logging.LogRecord("t", logging.INFO, __file__, 1, *args, exc_info=exc_info)
+    handler.emit(record)
+    return log_queue.get_nowait()
+
+def test_message_is_merged_in_the_calling_thread():
+    items = ["a"]
+    queued = _queued("items %s", (items,))
+    items.append("b") # Mutated after the call: must not show up in the log
+    assert queued.msg == "items ['a']"
+    assert queued.args is None
+    assert queued.getMessage() == "items ['a']"
+
+def test_traceback_is_rendered_and_released():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        queued = _queued("failed", None, exc_info=sys.exc_info())
+    assert queued.exc_info is None
+    assert "ValueError: boom" in queued.exc_text
+    assert "ValueError: boom" in logging.Formatter().format(queued)
@@ -0,0 +1,108 @@
+import math
+import random
+from collections import Counter
+from PyQt6.QtCore import QObject
+from src.brain import Brain, BrainWorker, decide, heading_from_edges, CURSOR_IDLE_SLEEPY_MS
+from src.scheduler import Scheduler, VirtualClock
+
+def perception(**overrides):
+    p = {
+        "pet": 1, "serial": 0, "state": "idle", "timer": 5000, "target": 3000,
+        "wait_mode": False, "locked": False, "hunger": 80, "bored": False,
+        "uncomfortable": False, "hour": 14, "cursor_dist": 1000.0,
+        "cursor_idle_ms": 60 * 1000, "screen_fx": 0.5, "screen_fy": 0.5,
+    }
+    p.update(overrides)
+    return p
+
+def choices(n=2000, **overrides):
+    rng = random.Random(1)
+    return Counter(decide(perception(**overrides), rng)["state"] for _ in range(n))
+
+def test_no_decision_while_waiting_locked_or_busy():
+    rng = random.Random(1)
+    assert decide(perception(wait_mode=True), rng) is None
+    assert decide(perception(locked=True), rng) is None
+    assert decide(perception(state="feed"), rng) is None
+    assert decide(perception(timer=1000), rng) is None # Not expired yet
+
+def test_expired_non_idle_state_returns_to_idle():
+    decision = decide(perception(state="walk"), random.Random(1))
+    assert decision["state"] == "idle"
+    assert 1000 <= decision["duration"] <= 5000
+
+def test_uncomfortable_pet_gives_up_a_long_walk():
+    decision = decide(perception(state="walk", timer=4000, target=10000, uncomfortable=True), random.Random(1))
+    assert decision["state"] == "sit"
+
+def test_hungry_or_played_with_pet_always_wakes():
+    rng = random.Random(1)
+    for _ in range(50):
+        assert decide(perception(state="sleep", hour=2, hunger=10), rng)["state"] == "idle"
+        assert decide(perception(state="sleep", hour=2, cursor_dist=10, cursor_idle_ms=0), rng)["state"] == "idle"
+
+def test_night_favours_sleep():
+    day, night = choices(hour=14), choices(hour=2)
+    assert night["sleep"] > 2 * day["sleep"]
+    assert night["walk"] < day["walk"]
+
+def test_idle_cursor_makes_the_pet_sleepy():
+    assert choices(cursor_idle_ms=CURSOR_IDLE_SLEEPY_MS + 1)["sleep"] > choices()["sleep"]
+
+def test_walks_lead_away_from_screen_edges():
+    rng = random.Random(1)
+    for _ in range(50):
+        decision = decide(perception(screen_fx=0.95, screen_fy=0.5), rng)
+        if decision["state"] == "walk":
+            assert math.cos(decision["heading"]) < 0 # Leftwards
+    assert heading_from_edges(0.5, 0.5) is None
+    assert math.sin(heading_from_edges(0.5, 0.02, rng)) > 0 # Downwards, away from the top
+
+class FakeFsm:
+    def __init__(self):
+        self.brain_driven = False
+        self.applied = []
+
+    def apply_decision(self, decision):
+        self.applied.append(decision["state"])
+        return True
+
+class FakePet(QObject):
+    def __init__(self):
+        super().__init__()
+        self.fsm = FakeFsm()
+        self.is_dragging = False
+        self.playing_mode = False
+
+def make_brains(n, worker):
+    scheduler = Scheduler(VirtualClock())
+    pets = [FakePet() for _ in range(n)]
+    return pets, [Brain(pet, worker=worker, scheduler=scheduler) for pet in pets]
+
+def test_decisions_reach_only_the_brain_they_were_made_for():
+    worker = BrainWorker() # Same thread: signals are delivered directly
+    pets, brains = make_brains(3, worker)
+    worker.think(perception(pet=id(brains[1]), state="walk"))
+    assert [pet.fsm.applied for pet in pets] == [[], ["idle"], []]
+    assert brains[1].decisions == 1
+
+def test_closed_brain_gets_no_more_decisions():
+    worker = BrainWorker()
+    pets, brains = make_brains(2, worker)
+    assert all(pet.fsm.brain_driven for pet in pets)
+    brains[0].close()
+    worker.think(perception(pet=id(brains[0]), state="walk"))
+    assert pets[0].fsm.applied == []
+    assert not pets[0].fsm.brain_driven
+    assert list(brains[1].router.brains) == [id(brains[1])]
+
+def test_no_perception_while_dragged_or_playing():
+    worker = BrainWorker()
+    pets, brains = make_brains(1, worker)
+    sent = []
+    brains[0].perceived.connect(sent.append)
+    pets[0].is_dragging = True
+    brains[0].tick()
+    pets[0].is_dragging, pets[0].playing_mode = False, True
+    brains[0].tick()
+    assert sent == []
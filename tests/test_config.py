@@ -0,0 +1,37 @@
+import json
+import pytest
+from src.config import ConfigManager, Settings
+
+def test_validate_coerces_and_rejects():
+    assert Settings.validate("last_x", 12.7) == 12
+    assert Settings.validate("gravity_mode", True) is True
+    with pytest.raises(TypeError):
+        Settings.validate("gravity_mode", 1)
+    with pytest.raises(TypeError):
+        Settings.validate("last_x", True)
+    with pytest.raises(TypeError):
+        Settings.validate("last_x", "12")
+    with pytest.raises(KeyError):
+        Settings.validate("volume", 3)
+
+def test_load_keeps_defaults_for_bad_unknown_and_legacy_entries(tmp_path, qapp):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"follow_mode": True, "gravity_mode": "yes", "volume": 3,
+                                "floating_mode": True, "last_x": 250.0}))
+    config = ConfigManager(str(path))
+    assert config.settings.follow_mode is True
+    assert config.settings.gravity_mode is False
+    assert config.settings.last_x == 250
+    assert not hasattr(config.settings, "floating_mode")
+
+def test_set_emits_only_real_changes(tmp_path, qapp):
+    config = ConfigManager(str(tmp_path / "settings.json"))
+    changes = []
+    config.setting_changed.connect(lambda key, value: changes.append((key, value)))
+    config.set("follow_mode", True)
+    config.set("follow_mode", True)
+    config.set("last_x", 40.0)
+    assert changes == [("follow_mode", True), ("last_x", 40)]
+    with pytest.raises(TypeError):
+        config.set("follow_mode", "on")
+    assert config.get("follow_mode") is True
@@ -0,0 +1,99 @@
+import json
+import socket
+import sys
+import pytest
+from src.constants import APP_VERSION
+from src.control import ControlServer, encode
+
+class FakeFsm:
+    def __init__(self):
+        self.current_state = "idle"
+
+    def set_state(self, state, force=False):
+        self.current_state = state
+
+class FakePet:
+    def __init__(self):
+        self.fsm = FakeFsm()
+        self.status = None
+        self.playing_mode = False
+        self.follow_mode = False
+
+    def toggle_follow_mode(self):
+        self.follow_mode = not self.follow_mode
+
+class FakeSocket:
+    def __init__(self):
+        self.incoming = b""
+        self.sent = b""
+        self.disconnected = False
+
+    def readAll(self):
+        data, self.incoming = self.incoming, b""
+        return data
+
+    def write(self, data):
+        self.sent += data
+
+    def disconnectFromServer(self):
+        self.disconnected = True
+
+def make_server(count=2, name="desktop-kitty-test"):
+    pets = [FakePet() for _ in range(count)]
+    return ControlServer(pets, spawn=None, name=name), pets
+
+def test_ping():
+    server, _ = make_server()
+    assert server.handle(b'{"cmd": "ping"}') == {"ok": True, "version": APP_VERSION, "pets": 2}
+
+def test_batch_runs_every_command_in_order():
+    server, pets = make_server()
+    reply = server.handle(b'[{"cmd": "sleep", "pet": 1}, {"cmd": "follow", "on": true}, {"cmd": "ping"}]')
+    assert reply[0] == {"ok": True, "pets": [1]}
+    assert reply[1] == {"ok": True, "follow": {"0": True, "1": True}}
+    assert reply[2]["ok"]
+    assert [pet.fsm.current_state for pet in pets] == ["idle", "sleep"]
+
+def test_unknown_command_and_bad_arguments():
+    server, _ = make_server()
+    assert server.handle(b'{"cmd": "dance"}') == {"ok": False, "error": "unknown command: dance"}
+    assert server.handle(b'{"cmd": "sleep", "pet": 5}') == {"ok": False, "error": "no pet 5"}
+    assert server.handle(b'[1]') == [{"ok": False, "error": "command must be an object"}]
+
+def test_malformed_json():
+    server, _ = make_server()
+    reply = server.handle(b'{"cmd": ')
+    assert reply["ok"] is False
+    assert reply["error"].startswith("bad json")
+
+def test_replies_once_a_full_line_has_arrived():
+    server, _ = make_server()
+    sock = FakeSocket()
+    sock.incoming = b'{"cmd": "pi'
+    server._on_ready_read(sock)
+    assert sock.sent == b""
+    sock.incoming = b'ng"}\n\n{"cmd": "ping"}\n'
+    server._on_ready_read(sock)
+    replies = [json.loads(line) for line in sock.sent.splitlines()]
+    assert [reply["ok"] for reply in replies] == [True, True]
+    assert sock.sent.endswith(b"\n") and encode(replies[0]) in sock.sent
+
+def test_oversized_request_is_refused():
+    server, _ = make_server()
+    sock = FakeSocket()
+    sock.incoming = b"x" * (64 * 1024 + 1)
+    server._on_ready_read(sock)
+    assert json.loads(sock.sent) == {"ok": False, "error": "request too large"}
+    assert sock.disconnected
+
+@pytest.mark.skipif(sys.platform == "win32", reason="named pipes do not outlive their process")
+def test_listen_replaces_a_stale_socket(tmp_path):
+    path = str(tmp_path / "control")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path) # Left behind: bound, never listening, never unlinked
+    stale.close()
+    server, _ = make_server(name=path)
+    try:
+        assert server.listen()
+    finally:
+        server.close()
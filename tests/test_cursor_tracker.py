@@ -0,0 +1,30 @@
+import math
+from src.cursor_tracker import CursorTracker, intercept_point
+
+def test_stationary_target_is_aimed_at_directly():
+    assert intercept_point(0, 0, 300, 100, 50, 0, 0) == (100, 50)
+
+def test_intercept_is_reached_by_both_at_the_same_time():
+    px, py, speed = 0.0, 0.0, 500.0
+    tx, ty, vx, vy = 100.0, 0.0, 0.0, 200.0
+    ix, iy = intercept_point(px, py, speed, tx, ty, vx, vy, max_lead=10)
+    t = (iy - ty) / vy
+    assert t > 0
+    assert math.isclose(math.hypot(ix - px, iy - py), speed * t, rel_tol=1e-9)
+
+def test_lead_is_capped_and_uncatchable_targets_are_chased_directly():
+    assert intercept_point(0, 0, 100, 1000, 0, 0, 50, max_lead=0.4) == (1000, 20)
+    assert intercept_point(0, 0, 100, 100, 0, 500, 0) == (100, 0) # Faster, moving away
+
+def test_tracker_shares_samples_within_half_a_frame_and_estimates_velocity():
+    now = [0.0]
+    position = [0]
+    tracker = CursorTracker(source=lambda: (position[0], 0), clock=lambda: now[0], frame_ms=20)
+    for _ in range(200): # Settles within a few seconds of steady motion
+        tracker.sample()
+        tracker.sample() # Same frame: no second OS query
+        now[0] += 20
+        position[0] += 10 # 500 px/s
+    assert tracker.reads == 200
+    assert math.isclose(tracker.vx, 500, rel_tol=0.01)
+    assert tracker.vy == 0
@@ -0,0 +1,37 @@
+from PyQt6.QtCore import QRect
+from src.jump_arc import JumpArc, walkable_span
+from src.navigation import NavGraph
+
+W, H = 100, 80
+SCREENS = [QRect(0, 0, 1920, 1080), QRect(1920, 0, 1280, 1080)]
+
+def test_span_matches_nav_graph_limits():
+    left, right, top, bottom = walkable_span(SCREENS[:1], 500, 500, W, H)
+    graph = NavGraph(SCREENS[:1], W, H)
+    assert (left, right, top, bottom) == (0, 1920 - 1 - W, 0, 1080 - 1 - H)
+    assert graph.contains(right, bottom)
+    assert not graph.contains(right + 1, bottom)
+    assert not graph.contains(right, bottom + 1)
+
+def test_span_extends_across_side_by_side_screens():
+    left, right, _, _ = walkable_span(SCREENS, 500, 500, W, H)
+    assert (left, right) == (0, 3200 - 1 - W)
+
+def test_landing_is_a_valid_location():
+    graph = NavGraph(SCREENS, W, H)
+    for vx in (-3000, -800, 0, 800, 3000):
+        arc = JumpArc(1800, 900, vx, -600, 1.5, W, H, gravity=2000, screens=SCREENS)
+        x, y = arc.landing
+        assert graph.contains(int(x), int(y)), (vx, x, y)
+
+def test_wall_bounce_keeps_the_arc_inside_the_span():
+    arc = JumpArc(100, 500, -2000, -400, 2.0, W, H, gravity=400, screens=SCREENS[:1])
+    for i in range(41):
+        x, y, _ = arc.position(i * 0.05)
+        assert arc.left <= x <= arc.right
+        assert arc.top <= y <= arc.bottom
+
+def test_targeted_jump_reaches_its_target():
+    arc = JumpArc.targeted(200, 900, 300, -100, 0.8, W, H, gravity=2000, screens=SCREENS)
+    x, y = arc.landing
+    assert abs(x - 500) < 1e-6 and abs(y - 800) < 1e-6
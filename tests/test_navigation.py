@@ -0,0 +1,35 @@
+from PyQt6.QtCore import QRect
+from src.navigation import NavGraph
+
+def walkable_legs(graph, start, points, steps=50):
+    """True if every straight leg between consecutive waypoints stays on the walkable area."""
+    legs = zip([start] + points, points)
+    for (ax, ay), (bx, by) in legs:
+        for i in range(steps + 1):
+            t = i / steps
+            if not graph.contains(round(ax + (bx - ax) * t), round(ay + (by - ay) * t)):
+                return False
+    return True
+
+def test_path_across_offset_screens_goes_through_the_shared_band():
+    # Right screen sits 300 px lower: the seam is only walkable where both overlap
+    graph = NavGraph([QRect(0, 0, 1000, 800), QRect(1000, 300, 1000, 800)], 100, 100)
+    start, goal = (100, 50), (1800, 950)
+    points = graph.plan(*start, *goal)
+    assert points[-1] == goal
+    assert walkable_legs(graph, start, points)
+    assert graph.plan(*start, *goal) == points # Route reused from the cache
+    assert len(graph._routes) == 1
+
+def test_same_rect_goes_straight_to_the_clamped_goal():
+    graph = NavGraph([QRect(0, 0, 1000, 800)], 100, 100)
+    assert graph.plan(10, 10, 500, 5000) == [(500, 699)]
+
+def test_start_off_the_area_heads_back_onto_it_first():
+    graph = NavGraph([QRect(0, 0, 1000, 800)], 100, 100)
+    points = graph.plan(-300, 100, 500, 100)
+    assert points == [(0, 100), (500, 100)]
+
+def test_separate_screens_are_unreachable():
+    graph = NavGraph([QRect(0, 0, 1000, 800), QRect(1200, 0, 1000, 800)], 100, 100)
+    assert graph.plan(100, 100, 1500, 100) == []
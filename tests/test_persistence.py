@@ -0,0 +1,89 @@
+import json
+import pytest
+from PyQt6.QtCore import QCoreApplication, QDeadlineTimer
+from src.config import ConfigManager
+from src.persistence import DebouncedJsonWriter, JournalStore, atomic_write_json
+
+def make_store(tmp_path, compact_every=100):
+    return JournalStore(str(tmp_path / "pet_data.json"), str(tmp_path / "pet_data.journal"),
+                        flush_interval=0.01, compact_every=compact_every)
+
+def test_bad_line_does_not_hide_later_records(tmp_path):
+    (tmp_path / "pet_data.json").write_text(json.dumps({"hunger_base": 50}))
+    (tmp_path / "pet_data.journal").write_text(
+        '{"hunger_base":4{"hunger_base":90}\n{"last_fed_time":123}\n')
+    assert make_store(tmp_path).load() == {"hunger_base": 50, "last_fed_time": 123}
+
+def test_torn_tail_is_cut_before_the_next_append(tmp_path):
+    (tmp_path / "pet_data.json").write_text(json.dumps({"hunger_base": 50}))
+    (tmp_path / "pet_data.journal").write_text('{"last_fed_time":1}\n{"hunger_base":4')
+    store = make_store(tmp_path)
+    assert store.load() == {"hunger_base": 50, "last_fed_time": 1}
+    store.start()
+    store.record({"hunger_base": 90})
+    store.close()
+    assert make_store(tmp_path).load() == {"hunger_base": 90, "last_fed_time": 1}
+
+def test_torn_tail_left_by_another_writer_is_cut_on_append(tmp_path):
+    store = make_store(tmp_path)
+    assert store.load() is None
+    (tmp_path / "pet_data.journal").write_text('{"hunger_base":4')
+    store._append([{"hunger_base": 90}])
+    assert (tmp_path / "pet_data.journal").read_text() == '{"hunger_base":90}\n'
+
+def test_compaction_clears_a_journal_of_only_bad_lines(tmp_path):
+    (tmp_path / "pet_data.json").write_text(json.dumps({"hunger_base": 50}))
+    (tmp_path / "pet_data.journal").write_text('garbage\n')
+    store = make_store(tmp_path)
+    store.load()
+    store._compact()
+    assert (tmp_path / "pet_data.journal").read_text() == ""
+    assert make_store(tmp_path).load() == {"hunger_base": 50}
+
+def test_atomic_write_keeps_the_old_file_when_serializing_fails(tmp_path):
+    path = tmp_path / "settings.json"
+    atomic_write_json(str(path), {"a": 1})
+    with pytest.raises(TypeError):
+        atomic_write_json(str(path), {"a": object()})
+    assert json.loads(path.read_text()) == {"a": 1}
+    assert [p.name for p in tmp_path.iterdir()] == ["settings.json"]
+
+def test_debounced_writer_coalesces_requests_into_one_write(tmp_path, qapp):
+    path = tmp_path / "settings.json"
+    state = {"n": 0}
+    writer = DebouncedJsonWriter(str(path), lambda: dict(state), debounce_ms=10)
+    for n in range(5):
+        state["n"] = n
+        writer.schedule()
+    deadline = QDeadlineTimer(2000)
+    while writer.write_count == 0 and not deadline.hasExpired():
+        QCoreApplication.processEvents()
+    writer.close()
+    assert writer.write_count == 1
+    assert writer.coalesced_count == 4
+    assert json.loads(path.read_text()) == {"n": 4}
+
+def test_flush_writes_pending_changes_synchronously(tmp_path, qapp):
+    path = tmp_path / "settings.json"
+    writer = DebouncedJsonWriter(str(path), lambda: {"x": 1}, debounce_ms=60 * 1000)
+    writer.flush()
+    assert not path.exists() # Nothing was scheduled
+    writer.schedule()
+    writer.flush()
+    assert json.loads(path.read_text()) == {"x": 1}
+    writer.close()
+
+def test_instances_merge_their_own_keys_into_the_shared_file(tmp_path, qapp):
+    path = str(tmp_path / "settings.json")
+    first, second = ConfigManager(path), ConfigManager(path)
+    assert (first.slot, second.slot) == (0, 1)
+    first.set("follow_mode", True)
+    first.set("last_x", 10)
+    second.set("gravity_mode", True)
+    second.set("last_x", 20)
+    first.flush()
+    second.flush()
+    data = json.loads(open(path).read())
+    assert data["follow_mode"] is True and data["gravity_mode"] is True
+    assert data["last_x"] == 10
+    assert data["slots"] == {"1": {"last_x": 20}}
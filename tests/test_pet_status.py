@@ -0,0 +1,76 @@
+import sqlite3
+import pytest
+from src.pet_status import (PetStatus, SampleRing, HUNGER_DECAY_SECONDS, MOOD_SCORES, RECENT_CAPACITY,
+                            RECENT_MOOD, hunger_at, hunger_crossing_time, mood_at)
+from src.scheduler import Scheduler, VirtualClock
+
+@pytest.fixture
+def status(tmp_path, qapp):
+    status = PetStatus(str(tmp_path / "pet_data.json"), Scheduler(VirtualClock()))
+    yield status
+    status.close()
+
+def snapshot(**overrides):
+    state = {"hunger_base": 80, "hunger_base_time": 0.0, "digest_finish_time": 0,
+             "uncomfortable_flag": False, "bored_time": 10 ** 9}
+    state.update(overrides)
+    return state
+
+def test_sample_ring_keeps_the_newest_rows_across_wraparound():
+    ring = SampleRing(4, 2)
+    for t in range(6):
+        ring.append(float(t), (t, -t))
+    assert len(ring) == 4
+    assert ring.total == 6
+    assert ring.last_time == 5.0
+    assert ring.tail(10, 0) == [2, 3, 4, 5]
+    assert ring.tail(3, 1) == [-3, -4, -5]
+
+def test_sample_ring_tail_before_it_fills():
+    ring = SampleRing(4, 1)
+    assert ring.last_time is None
+    assert ring.tail(4, 0) == []
+    ring.append(1.0, (0.5,))
+    ring.append(2.0, (1.5,))
+    assert ring.tail(4, 0) == [0.5, 1.5]
+
+def test_hunger_decays_one_point_per_minute_and_clamps():
+    assert hunger_at(80, 1000.0, 1000.0) == 80
+    assert hunger_at(80, 1000.0, 1000.0 + HUNGER_DECAY_SECONDS - 1) == 80
+    assert hunger_at(80, 1000.0, 1000.0 + 10 * HUNGER_DECAY_SECONDS) == 70
+    assert hunger_at(80, 1000.0, 1000.0 + 500 * HUNGER_DECAY_SECONDS) == 0
+    assert hunger_at(80, 1000.0, 0.0) == 80 # Clock went backwards
+    assert hunger_crossing_time(80, 1000.0, 70) == 1000.0 + 10 * HUNGER_DECAY_SECONDS
+    assert hunger_crossing_time(30, 1000.0, 70) is None
+
+def test_mood_priorities():
+    assert mood_at(snapshot(), 0) == "행복"
+    assert mood_at(snapshot(hunger_base=30), 0) == "나쁨"
+    assert mood_at(snapshot(hunger_base=30, bored_time=0), 0) == "심심함"
+    assert mood_at(snapshot(bored_time=0, digest_finish_time=5), 10) == "불편"
+    assert mood_at(snapshot(digest_finish_time=5), 4) == "행복" # Still digesting
+    assert mood_at(snapshot(uncomfortable_flag=True), 0) == "불편"
+
+def test_feeding_while_uncomfortable_keeps_the_discomfort(status):
+    status.digest_finish_time = 1.0 # Digestion finished long ago
+    assert status.is_uncomfortable
+    status.feed(10)
+    assert status.is_uncomfortable # The new digestion timer must not hide it
+    status.poop()
+    assert not status.is_uncomfortable
+
+def test_recent_moods_are_back_filled_across_a_gap(status):
+    status.recent_history = SampleRing(RECENT_CAPACITY, 1)
+    state = snapshot(bored_time=1150.0)
+    status.sample_recent(state, now=1000.0)
+    status.sample_recent(state, now=1300.0)
+    happy, bored = MOOD_SCORES["행복"], MOOD_SCORES["심심함"]
+    assert status.recent_history.tail(10, RECENT_MOOD) == [happy] * 3 + [bored] * 3
+
+def test_hunger_history_gets_one_row_per_minute(status, tmp_path):
+    start = status._history_time
+    status.sample_history(now=start + 5 * 60 + 1)
+    status.history.flush()
+    with sqlite3.connect(str(tmp_path / "pet_history.db")) as conn:
+        times = [ts for ts, in conn.execute("SELECT ts FROM hunger_samples ORDER BY ts")]
+    assert times == [start + 60 * i for i in range(6)]
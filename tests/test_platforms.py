@@ -0,0 +1,65 @@
+from src.platforms import FakePlatformProvider, PlatformProvider, SurfaceIndex, visible_top_edges
+
+def make_index(**windows):
+    provider = FakePlatformProvider()
+    for wid, rect in windows.items():
+        provider.set_window(wid, *rect)
+    return SurfaceIndex(provider), provider
+
+def test_first_between_returns_the_highest_spanning_edge():
+    index, _ = make_index(low=(0, 600, 800, 200), high=(100, 300, 400, 200), narrow=(200, 200, 50, 50))
+    assert index.first_between(150, 250, 100, 1000)[3] == "high"
+    assert index.first_between(150, 250, 301, 1000)[3] == "low"
+
+def test_first_between_range_is_inclusive():
+    index, _ = make_index(a=(0, 300, 400, 100))
+    assert index.first_between(10, 20, 300, 300) is not None
+    assert index.first_between(10, 20, 250, 299) is None
+    assert index.first_between(10, 20, 301, 400) is None
+
+def test_first_between_needs_the_whole_span_on_the_edge():
+    index, _ = make_index(a=(100, 300, 200, 100)) # Edge covers x 100..299
+    assert index.first_between(100, 299, 0, 1000) is not None
+    assert index.first_between(99, 200, 0, 1000) is None
+    assert index.first_between(200, 300, 0, 1000) is None
+
+def test_moved_and_removed_windows_update_the_index():
+    index, provider = make_index(a=(0, 300, 400, 100))
+    provider.set_window("a", 0, 500, 400, 100)
+    assert index.first_between(10, 20, 0, 400) is None
+    assert index.first_between(10, 20, 0, 1000)[0] == 500
+    provider.remove_window("a")
+    assert index.first_between(10, 20, 0, 1000) is None
+    assert index.edges == []
+
+def test_top_edges_are_clipped_by_windows_in_front():
+    edges = visible_top_edges([
+        ("front", (100, 200, 100, 300)),  # Covers x 100..199 from y 200 down
+        ("middle", (0, 300, 400, 100)),   # Top edge at y 300 crosses "front"
+        ("back", (120, 250, 50, 50)),     # Top edge entirely behind "front"
+        ("bottom", (0, 600, 400, 100)),   # Nothing in front at y 600
+    ])
+    assert edges["front"] == (100, 200, 100, 300)
+    assert edges["middle"] == (200, 300, 200, 100) # Longer of 0..99 and 200..399
+    assert "back" not in edges
+    assert edges["bottom"] == (0, 600, 400, 100)
+
+def test_window_in_front_touching_the_edge_leaves_it_uncovered():
+    edges = visible_top_edges([("front", (0, 100, 400, 200)), ("back", (0, 300, 400, 100))])
+    assert edges["back"] == (0, 300, 400, 100)
+
+def test_polled_provider_snapshots_reach_the_index(qapp):
+    from PyQt6.QtCore import QCoreApplication, QDeadlineTimer
+
+    class Polled(PlatformProvider):
+        def windows(self):
+            return {"a": (0, 300, 400, 100)}
+
+    index = SurfaceIndex(Polled(), poll_ms=10)
+    try:
+        deadline = QDeadlineTimer(2000)
+        while not index.edges and not deadline.hasExpired():
+            QCoreApplication.processEvents()
+        assert index.edges == [(300, 0, 399, "a")]
+    finally:
+        index.close()
@@ -0,0 +1,28 @@
+from src.scheduler import Scheduler, VirtualClock
+
+def test_cancel_after_pop_does_not_count_as_stale():
+    scheduler = Scheduler(VirtualClock())
+    ran = []
+    second = None
+
+    def first():
+        ran.append("first")
+        second.cancel() # Popped in the same wakeup, not yet run
+
+    scheduler.call_later(10, first)
+    second = scheduler.call_later(10, lambda: ran.append("second"))
+    scheduler.advance(20)
+    assert ran == ["first"]
+    assert scheduler._stale == 0
+    assert scheduler.pending == 0
+
+def test_cancel_pending_task_is_skipped_and_counted():
+    scheduler = Scheduler(VirtualClock())
+    ran = []
+    task = scheduler.call_later(10, lambda: ran.append(1))
+    scheduler.call_every(5, lambda: ran.append(2))
+    task.cancel()
+    assert scheduler.pending == 1
+    scheduler.advance(12)
+    assert ran == [2, 2]
+    assert scheduler._stale == 0
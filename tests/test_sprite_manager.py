@@ -0,0 +1,128 @@
+import pytest
+from PIL import Image
+from PyQt6.QtCore import QCoreApplication, QDeadlineTimer, QRect, Qt
+from PyQt6.QtGui import QColor, QPainter, QPixmap
+from src import sprite_manager
+from src.sprite_manager import DEFAULT_GIF_FRAME_MS, SpriteDecoder, SpriteManager, alpha_mask
+
+def write_gif(path, colors, durations):
+    frames = [Image.new("RGBA", (32, 32), (255, 255, 255, 255)) for _ in colors]
+    for frame, color in zip(frames, colors):
+        frame.paste(color, (8, 8, 24, 24))
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=durations, loop=0, disposal=2)
+
+@pytest.fixture
+def sprites_dir(tmp_path, monkeypatch):
+    path = tmp_path / "sprites"
+    path.mkdir()
+    monkeypatch.setattr(sprite_manager, "SPRITES_DIR", str(path))
+    return path
+
+@pytest.fixture
+def make_manager(tmp_path, sprites_dir, qapp, monkeypatch):
+    """Builds a SpriteManager over sprites_dir (start decoding only once the files are in place)."""
+    monkeypatch.setattr(sprite_manager.resource_utils, "get_data_path", lambda: str(tmp_path))
+    managers = []
+
+    def make():
+        managers.append(SpriteManager())
+        return managers[-1]
+    yield make
+    for manager in managers:
+        manager.close()
+
+def wait_loaded(manager):
+    manager.load_all()
+    deadline = QDeadlineTimer(5000)
+    while not manager.loaded and not deadline.hasExpired():
+        QCoreApplication.processEvents()
+    assert manager.loaded
+
+def filled(color):
+    pixmap = QPixmap(16, 16)
+    pixmap.fill(QColor(color))
+    return pixmap
+
+def test_animated_source_streams_frames_with_their_durations(tmp_path, sprites_dir, qapp):
+    (sprites_dir / "walk").mkdir()
+    source = sprites_dir / "walk" / "walk.gif"
+    write_gif(source, [(255, 0, 0, 255), (0, 255, 0, 255), (0, 0, 255, 255)], [80, 10, 120])
+    (tmp_path / "cache").mkdir()
+    decoder = SpriteDecoder(str(tmp_path / "cache"))
+
+    frames = decoder._frames_for_file("walk", "walk.gif", str(source))
+    image, duration = next(frames) # Decoded one at a time
+    assert image.size().width() == sprite_manager.DEFAULT_SIZE[0]
+    assert duration == 80
+    assert [d for _, d in frames] == [DEFAULT_GIF_FRAME_MS, 120] # 10 ms means "browser default"
+
+def test_processed_frames_are_reused_from_the_cache(tmp_path, sprites_dir, qapp, monkeypatch):
+    (sprites_dir / "walk").mkdir()
+    write_gif(sprites_dir / "walk" / "walk.gif", [(255, 0, 0, 255), (0, 255, 0, 255)], [80, 90])
+    (tmp_path / "cache").mkdir()
+    first = list(SpriteDecoder(str(tmp_path / "cache"))._frames_for_state("walk", str(sprites_dir / "walk")))
+
+    decoder = SpriteDecoder(str(tmp_path / "cache"))
+    monkeypatch.setattr(decoder, "_process_image", lambda *args: pytest.fail("source decoded again"))
+    cached = decoder.cached_frames("walk")
+    assert [d for _, d in cached] == [80, 90]
+    assert [image == other for (image, _), (other, _) in zip(cached, first)] == [True, True]
+
+def test_uncached_state_is_not_read_on_the_gui_thread(tmp_path, sprites_dir, qapp):
+    (sprites_dir / "walk").mkdir()
+    write_gif(sprites_dir / "walk" / "walk.gif", [(255, 0, 0, 255)], [80])
+    (tmp_path / "cache").mkdir()
+    assert SpriteDecoder(str(tmp_path / "cache")).cached_frames("walk") is None
+
+def test_identical_frames_are_stored_once(make_manager):
+    manager = make_manager()
+    a = manager._add_frame(filled("red"))
+    assert manager._add_frame(filled("red")) == a # Same pixels, different pixmap
+    assert manager._add_frame(filled("blue")) != a
+    assert len(manager.frames) == len(manager.masks) == 2
+
+def test_repeated_poses_share_frames_across_states(sprites_dir, make_manager):
+    pose = Image.new("RGBA", (32, 32), (0, 0, 0, 0))
+    pose.paste((255, 0, 0, 255), (8, 8, 24, 24))
+    for state, names in (("idle", ("a.png", "b.png")), ("sit", ("a.png",))):
+        (sprites_dir / state).mkdir()
+        for name in names:
+            pose.save(sprites_dir / state / name)
+    manager = make_manager()
+    wait_loaded(manager)
+    assert manager.sprites["idle"] == manager.sprites["sit"] * 2
+    assert manager.frame_refs == 3 + 6 # Plus one fallback for each state without sprites
+    assert len(manager.frames) == 1 + 6
+
+def left_block():
+    """16x8 frame: opaque 4x8 block on the left, one faint pixel at (8, 4), transparent elsewhere."""
+    pixmap = QPixmap(16, 8)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    painter.fillRect(0, 0, 4, 8, QColor("black"))
+    painter.fillRect(8, 4, 1, 1, QColor(0, 0, 0, 10))
+    painter.end()
+    return pixmap
+
+def test_alpha_mask_marks_every_pixel_with_any_opacity(qapp):
+    mask = alpha_mask(left_block())
+    assert mask.pixelIndex(0, 0) == mask.pixelIndex(3, 7) == 1
+    assert mask.pixelIndex(8, 4) == 1
+    assert mask.pixelIndex(4, 0) == mask.pixelIndex(15, 7) == 0
+
+def test_hit_test_follows_the_mask_and_mirroring(make_manager):
+    manager = make_manager()
+    frame = manager._add_frame(left_block())
+    assert manager.hit_test(frame, False, 2.5, 3.5)
+    assert not manager.hit_test(frame, False, 10, 3)
+    assert manager.hit_test(frame, True, 14, 3) # Block is on the right when flipped
+    assert not manager.hit_test(frame, True, 2, 3)
+    assert not manager.hit_test(frame, False, -1, 0)
+    assert not manager.hit_test(frame, False, 0, 8)
+
+def test_region_covers_the_opaque_pixels(make_manager):
+    manager = make_manager()
+    frame = manager._add_frame(left_block())
+    assert manager.get_region(frame).boundingRect() == QRect(0, 0, 9, 8)
+    assert manager.get_region(frame, mirrored=True).boundingRect() == QRect(7, 0, 9, 8)
+    assert manager.get_region(frame) is manager.get_region(frame) # Made once